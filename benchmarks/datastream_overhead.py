@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Microbenchmark of the per-entry overhead of a data stream.
+
+Runs a data stream with cheap in-memory readers, transformer and writer, so
+that the measured time is the cost of the data stream machinery itself (reader
+chain, stream entries, batching, logging) rather than of the actual work.
+
+Usage::
+
+    python benchmarks/datastream_overhead.py --entries 200000 --repeat 5
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from flask import Flask
+
+from invenio_vocabularies.datastreams import DataStream, StreamEntry
+from invenio_vocabularies.datastreams.readers import BaseReader
+from invenio_vocabularies.datastreams.transformers import BaseTransformer
+from invenio_vocabularies.datastreams.writers import BaseWriter
+
+
+class ChunksReader(BaseReader):
+    """Yields the origin in chunks, like the members of an archive."""
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yield chunks of the origin."""
+        entries, chunk_size = fp
+        for start in range(0, entries, chunk_size):
+            yield range(start, min(start + chunk_size, entries))
+
+    def read(self, item=None, *args, **kwargs):
+        """Yield chunks of the origin."""
+        yield from self._iter(self._origin)
+
+
+class ChunkReader(BaseReader):
+    """Yields the entries of a chunk."""
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yield the entries of the chunk."""
+        for entry in fp:
+            yield {"id": entry}
+
+
+class NoopTransformer(BaseTransformer):
+    """Returns the entries unchanged."""
+
+    def apply(self, stream_entry, *args, **kwargs):
+        """Return the entry."""
+        return stream_entry
+
+
+class NoopWriter(BaseWriter):
+    """Drops the entries."""
+
+    def write(self, stream_entry, *args, **kwargs):
+        """Return the entry."""
+        return stream_entry
+
+    def write_many(self, stream_entries, *args, **kwargs):
+        """Return the entries."""
+        return stream_entries
+
+
+def run_datastream(entries, chunk_size, batch_size, write_many=False):
+    """Process all the entries of a data stream, returning how many."""
+    datastream = DataStream(
+        readers=[ChunksReader(origin=(entries, chunk_size)), ChunkReader()],
+        transformers=[NoopTransformer()],
+        writers=[NoopWriter()],
+        batch_size=batch_size,
+        write_many=write_many,
+    )
+    return sum(1 for _ in datastream.process())
+
+
+def entry_memory(entries):
+    """Memory, in bytes, taken by a stream entry (without its content)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stream_entries = [StreamEntry(None, cursor=None) for _ in range(entries)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(stream_entries)
+
+
+def main():
+    """Run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--write-many", action="store_true")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    with app.app_context():
+        timings = timeit.repeat(
+            lambda: run_datastream(
+                args.entries, args.chunk_size, args.batch_size, args.write_many
+            ),
+            number=1,
+            repeat=args.repeat,
+        )
+        create_timings = timeit.repeat(
+            lambda: StreamEntry({"id": 1}, cursor=(0, 0)),
+            number=args.entries,
+            repeat=args.repeat,
+        )
+
+    print(f"entries: {args.entries}, best of {args.repeat}")
+    print(f"data stream:        {min(timings) / args.entries * 1e6:.3f} us/entry")
+    print(
+        f"stream entry init:  {min(create_timings) / args.entries * 1e6:.3f} us/entry"
+    )
+    print(f"stream entry size:  {entry_memory(args.entries):.0f} bytes/entry")
+
+
+if __name__ == "__main__":
+    main()
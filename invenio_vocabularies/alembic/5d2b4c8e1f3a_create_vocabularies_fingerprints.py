@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Create vocabularies fingerprints table."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d2b4c8e1f3a"
+down_revision = "d00af88aac94"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "vocabularies_fingerprints",
+        sa.Column("vocabulary", sa.String(255), nullable=False),
+        sa.Column("id", sa.String(255), nullable=False),
+        sa.Column("fingerprint", sa.String(64), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "vocabulary", "id", name=op.f("pk_vocabularies_fingerprints")
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("vocabularies_fingerprints")
@@ -4,12 +4,18 @@
 
 """Commands to create and manage vocabularies."""
 
+import json
+
 import click
 from flask.cli import with_appcontext
 from invenio_access.permissions import system_identity
 from invenio_pidstore.errors import PIDDeletedError, PIDDoesNotExistError
 
 from .datastreams import DataStreamFactory
+from .datastreams.deadletters import DeadLetters
+from .datastreams.metrics import DataStreamMetrics, emit_metrics
+from .datastreams.progress import Progress, format_progress
+from .datastreams.throttling import set_rate_limit
 from .factories import get_vocabulary_config
 
 
@@ -18,32 +24,49 @@ def vocabularies():
     """Vocabularies command."""
 
 
-def _process_vocab(config, num_samples=None):
-    """Import a vocabulary."""
-    ds = DataStreamFactory.create(
-        readers_config=config["readers"],
-        transformers_config=config.get("transformers"),
-        writers_config=config["writers"],
-        batch_size=config.get("batch_size", 1000),
-        run_subtasks=config.get("run_subtasks", True),
-        write_many=config.get("write_many", False),
-    )
+def _output_progress(progress):
+    """Outputs the progress of an operation."""
+    click.secho(f"Progress: {format_progress(progress)}", fg="blue")
+
+
+def _process_vocab(config, num_samples=None, metrics=None):
+    """Import a vocabulary.
+
+    :param metrics: optional :class:`DataStreamMetrics` in which to collect the
+        metrics of the run. When not given, they are collected only if enabled
+        in the configuration.
+    """
+    overrides = {
+        "progress": (
+            Progress.from_config(config, callback=_output_progress)
+            if config.get("progress", True)
+            else None
+        )
+    }
+    if metrics is not None:
+        overrides["metrics"] = metrics
+    ds = DataStreamFactory.from_config(config, **overrides)
+    metrics = ds.metrics
 
     success, errored, filtered = 0, 0, 0
     left = num_samples or -1
-    for result in ds.process():
-        left = left - 1
-        if result.filtered:
-            filtered += 1
-        if result.errors:
-            for err in result.errors:
-                click.secho(err, fg="red")
-            errored += 1
-        else:
-            success += 1
-        if left == 0:
-            click.secho(f"Number of samples reached {num_samples}", fg="green")
-            break
+    try:
+        for result in ds.process():
+            left = left - 1
+            if result.filtered:
+                filtered += 1
+            if result.errors:
+                for err in result.errors:
+                    click.secho(err, fg="red")
+                errored += 1
+            else:
+                success += 1
+            if left == 0:
+                click.secho(f"Number of samples reached {num_samples}", fg="green")
+                break
+    finally:
+        if metrics is not None:
+            emit_metrics(metrics)
     return success, errored, filtered
 
 
@@ -69,8 +92,19 @@ def _output_process(vocabulary, op, success, errored, filtered):
 @click.option("-f", "--filepath", type=click.STRING)
 @click.option("-o", "--origin", type=click.STRING)
 @click.option("-n", "--num-samples", type=click.INT)
+@click.option(
+    "-c",
+    "--cache",
+    type=click.Choice(["read", "transform"]),
+    help="Start from the cached output of the stage, or cache it.",
+)
+@click.option(
+    "--metrics", is_flag=True, help="Collect the metrics of the run and output them."
+)
 @with_appcontext
-def import_vocab(vocabulary, filepath=None, origin=None, num_samples=None):
+def import_vocab(
+    vocabulary, filepath=None, origin=None, num_samples=None, cache=None, metrics=False
+):
     """Import a vocabulary (insert-only)."""
     if not filepath and not origin:
         click.secho("One of --filepath or --origin must be present.", fg="red")
@@ -78,24 +112,37 @@ def import_vocab(vocabulary, filepath=None, origin=None, num_samples=None):
 
     vc = get_vocabulary_config(vocabulary)
     config = vc.get_config(filepath, origin)
+    if cache:
+        config["cache"] = cache
 
-    success, errored, filtered = _process_vocab(config, num_samples)
+    metrics = DataStreamMetrics() if metrics else None
+    success, errored, filtered = _process_vocab(config, num_samples, metrics=metrics)
 
     _output_process(vocabulary, "imported", success, errored, filtered)
+    if metrics is not None:
+        click.echo(json.dumps({"metrics": metrics.summary()}, indent=2, sort_keys=True))
 
 
 @vocabularies.command()
 @click.option("-v", "--vocabulary", type=click.STRING, required=True)
 @click.option("-f", "--filepath", type=click.STRING)
 @click.option("-o", "--origin", type=click.STRING)
+@click.option(
+    "-c",
+    "--cache",
+    type=click.Choice(["read", "transform"]),
+    help="Start from the cached output of the stage, or cache it.",
+)
 @with_appcontext
-def update(vocabulary, filepath=None, origin=None):
+def update(vocabulary, filepath=None, origin=None, cache=None):
     """Import a vocabulary (insert and update)."""
     if not filepath and not origin:
         click.secho("One of --filepath or --origin must be present.", fg="red")
         exit(1)
     vc = get_vocabulary_config(vocabulary)
     config = vc.get_config(filepath, origin)
+    if cache:
+        config["cache"] = cache
 
     for w_conf in config["writers"]:
         if w_conf["type"] == "async":
@@ -113,6 +160,62 @@ def update(vocabulary, filepath=None, origin=None):
     _output_process(vocabulary, "updated", success, errored, filtered)
 
 
+@vocabularies.command()
+@click.option("-v", "--vocabulary", type=click.STRING, required=True)
+@click.option("-f", "--filepath", type=click.STRING)
+@click.option("-o", "--origin", type=click.STRING)
+@click.option(
+    "-d",
+    "--dead-letters",
+    type=click.STRING,
+    help="Dead letters file, by default the one of the vocabulary configuration.",
+)
+@with_appcontext
+def replay(vocabulary, filepath=None, origin=None, dead_letters=None):
+    """Replay the failed entries (dead letters) of a vocabulary import."""
+    vc = get_vocabulary_config(vocabulary)
+    config = vc.get_config(filepath, origin)
+    if dead_letters:
+        config["dead_letters"] = {"path": dead_letters}
+    letters = DeadLetters.from_config(config)
+
+    success, errored, filtered = 0, 0, 0
+    for replay_config in letters.replay_configs(config):
+        replay_success, replay_errored, replay_filtered = _process_vocab(replay_config)
+        success += replay_success
+        errored += replay_errored
+        filtered += replay_filtered
+    letters.clear_replayed()
+
+    _output_process(vocabulary, "replayed", success, errored, filtered)
+    if errored:
+        click.secho(f"Failed entries stored in {letters.path}", fg="yellow")
+
+
+@vocabularies.command(name="rate-limit")
+@click.option(
+    "-k",
+    "--key",
+    type=click.STRING,
+    required=True,
+    help="Key of the rate limit, by default the id of the job.",
+)
+@click.option(
+    "-r",
+    "--rate",
+    type=click.FLOAT,
+    help="Entries per second (0 for no limit), by default the configured rate.",
+)
+@with_appcontext
+def rate_limit(key, rate=None):
+    """Change the rate limit of the running data streams."""
+    set_rate_limit(key, rate)
+    if rate is None:
+        click.secho(f"Rate limit {key} reset to the configured rate.", fg="green")
+    else:
+        click.secho(f"Rate limit {key} set to {rate} entries per second.", fg="green")
+
+
 @vocabularies.command()
 @click.option("-v", "--vocabulary", type=click.STRING, required=True)
 @click.option("-f", "--filepath", type=click.STRING)
@@ -10,11 +10,22 @@ import re
 from idutils import is_doi, is_gnd, is_isni, is_orcid, is_ror, is_url
 from invenio_i18n import lazy_gettext as _
 
+from .datastreams.filters import (
+    AllowListFilter,
+    DenyListFilter,
+    EqualsFilter,
+    RegexFilter,
+    ShardFilter,
+    UniqueFilter,
+)
+from .datastreams.metrics import LoggerMetricsSink
 from .datastreams.readers import (
     CSVReader,
+    DeadLettersReader,
     GzipReader,
     JsonLinesReader,
     JsonReader,
+    JsonStreamReader,
     OAIPMHReader,
     RDFReader,
     SimpleHTTPReader,
@@ -181,6 +192,7 @@ VOCABULARIES_CUSTOM_VOCABULARY_TYPES = [
 VOCABULARIES_DATASTREAM_READERS = {
     "csv": CSVReader,
     "json": JsonReader,
+    "json-stream": JsonStreamReader,
     "jsonl": JsonLinesReader,
     "gzip": GzipReader,
     "tar": TarReader,
@@ -191,6 +203,7 @@ VOCABULARIES_DATASTREAM_READERS = {
     "zip": ZipReader,
     "xml": XMLReader,
     "oai-pmh": OAIPMHReader,
+    "dead-letters": DeadLettersReader,
 }
 """Data Streams readers."""
 
@@ -206,6 +219,97 @@ VOCABULARIES_DATASTREAM_WRITERS = {
 }
 """Data Streams writers."""
 
+VOCABULARIES_DATASTREAM_FILTERS = {
+    "regex": RegexFilter,
+    "equals": EqualsFilter,
+    "allow-list": AllowListFilter,
+    "deny-list": DenyListFilter,
+    "shard": ShardFilter,
+    "unique": UniqueFilter,
+}
+"""Data Streams filters, configured in the ``filters`` section of a data stream."""
+
+VOCABULARIES_DATASTREAM_METRICS_SINKS = [LoggerMetricsSink]
+"""Data Streams metrics sinks, receiving the metrics summary of each run.
+
+The metrics are collected when enabled with ``metrics`` in the data stream
+configuration, or with ``invenio vocabularies import --metrics``.
+"""
+
+VOCABULARIES_DATASTREAM_CHECKPOINTS_DIR = None
+"""Directory of the data streams checkpoints.
+
+Defaults to a ``datastream-checkpoints`` folder in the instance path. Enable
+checkpoints by setting ``checkpoint`` in the data stream configuration, either
+to ``True`` (the key is derived from the configuration) or to ``{"key": ...}``.
+"""
+
+VOCABULARIES_DATASTREAM_DEAD_LETTERS_DIR = None
+"""Directory of the data streams dead letters.
+
+Defaults to a ``datastream-dead-letters`` folder in the instance path. Enable
+dead letters by setting ``dead_letters`` in the data stream configuration,
+either to ``True`` (the file is named after the configuration) or to
+``{"path": ...}``.
+"""
+
+VOCABULARIES_DATASTREAM_CACHE_DIR = None
+"""Directory of the data streams stage caches.
+
+Defaults to a ``datastream-cache`` folder in the instance path. Enable the
+cache by setting ``cache`` in the data stream configuration, either to
+``True`` (the read entries are cached), to the cached stage (``read`` or
+``transform``) or to ``{"stage": ..., "max_age": ..., "key": ...}``. The
+cache files can be removed at any time, they are written again by the next
+complete run.
+"""
+
+VOCABULARIES_DATASTREAM_CACHE_REMOTE_MAX_AGE = 24 * 60 * 60
+"""Default ``max_age``, in seconds, of the stage caches of remote origins.
+
+The caches of the local files are keyed by their checksums, while the remote
+origins are keyed by their configuration only, so their caches expire after
+this age unless the data stream configuration sets its own ``max_age``. Set it
+to ``None`` to never expire them.
+"""
+
+VOCABULARIES_DATASTREAM_SPOOL_DOWNLOADS = False
+"""Whether the HTTP readers of the large data dumps spool them to disk.
+
+When enabled, the ROR, OpenAIRE and CORDIS HTTP readers stream the downloaded
+files to temporary files instead of loading them in memory, and remove them
+once read. It can be set per reader with the ``spool`` argument, which is
+enabled in the OpenAIRE and CORDIS configurations (multi-gigabyte files).
+"""
+
+VOCABULARIES_DATASTREAM_SPOOL_DIR = None
+"""Directory of the spooled downloads, defaults to the temporary directory."""
+
+VOCABULARIES_DATASTREAM_DOWNLOAD_CACHE = False
+"""Whether to keep the downloaded data dumps in a local cache.
+
+When enabled, the files fetched from a DOI (ROR, OpenAIRE, the CORDIS PIC
+mapping) and the CORDIS files are stored on disk, and revalidated with
+conditional requests (``ETag`` and ``If-Modified-Since``) on the next runs, so
+that an unchanged file is not downloaded again. The files are stored by their
+checksum, so the same file is stored once, e.g. for the ROR affiliations and
+funders.
+"""
+
+VOCABULARIES_DATASTREAM_DOWNLOAD_CACHE_DIR = None
+"""Directory of the download cache, defaults to the instance path."""
+
+VOCABULARIES_DATASTREAM_RATE_LIMITS = {}
+"""Rates, in entries per second, of the data streams rate limits by key.
+
+Enable a rate limit by setting ``rate_limit`` in the data stream configuration
+(or in the ``args`` of an ``async`` writer), either to a rate or to
+``{"rate": ..., "burst": ..., "key": ...}``. When running in a job, the key
+defaults to the id of the job. The rates set here take precedence over the
+configured ones, and the rates set with ``invenio vocabularies rate-limit``
+take precedence over both while the data streams are running.
+"""
+
 VOCABULARIES_TYPES_SORT_OPTIONS = {
     "name": dict(
         title=_("Name"),
@@ -252,6 +356,8 @@ VOCABULARIES_ORCID_SYNC_SINCE = {
     "days": 1,
 }
 """ORCID time shift to sync. Parameters accepted are the ones passed to 'datetime.timedelta'."""
+VOCABULARIES_ORCID_SYNC_MAX_MEMORY_KEYS = 1_000_000
+"""ORCID number of ORCiDs to sync kept in memory to skip duplicates, the rest are kept on disk."""
 
 VOCABULARIES_ORCID_ORG_IDS_MAPPING_PATH = None
 """Path to the CSV file for mapping ORCiD organization IDs to affiliation IDs.
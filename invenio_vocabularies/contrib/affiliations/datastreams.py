@@ -195,14 +195,14 @@ VOCABULARIES_DATASTREAM_TRANSFORMERS = {
 
 DATASTREAM_CONFIG = {
     "readers": [
-        {"type": "ror-http"},
+        {"type": "ror-http", "args": {"range_requests": True}},
         {
             "type": "zip",
             "args": {
                 "regex": "-ror-data\\.json$",
             },
         },
-        {"type": "json"},
+        {"type": "json-stream"},
     ],
     "transformers": [
         {
@@ -227,12 +227,15 @@ An origin is required for the reader.
 
 DATASTREAM_CONFIG_OPENAIRE = {
     "readers": [
-        {"type": "openaire-http", "args": {"tar_hrefs": ["/organization.tar"]}},
+        {
+            "type": "openaire-http",
+            "args": {"tar_hrefs": ["/organization.tar"], "stream": True},
+        },
         {
             "type": "tar",
             "args": {
                 "regex": "\\.json.gz$",
-                "mode": "r",
+                "mode": "r|",
             },
         },
         {"type": "gzip"},
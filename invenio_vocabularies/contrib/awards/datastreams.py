@@ -7,7 +7,6 @@ import csv
 import io
 import os
 
-import requests
 from flask import current_app
 from idutils import is_doi
 from invenio_access.permissions import system_identity
@@ -15,11 +14,21 @@ from invenio_i18n import lazy_gettext as _
 
 from invenio_vocabularies.contrib.common.utils import (
     DOIFileFetchError,
+    download_cache,
     fetch_doi_file,
+    http_session,
+    spool_download,
+    spool_downloads,
 )
 
-from ...datastreams.errors import ReaderError, TransformerError
+from ...datastreams.compact import CompactEntry
+from ...datastreams.errors import (
+    RangeNotSupportedError,
+    ReaderError,
+    TransformerError,
+)
 from ...datastreams.readers import BaseReader
+from ...datastreams.remote import open_remote
 from ...datastreams.transformers import BaseTransformer
 from ...datastreams.writers import ServiceWriter
 from .config import awards_ec_ror_id, awards_openaire_funders_mapping
@@ -38,9 +47,32 @@ class AwardsServiceWriter(ServiceWriter):
         return entry["id"]
 
 
+class AwardEntry(CompactEntry):
+    """Compact award record transformed from an OpenAIRE or CORDIS project."""
+
+    __slots__ = (
+        "id",
+        "number",
+        "title",
+        "funder",
+        "acronym",
+        "program",
+        "identifiers",
+        "start_date",
+        "end_date",
+        "description",
+        "short_description",
+        "website",
+        "subjects",
+        "organizations",
+    )
+
+
 class OpenAIREProjectTransformer(BaseTransformer):
     """Transforms an OpenAIRE project record into an award record."""
 
+    compact_entry = AwardEntry
+
     def apply(self, stream_entry, **kwargs):
         """Applies the transformation to the stream entry."""
         record = stream_entry.entry
@@ -125,13 +157,29 @@ class OpenAIREProjectTransformer(BaseTransformer):
         if "summary" in record:
             award["description"] = {"en": record["summary"]}
 
-        stream_entry.entry = award
+        stream_entry.entry = self._compact(award)
         return stream_entry
 
 
 class CORDISProjectHTTPReader(BaseReader):
     """CORDIS Project HTTP Reader returning an in-memory binary stream of the latest CORDIS Horizon Europe project zip file."""
 
+    def __init__(
+        self, origin=None, mode="r", spool=None, range_requests=False, *args, **kwargs
+    ):
+        """Constructor.
+
+        :param spool: if True, the zip file is downloaded to a temporary file
+            instead of memory. Defaults to the
+            ``VOCABULARIES_DATASTREAM_SPOOL_DOWNLOADS`` config.
+        :param range_requests: if True, the zip file is read with HTTP range
+            requests, so that the ZIP reader downloads only the members it
+            reads. Falls back to downloading it if not supported.
+        """
+        self._spool = spool
+        self._range_requests = range_requests
+        super().__init__(origin, mode, *args, **kwargs)
+
     def _iter(self, fp, *args, **kwargs):
         raise NotImplementedError(
             "CORDISProjectHTTPReader downloads one file and therefore does not iterate through items"
@@ -155,10 +203,37 @@ class CORDISProjectHTTPReader(BaseReader):
                 "The --origin option should be either 'HE' (for Horizon Europe) or 'H2020' (for Horizon 2020) or 'FP7'"
             )
 
+        with http_session() as session:
+            yield from self._read_file(file_url, session)
+
+    def _read_file(self, file_url, session):
+        """Yield the downloaded file, cached, read remotely or spooled if enabled."""
+        cache = download_cache()
+        if cache is not None:
+            with open(cache.fetch(file_url, session=session), "rb") as fp:
+                yield fp
+            return
+
+        if self._range_requests:
+            try:
+                remote = open_remote(file_url, session=session)
+            except RangeNotSupportedError as e:
+                current_app.logger.info("%s, downloading the whole file.", e)
+            else:
+                with remote:
+                    yield remote
+                return
+
+        if spool_downloads(self._spool):
+            # Stream the ZIP file to a temporary file, removed once the stream ends.
+            with spool_download(file_url, session=session) as fp:
+                yield fp
+            return
+
         # Download the ZIP file and fully load the response bytes content in memory.
         # The bytes content are then wrapped by a BytesIO to be file-like object (as required by `zipfile.ZipFile`).
         # Using directly `file_resp.raw` is not possible since `zipfile.ZipFile` requires the file-like object to be seekable.
-        file_resp = requests.get(file_url)
+        file_resp = session.get(file_url)
         file_resp.raise_for_status()
         yield io.BytesIO(file_resp.content)
 
@@ -166,6 +241,8 @@ class CORDISProjectHTTPReader(BaseReader):
 class CORDISProjectTransformer(BaseTransformer):
     """Transforms a CORDIS project record into an award record."""
 
+    compact_entry = AwardEntry
+
     pic_mapping_params = {
         "source": None,
         "filename": "pic_mapping.csv",
@@ -426,7 +503,7 @@ class CORDISProjectTransformer(BaseTransformer):
             # See https://cordis.europa.eu/programme/id/HORIZON.1.2
             award["program"] = unique_programme_related_legal_basis["code"]
 
-        stream_entry.entry = award
+        stream_entry.entry = self._compact(award)
         return stream_entry
 
 
@@ -466,7 +543,7 @@ VOCABULARIES_DATASTREAM_WRITERS = {
 
 DATASTREAM_CONFIG_CORDIS = {
     "readers": [
-        {"type": "cordis-project-http"},
+        {"type": "cordis-project-http", "args": {"spool": True}},
         {
             "type": "zip",
             "args": {
@@ -8,6 +8,8 @@ import io
 from invenio_vocabularies.contrib.common.utils import (
     DOIFileFetchError,
     fetch_doi_file,
+    http_session,
+    spool_downloads,
 )
 from invenio_vocabularies.datastreams.errors import ReaderError
 from invenio_vocabularies.datastreams.readers import BaseReader
@@ -16,9 +18,28 @@ from invenio_vocabularies.datastreams.readers import BaseReader
 class OpenAIREHTTPReader(BaseReader):
     """OpenAIRE HTTP Reader returning an in-memory binary stream of the latest OpenAIRE Graph Dataset tar file of a given type."""
 
-    def __init__(self, origin=None, mode="r", tar_hrefs=None, *args, **kwargs):
-        """Constructor."""
+    def __init__(
+        self,
+        origin=None,
+        mode="r",
+        tar_hrefs=None,
+        spool=None,
+        stream=False,
+        *args,
+        **kwargs,
+    ):
+        """Constructor.
+
+        :param spool: if True, the tar file is downloaded to a temporary file
+            instead of memory. Defaults to the
+            ``VOCABULARIES_DATASTREAM_SPOOL_DOWNLOADS`` config.
+        :param stream: if True, the tar file is yielded as a non-seekable
+            stream read while it is being downloaded. The tar reader must open
+            it in ``r|`` mode.
+        """
         self.tar_hrefs = tar_hrefs
+        self._spool = spool
+        self._stream = stream
         super().__init__(origin, mode, *args, **kwargs)
 
     def _iter(self, fp, *args, **kwargs):
@@ -42,15 +63,24 @@ class OpenAIREHTTPReader(BaseReader):
         else:
             raise ReaderError("The --origin option should be either 'full' or 'diff'")
 
-        try:
-            file_bytes = fetch_doi_file(
-                doi,
-                lambda item: item.get("type") == "application/x-tar"
-                and item.get("href", "").endswith(tuple(self.tar_hrefs)),
-            )
-        except DOIFileFetchError as e:
-            raise ReaderError(str(e)) from e
-        yield io.BytesIO(file_bytes)
+        spool = spool_downloads(self._spool)
+        with http_session() as session:
+            try:
+                file_bytes = fetch_doi_file(
+                    doi,
+                    lambda item: item.get("type") == "application/x-tar"
+                    and item.get("href", "").endswith(tuple(self.tar_hrefs)),
+                    spool=spool,
+                    stream=self._stream,
+                    session=session,
+                )
+            except DOIFileFetchError as e:
+                raise ReaderError(str(e)) from e
+            if self._stream or spool:
+                with file_bytes:  # closed (and removed if spooled) once the stream ends
+                    yield file_bytes
+            else:
+                yield io.BytesIO(file_bytes)
 
 
 VOCABULARIES_DATASTREAM_READERS = {
@@ -13,7 +13,10 @@ from idutils import normalize_ror
 from invenio_vocabularies.contrib.common.utils import (
     DOIFileFetchError,
     fetch_doi_file,
+    http_session,
+    spool_downloads,
 )
+from invenio_vocabularies.datastreams.compact import CompactEntry
 from invenio_vocabularies.datastreams.errors import ReaderError, TransformerError
 from invenio_vocabularies.datastreams.readers import BaseReader
 from invenio_vocabularies.datastreams.transformers import BaseTransformer
@@ -28,9 +31,28 @@ class RORHTTPReader(BaseReader):
     binary stream of the latest ROR data dump ZIP file.
     """
 
-    def __init__(self, origin=None, mode="r", since=None, *args, **kwargs):
-        """Constructor."""
+    def __init__(
+        self,
+        origin=None,
+        mode="r",
+        since=None,
+        spool=None,
+        range_requests=False,
+        *args,
+        **kwargs,
+    ):
+        """Constructor.
+
+        :param spool: if True, the data dump is downloaded to a temporary file
+            instead of memory. Defaults to the
+            ``VOCABULARIES_DATASTREAM_SPOOL_DOWNLOADS`` config.
+        :param range_requests: if True, the data dump is read with HTTP range
+            requests, so that the ZIP reader downloads only the members it
+            reads. Falls back to downloading it if not supported.
+        """
         self._since = since
+        self._spool = spool
+        self._range_requests = range_requests
         super().__init__(origin, mode, *args, **kwargs)
 
     def _iter(self, fp, *args, **kwargs):
@@ -55,18 +77,29 @@ class RORHTTPReader(BaseReader):
             if self._since and self._since != "None"
             else None
         )
-        try:
-            content = fetch_doi_file(
-                ROR_DATA_DUMP_DOI,
-                lambda i: i.get("type") == "application/zip",
-                since=since,
-            )
-        except DOIFileFetchError as e:
-            raise ReaderError(str(e)) from e
-        if content is None:
-            current_app.logger.info(f"Skipping ROR data dump (since: {self._since})")
-            return
-        yield io.BytesIO(content)
+        spool = spool_downloads(self._spool)
+        with http_session() as session:
+            try:
+                content = fetch_doi_file(
+                    ROR_DATA_DUMP_DOI,
+                    lambda i: i.get("type") == "application/zip",
+                    since=since,
+                    spool=spool,
+                    range_requests=self._range_requests,
+                    session=session,
+                )
+            except DOIFileFetchError as e:
+                raise ReaderError(str(e)) from e
+            if content is None:
+                current_app.logger.info(
+                    f"Skipping ROR data dump (since: {self._since})"
+                )
+                return
+            if not isinstance(content, bytes):
+                with content:  # closed (and removed if spooled) once the stream ends
+                    yield content
+            else:
+                yield io.BytesIO(content)
 
 
 VOCABULARIES_DATASTREAM_READERS = {
@@ -74,9 +107,31 @@ VOCABULARIES_DATASTREAM_READERS = {
 }
 
 
+class ROREntry(CompactEntry):
+    """Compact record transformed from a ROR record."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "title",
+        "acronym",
+        "aliases",
+        "domains",
+        "website",
+        "country",
+        "country_name",
+        "location_name",
+        "types",
+        "status",
+        "identifiers",
+    )
+
+
 class RORTransformer(BaseTransformer):
     """Transforms a JSON ROR record into a funders record."""
 
+    compact_entry = ROREntry
+
     def __init__(
         self, *args, vocab_schemes=None, funder_fundref_doi_prefix=None, **kwargs
     ):
@@ -175,7 +230,7 @@ class RORTransformer(BaseTransformer):
                     }
                 )
 
-        stream_entry.entry = ror
+        stream_entry.entry = self._compact(ror)
         return stream_entry
 
 
@@ -3,16 +3,31 @@
 
 """Utility functions for Invenio-Vocabularies HTTP operations."""
 
+import hashlib
+import json
+import os
+import tempfile
 from datetime import datetime
+from pathlib import Path
 
 import requests
 from flask import current_app, has_app_context
 
+from ...datastreams.errors import RangeNotSupportedError
+from ...datastreams.remote import open_remote
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+"""Size of the chunks in which the spooled and cached downloads are written."""
+
 
 class DOIFileFetchError(Exception):
     """Raised when a file cannot be fetched from a DOI via signposting."""
 
 
+class DownloadChecksumError(DOIFileFetchError):
+    """Raised when a downloaded file does not match its size or checksum."""
+
+
 def invenio_user_agent(default="Invenio"):
     """Return a User-Agent string, using Flask config if available."""
     if has_app_context():
@@ -22,7 +37,247 @@ def invenio_user_agent(default="Invenio"):
     return default
 
 
-def fetch_doi_file(doi, select_func, since=None):
+def http_session():
+    """New HTTP session of the downloads, closed by the caller.
+
+    A reader keeps one session while it reads, so that the connections are
+    kept alive between its requests, e.g. the DOI resolution, the linkset and
+    the file of :func:`fetch_doi_file`.
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = invenio_user_agent()
+    return session
+
+
+class DownloadCache:
+    """Local cache of the downloaded files, addressed by their content.
+
+    The files are stored once per SHA-256 checksum under ``objects/``, and
+    ``index/`` maps each URL to the checksum of its file and to its validators
+    (``ETag`` and ``Last-Modified``). A cached URL is revalidated with a
+    conditional request, and only downloaded again if it changed, its previous
+    file being removed unless another URL has the same one.
+    """
+
+    def __init__(self, directory=None, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """Constructor.
+
+        :param directory: directory of the cache. Defaults to the
+            ``VOCABULARIES_DATASTREAM_DOWNLOAD_CACHE_DIR`` config, or to a
+            ``download-cache`` folder in the instance path.
+        """
+        if not directory and has_app_context():
+            directory = current_app.config.get(
+                "VOCABULARIES_DATASTREAM_DOWNLOAD_CACHE_DIR"
+            ) or (Path(current_app.instance_path) / "download-cache")
+        if not directory:
+            raise ValueError("The directory of the download cache is required.")
+        self.directory = Path(directory)
+        self.chunk_size = chunk_size
+
+    def _index_path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "index" / f"{key}.json"
+
+    def object_path(self, sha256):
+        """Path of a cached file."""
+        return self.directory / "objects" / sha256[:2] / sha256
+
+    def lookup(self, url):
+        """Index entry of a cached URL, ``None`` if its file is not cached."""
+        try:
+            with open(self._index_path(url)) as fp:
+                entry = json.load(fp)
+        except (FileNotFoundError, ValueError):
+            return None
+        if not self.object_path(entry["sha256"]).is_file():
+            return None
+        return entry
+
+    def fetch(self, url, session=None, checksum=None):
+        """Path of the cached file of a URL, downloaded if missing or changed.
+
+        :param session: HTTP session, if not given the file is downloaded
+            without one.
+        :param checksum: expected checksum of the file, as
+            ``<algorithm>:<hex digest>`` (e.g. ``md5:...``). The download is
+            verified against it, and skipped if a file with this checksum was
+            already downloaded from the URL.
+        """
+        entry = self.lookup(url)
+        if entry and checksum and entry.get("checksum") == checksum:
+            return self.object_path(entry["sha256"])
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        get = session.get if session is not None else requests.get
+        with get(url, headers=headers, stream=True) as resp:
+            if entry and resp.status_code == 304:
+                current_app.logger.info("Using the cached download of %s.", url)
+                return self.object_path(entry["sha256"])
+            resp.raise_for_status()
+            sha256, tmp_path = self._download(url, resp, checksum)
+
+        # The file is indexed before it is visible, so that it is not removed
+        # as unused by another process (see :meth:`_remove_unused`).
+        self._write_index(
+            url,
+            {
+                "url": url,
+                "sha256": sha256,
+                "checksum": checksum,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            },
+        )
+        path = self.object_path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)  # the same content replaces the same content
+        if entry and entry["sha256"] != sha256:
+            self._remove_unused(entry["sha256"])
+        return path
+
+    def _download(self, url, resp, checksum=None):
+        """Download the body of a response, verifying it while it is written.
+
+        :returns: the SHA-256 checksum of the body and the path of the
+            temporary file it was written to.
+        """
+        algorithm, _, expected = (checksum or "").partition(":")
+        sha256 = hashlib.sha256()
+        digest = hashlib.new(algorithm) if checksum else None
+        size = 0
+        tmp_dir = self.directory / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as fp:
+            try:
+                for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                    fp.write(chunk)
+                    sha256.update(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+                    size += len(chunk)
+                length = resp.headers.get("Content-Length")
+                if length and not resp.headers.get("Content-Encoding"):
+                    if size != int(length):
+                        raise DownloadChecksumError(
+                            f"Downloaded {size} bytes of {length} from {url}."
+                        )
+                if digest is not None and digest.hexdigest() != expected.lower():
+                    raise DownloadChecksumError(
+                        f"The checksum of {url} does not match {checksum}."
+                    )
+            except BaseException:
+                fp.close()
+                os.unlink(fp.name)
+                raise
+        return sha256.hexdigest(), fp.name
+
+    def _write_index(self, url, entry):
+        path = self._index_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump(entry, fp)
+        os.replace(tmp_path, path)
+
+    def _remove_unused(self, sha256):
+        """Remove the previous file of a URL, unless another URL indexes it."""
+        for path in (self.directory / "index").glob("*.json"):
+            try:
+                with open(path) as fp:
+                    if json.load(fp)["sha256"] == sha256:
+                        return
+            except (FileNotFoundError, ValueError, KeyError):
+                continue
+        self.object_path(sha256).unlink(missing_ok=True)
+
+
+def download_cache(cache=None):
+    """Download cache to use, ``None`` if disabled.
+
+    :param cache: explicit choice of the caller (a boolean or a
+        :class:`DownloadCache`), defaults to the
+        ``VOCABULARIES_DATASTREAM_DOWNLOAD_CACHE`` config.
+    """
+    if isinstance(cache, DownloadCache):
+        return cache
+    if cache is None and has_app_context():
+        cache = current_app.config.get("VOCABULARIES_DATASTREAM_DOWNLOAD_CACHE", False)
+    return DownloadCache() if cache else None
+
+
+def spool_downloads(spool=None):
+    """Whether to spool the downloads to disk.
+
+    :param spool: explicit choice of the caller, defaults to the
+        ``VOCABULARIES_DATASTREAM_SPOOL_DOWNLOADS`` config.
+    """
+    if spool is not None:
+        return bool(spool)
+    if has_app_context():
+        return current_app.config.get("VOCABULARIES_DATASTREAM_SPOOL_DOWNLOADS", False)
+    return False
+
+
+def spool_download(url, session=None, chunk_size=DOWNLOAD_CHUNK_SIZE, **kwargs):
+    """Download a file to a temporary spool file instead of memory.
+
+    The file is streamed in chunks to a temporary file in the
+    ``VOCABULARIES_DATASTREAM_SPOOL_DIR`` directory (or the system temporary
+    directory), which is removed once closed.
+
+    :returns: the spool file, a seekable binary file positioned at its start.
+    """
+    directory = None
+    if has_app_context():
+        directory = current_app.config.get("VOCABULARIES_DATASTREAM_SPOOL_DIR")
+    get = session.get if session is not None else requests.get
+    fp = tempfile.TemporaryFile(dir=directory, prefix="invenio-vocabularies-")
+    try:
+        with get(url, stream=True, **kwargs) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                fp.write(chunk)
+        fp.seek(0)
+    except BaseException:
+        fp.close()
+        raise
+    return fp
+
+
+def stream_download(url, session=None, **kwargs):
+    """Open a file download as a stream, read while it is being downloaded.
+
+    The stream is not seekable, e.g. tar archives are opened in ``r|`` mode.
+    The content encoding of the response (e.g. ``gzip``) is decoded.
+
+    :returns: the raw body of the response. The caller closes it.
+    """
+    get = session.get if session is not None else requests.get
+    resp = get(url, stream=True, **kwargs)
+    try:
+        resp.raise_for_status()
+    except BaseException:
+        resp.close()
+        raise
+    resp.raw.decode_content = True
+    return resp.raw
+
+
+def fetch_doi_file(
+    doi,
+    select_func,
+    since=None,
+    spool=False,
+    range_requests=False,
+    stream=False,
+    cache=None,
+    session=None,
+):
     """Fetch one file linked from a DOI via FAIR signposting.
 
     Resolves the linksets advertised at ``doi`` (signposting profile,
@@ -40,61 +295,113 @@ def fetch_doi_file(doi, select_func, since=None):
         item for which it returns truthy is fetched.
     :param since: Optional ``datetime``. The file is fetched only when the record was
         republished at or after this point.
+    :param spool: If True, the file is downloaded to a temporary spool file (see
+        :func:`spool_download`), which is returned instead of the bytes. The
+        caller closes it.
+    :param range_requests: If True, a remote file read with range requests
+        (see :func:`~invenio_vocabularies.datastreams.remote.open_remote`) is
+        returned instead, e.g. to read only some members of a ZIP archive. The
+        file is downloaded as usual if the server does not support them.
+    :param stream: If True, the file is returned as a stream read while it is
+        being downloaded (see :func:`stream_download`).
+    :param cache: whether to use the download cache (see :func:`download_cache`).
+        The cached file is returned as an open file if any of ``spool``,
+        ``range_requests`` or ``stream`` is set, else as bytes. The linksets
+        do not advertise the checksums of the files, so the downloads are only
+        verified against their ``Content-Length``.
+    :param session: HTTP session of the requests (see :func:`http_session`).
+        If not given, a session is created and closed before returning.
     """
+    if session is None:
+        with http_session() as session:
+            return _fetch_doi_file(
+                doi, select_func, since, spool, range_requests, stream, cache, session
+            )
+    return _fetch_doi_file(
+        doi, select_func, since, spool, range_requests, stream, cache, session, True
+    )
+
+
+def _fetch_doi_file(
+    doi,
+    select_func,
+    since,
+    spool,
+    range_requests,
+    stream,
+    cache,
+    session,
+    session_kept=False,
+):
+    """Fetch one file linked from a DOI (see :func:`fetch_doi_file`)."""
     if not doi.startswith(("http://", "https://")):
         doi = f"https://doi.org/{doi}"
 
-    with requests.Session() as session:
-        session.headers["User-Agent"] = invenio_user_agent()
+    # Resolve the DOI to the linkset endpoint via the rel="linkset" Link header.
+    resp = session.get(doi, allow_redirects=True)
+    resp.raise_for_status()
+    if "linkset" not in resp.links:
+        raise DOIFileFetchError(f"Linkset not found at {doi}")
+    linkset_resp = session.get(
+        resp.links["linkset"]["url"],
+        headers={"Accept": "application/linkset+json"},
+    )
+    linkset_resp.raise_for_status()
+    linksets = linkset_resp.json()["linkset"]
 
-        # Resolve the DOI to the linkset endpoint via the rel="linkset" Link header.
-        resp = session.get(doi, allow_redirects=True)
-        resp.raise_for_status()
-        if "linkset" not in resp.links:
-            raise DOIFileFetchError(f"Linkset not found at {doi}")
-        linkset_resp = session.get(
-            resp.links["linkset"]["url"],
-            headers={"Accept": "application/linkset+json"},
+    # If `since` is set, skip when the record's publication date is older.
+    if since is not None:
+        ld_link = next(
+            (
+                fmt
+                for linkset in linksets
+                for fmt in linkset.get("describedby", [])
+                if fmt.get("type") == "application/ld+json"
+            ),
+            None,
         )
-        linkset_resp.raise_for_status()
-        linksets = linkset_resp.json()["linkset"]
-
-        # If `since` is set, skip when the record's publication date is older.
-        if since is not None:
-            ld_link = next(
-                (
-                    fmt
-                    for linkset in linksets
-                    for fmt in linkset.get("describedby", [])
-                    if fmt.get("type") == "application/ld+json"
-                ),
-                None,
-            )
-            if ld_link is None:
-                raise DOIFileFetchError(f"No JSON-LD describedby entry found for {doi}")
-            ld_resp = session.get(ld_link["href"], headers={"Accept": ld_link["type"]})
-            ld_resp.raise_for_status()
-            ld_data = ld_resp.json()
-            date_str = ld_data.get("dateCreated") or ld_data.get("datePublished")
-            if not date_str:
-                raise DOIFileFetchError(
-                    f"JSON-LD at {ld_link['href']} has no dateCreated or datePublished"
-                )
-            pub_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            if pub_date < since:
-                return None
-
-        # Pick the single matching item and download it.
-        matches = [
-            item
-            for linkset in linksets
-            for item in linkset.get("item", [])
-            if select_func(item)
-        ]
-        if len(matches) != 1:
+        if ld_link is None:
+            raise DOIFileFetchError(f"No JSON-LD describedby entry found for {doi}")
+        ld_resp = session.get(ld_link["href"], headers={"Accept": ld_link["type"]})
+        ld_resp.raise_for_status()
+        ld_data = ld_resp.json()
+        date_str = ld_data.get("dateCreated") or ld_data.get("datePublished")
+        if not date_str:
             raise DOIFileFetchError(
-                f"Expected 1 matching linkset item at {doi}, got {len(matches)}"
+                f"JSON-LD at {ld_link['href']} has no dateCreated or datePublished"
             )
-        file_resp = session.get(matches[0]["href"])
-        file_resp.raise_for_status()
-        return file_resp.content
+        pub_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        if pub_date < since:
+            return None
+
+    # Pick the single matching item and download it.
+    matches = [
+        item
+        for linkset in linksets
+        for item in linkset.get("item", [])
+        if select_func(item)
+    ]
+    if len(matches) != 1:
+        raise DOIFileFetchError(
+            f"Expected 1 matching linkset item at {doi}, got {len(matches)}"
+        )
+    href = matches[0]["href"]
+    cache = download_cache(cache)
+    if cache is not None:
+        path = cache.fetch(href, session=session)
+        if spool or range_requests or stream:
+            return open(path, "rb")
+        return path.read_bytes()
+    if range_requests:
+        try:
+            # the remote file outlives a session closed when returning
+            return open_remote(href, session=session if session_kept else None)
+        except RangeNotSupportedError as e:
+            current_app.logger.info("%s, downloading the whole file.", e)
+    if stream:
+        return stream_download(href, session=session)
+    if spool:
+        return spool_download(href, session=session)
+    file_resp = session.get(href)
+    file_resp.raise_for_status()
+    return file_resp.content
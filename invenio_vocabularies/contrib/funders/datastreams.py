@@ -61,14 +61,14 @@ VOCABULARIES_DATASTREAM_TRANSFORMERS = {
 
 DATASTREAM_CONFIG = {
     "readers": [
-        {"type": "ror-http"},
+        {"type": "ror-http", "args": {"range_requests": True}},
         {
             "type": "zip",
             "args": {
                 "regex": "-ror-data\\.json$",
             },
         },
-        {"type": "json"},
+        {"type": "json-stream"},
     ],
     "transformers": [
         {
@@ -20,8 +20,11 @@ from werkzeug.utils import cached_property
 
 from invenio_vocabularies.contrib.names.s3client import S3OrcidClient
 
+from ...datastreams.compact import CompactEntry
+from ...datastreams.dedup import SeenKeys
 from ...datastreams.errors import TransformerError
 from ...datastreams.readers import BaseReader, SimpleHTTPReader
+from ...datastreams.sharding import shard_of
 from ...datastreams.transformers import BaseTransformer
 from ...datastreams.writers import ServiceWriter
 
@@ -29,22 +32,27 @@ from ...datastreams.writers import ServiceWriter
 class OrcidDataSyncReader(BaseReader):
     """ORCiD Data Sync Reader."""
 
-    def __init__(self, origin=None, mode="r", since=None, *args, **kwargs):
+    def __init__(self, origin=None, mode="r", since=None, shard=None, *args, **kwargs):
         """Constructor.
 
         :param origin: Data source (e.g. filepath).
                        Can be none in case of piped readers.
+        :param shard: dictionary with the ``index`` and ``count`` of shards.
+                      When given, only the ORCiDs of the shard are fetched.
         """
         super().__init__(origin=origin, mode=mode, *args, **kwargs)
         self.s3_client = S3OrcidClient()
         self.since = since
+        self.shard = shard
+        self._lambda_content = None
+        self._total = None
 
     def _fetch_orcid_data(self, app, orcid_to_sync, bucket):
         """Fetches a single ORCiD record from S3."""
         # The ORCiD file key is located in a folder which name corresponds to the last three digits of the ORCiD
         suffix = orcid_to_sync[-3:]
         key = f"{suffix}/{orcid_to_sync}.xml"
-        app.logger.debug(f"Fetching ORCiD record: {key} from bucket: {bucket}")
+        app.logger.debug("Fetching ORCiD record: %s from bucket: %s", key, bucket)
         try:
             # Potential improvement: use the a XML jax parser to avoid loading the whole file in memory
             # and choose the sections we need to read (probably the summary)
@@ -90,13 +98,16 @@ class OrcidDataSyncReader(BaseReader):
 
                 if last_modified_date < last_sync:
                     current_app.logger.debug(
-                        f"Skipping ORCiD {orcid}: last modified {last_modified_date} is older than cutoff {last_sync}"
+                        "Skipping ORCiD %s: last modified %s is older than cutoff %s",
+                        orcid,
+                        last_modified_date,
+                        last_sync,
                     )
                     current_app.logger.info(
                         "Reached cutoff date. No more recent records to process."
                     )
                     break
-                current_app.logger.debug(f"Yielding ORCiD {orcid} for sync.")
+                current_app.logger.debug("Yielding ORCiD %s for sync.", orcid)
                 yield orcid
         finally:
             fileobj.close()
@@ -126,7 +137,7 @@ class OrcidDataSyncReader(BaseReader):
                     result = futures[orcid].result()
                     if result:
                         current_app.logger.debug(
-                            f"Successfully fetched ORCiD record: {orcid}"
+                            "Successfully fetched ORCiD record: %s", orcid
                         )
                         yield result
                 except Exception:
@@ -147,31 +158,74 @@ class OrcidDataSyncReader(BaseReader):
             "s3://orcid-lambda-file/last_modified.csv.tar"
         )
         current_app.logger.info("Fetching ORCiD lambda file")
-        # Opens tar file and process it
-        with tarfile.open(fileobj=io.BytesIO(tar_content)) as tar:
-            # Iterate over each member (file or directory) in the tar file
-            for member in tar.getmembers():
-                # Extract the file
-                extracted_file = tar.extractfile(member)
-                if extracted_file:
-                    current_app.logger.info(f"Processing lambda file: {member.name}")
-                    # Process the file and get the ORCiDs to sync
-                    orcids_to_sync = set(self._process_lambda_file(extracted_file))
-
-                    # Close the file explicitly after processing
-                    extracted_file.close()
-
-                    # Process ORCIDs in smaller batches
-                    for orcid_batch in self._chunked_iter(
-                        orcids_to_sync, batch_size=100
-                    ):
-                        yield from self._iter(orcid_batch)
+        self._lambda_content = tar_content
+        # The ORCiDs already synced, with a bounded memory usage
+        seen_orcids = SeenKeys(
+            max_memory_keys=current_app.config[
+                "VOCABULARIES_ORCID_SYNC_MAX_MEMORY_KEYS"
+            ]
+        )
+        try:
+            # Opens tar file and process it
+            with tarfile.open(fileobj=io.BytesIO(tar_content)) as tar:
+                # Iterate over each member (file or directory) in the tar file
+                for member in tar.getmembers():
+                    # Extract the file
+                    extracted_file = tar.extractfile(member)
+                    if extracted_file:
+                        current_app.logger.info(
+                            "Processing lambda file: %s", member.name
+                        )
+                        # Stream the ORCiDs to sync, skipping the duplicates
+                        orcids_to_sync = (
+                            orcid
+                            for orcid in self._process_lambda_file(extracted_file)
+                            if self._in_shard(orcid) and seen_orcids.add(orcid)
+                        )
+
+                        # Process ORCIDs in smaller batches
+                        for orcid_batch in self._chunked_iter(
+                            orcids_to_sync, batch_size=100
+                        ):
+                            yield from self._iter(orcid_batch)
+
+                        # Close the file explicitly after processing
+                        extracted_file.close()
+        finally:
+            seen_orcids.close()
+            self._lambda_content = None
+
+    def estimate(self):
+        """Number of ORCiDs to sync, once the lambda file is fetched.
+
+        The ORCiDs modified after the cutoff date are counted on the first
+        call, as they are otherwise streamed. Duplicates are counted as well.
+        """
+        if self._total is None and self._lambda_content is not None:
+            total = 0
+            with tarfile.open(fileobj=io.BytesIO(self._lambda_content)) as tar:
+                for member in tar.getmembers():
+                    extracted_file = tar.extractfile(member)
+                    if extracted_file:
+                        total += sum(
+                            1
+                            for orcid in self._process_lambda_file(extracted_file)
+                            if self._in_shard(orcid)
+                        )
+            self._total = total
+        return None if self._total is None else {"entries": self._total}
+
+    def _in_shard(self, orcid):
+        """Checks if the ORCiD belongs to the shard of the reader, if any."""
+        if not self.shard:
+            return True
+        return shard_of(orcid, self.shard["count"]) == self.shard["index"]
 
     def _chunked_iter(self, iterable, batch_size):
         """Yield successive chunks of a given size."""
         it = iter(iterable)
         while chunk := list(islice(it, batch_size)):
-            current_app.logger.debug(f"Processing batch of size {len(chunk)}.")
+            current_app.logger.debug("Processing batch of size %s.", len(chunk))
             yield chunk
 
 
@@ -238,14 +292,23 @@ class OrcidOrgToAffiliationMapper:
         return self.org_ids_mapping.get((org_scheme, org_id))
 
 
+class OrcidNameEntry(CompactEntry):
+    """Compact names record transformed from an ORCiD record."""
+
+    __slots__ = ("id", "given_name", "family_name", "identifiers", "affiliations")
+
+
 class OrcidTransformer(BaseTransformer):
     """Transforms an ORCiD record into a names record."""
 
+    compact_entry = OrcidNameEntry
+
     def __init__(
         self,
         *args,
         names_exclude_regex=DEFAULT_NAMES_EXCLUDE_REGEX,
         org_id_to_affiliation_id_func=None,
+        compact=False,
         **kwargs,
     ) -> None:
         """Constructor."""
@@ -253,7 +316,7 @@ class OrcidTransformer(BaseTransformer):
         self._org_id_to_affiliation_id_func = (
             org_id_to_affiliation_id_func or OrcidOrgToAffiliationMapper()
         )
-        super().__init__()
+        super().__init__(compact=compact)
 
     def org_id_to_affiliation_id(self, org_scheme, org_id):
         """Convert and ORCiD org ID to a linkable affiliation ID."""
@@ -307,8 +370,8 @@ class OrcidTransformer(BaseTransformer):
             "affiliations": self._extract_affiliations(record),
         }
 
-        stream_entry.entry = entry
-        current_app.logger.debug(f"Transformed entry: {entry}")
+        stream_entry.entry = self._compact(entry)
+        current_app.logger.debug("Transformed entry: %s", entry)
         return stream_entry
 
     def _is_valid_name(self, name):
@@ -468,6 +531,7 @@ ORCID_PRESET_DATASTREAM_CONFIG = {
     ],
     "batch_size": 1000,
     "write_many": True,
+    "max_batch_latency": 60,
 }
 """ORCiD Data Stream configuration.
 
@@ -3,10 +3,11 @@
 
 """Datastreams module."""
 
-from .datastreams import DataStream, StreamEntry
+from .datastreams import BranchingDataStream, DataStream, StreamEntry
 from .factories import DataStreamFactory
 
 __all__ = (
+    "BranchingDataStream",
     "DataStream",
     "DataStreamFactory",
     "StreamEntry",
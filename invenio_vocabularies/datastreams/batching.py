@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data stream batching policies."""
+
+
+class AdaptiveBatchSize:
+    """Batch size adapted to the latency and error rate of the writes.
+
+    After each written batch, the size is set to the number of entries that
+    would be written in the target latency at the measured rate (at most
+    halving or doubling it at once), and halved when the error rate of the
+    batch exceeds the accepted one. The size always stays between the
+    configured bounds.
+
+    Only the writes done by the data stream are measured. With an ``async``
+    writer, they would only dispatch the write tasks, so the adaptive batch
+    size is disabled for the data streams with such writers.
+    """
+
+    def __init__(
+        self,
+        min_size=10,
+        max_size=10000,
+        target_latency=5.0,
+        max_error_rate=0.1,
+    ):
+        """Constructor.
+
+        :param min_size: minimum batch size.
+        :param max_size: maximum batch size.
+        :param target_latency: target time, in seconds, to write a batch.
+        :param max_error_rate: ratio of entries with errors in a batch above
+            which the batch size is halved.
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.size = min_size
+
+    def clamp(self, size):
+        """Bound a batch size to the configured minimum and maximum."""
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    def update(self, batch_size, latency, errors=0):
+        """Adapt the size after writing a batch.
+
+        :param batch_size: number of entries written.
+        :param latency: time, in seconds, it took to write them.
+        :param errors: number of entries written with errors.
+        :returns: the new batch size.
+        """
+        if not batch_size:
+            return self.size
+
+        if errors / batch_size > self.max_error_rate:
+            size = self.size / 2
+        elif latency <= 0:
+            size = self.size * 2
+        else:
+            # Number of entries that would be written in the target latency
+            size = batch_size * self.target_latency / latency
+            size = min(self.size * 2, max(self.size / 2, size))
+        self.size = self.clamp(size)
+        return self.size
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the batch size policy of a data stream configuration.
+
+        ``config["adaptive_batch_size"]`` is either ``True`` or a dictionary
+        with the constructor arguments, e.g. ``{"target_latency": 10}``.
+        """
+        options = config.get("adaptive_batch_size")
+        return cls(**options) if isinstance(options, dict) else cls()
@@ -0,0 +1,260 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Cache of the output of the data stream stages.
+
+The entries read (``read`` stage) or transformed (``transform`` stage) by a
+complete data stream run are stored in a compressed file, keyed by the
+checksum of the source files and the configuration of the stages. The next
+runs with the same source and configuration start from the cache instead of
+downloading and parsing the source again, e.g. while developing a transformer
+or retrying the writes.
+
+The entries are pickled, so that they do not need to be JSON serializable: only
+load caches written by trusted runs. The objects shared by the entries, e.g. the
+graph of the entries of the RDF readers, are stored once per segment of
+:data:`SEGMENT_ENTRIES` entries, and shared again once loaded.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from time import time
+
+from flask import current_app
+
+from .filters import READ_STAGE, TRANSFORM_STAGE
+
+STAGES = (READ_STAGE, TRANSFORM_STAGE)
+"""Stages whose output can be cached."""
+
+SEGMENT_ENTRIES = 10000
+"""Number of entries pickled together, sharing their common objects.
+
+The objects of a segment are kept in memory until it is complete, while it is
+written or read.
+"""
+
+_END_OF_SEGMENT = None
+
+
+def source_checksum(path, chunk_size=1024 * 1024):
+    """SHA-256 checksum of a source file."""
+    checksum = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def _is_local_file(origin):
+    return isinstance(origin, (str, Path)) and os.path.isfile(origin)
+
+
+def has_remote_origin(config):
+    """Whether a reader of a data stream configuration reads a remote origin.
+
+    The readers without an origin (e.g. the HTTP readers of a DOI) or with an
+    origin that is not a local file are considered remote, while the origins
+    given inline (e.g. a list of entries) are not.
+    """
+    for reader_config in config.get("readers") or []:
+        origin = (reader_config.get("args") or {}).get("origin")
+        if origin is None or (isinstance(origin, str) and not _is_local_file(origin)):
+            return True
+    return False
+
+
+def cache_key(config, stage=READ_STAGE):
+    """Key identifying the output of a stage of a data stream configuration.
+
+    Derived from the readers configuration, the checksums of the local files
+    they read, and the shard of the data stream if any. The ``transform``
+    stage key also depends on the transformers and filters. Remote origins are
+    identified by their configuration only, see the ``max_age`` of the cache.
+    """
+    stage_config = {"readers": config.get("readers")}
+    if stage == TRANSFORM_STAGE:
+        stage_config["transformers"] = config.get("transformers")
+        stage_config["filters"] = config.get("filters")
+    if config.get("shard"):
+        stage_config["shard"] = config["shard"]
+    checksums = []
+    for reader_config in config.get("readers") or []:
+        origin = (reader_config.get("args") or {}).get("origin")
+        if _is_local_file(origin):
+            checksums.append(source_checksum(origin))
+    stage_config["checksums"] = checksums
+    return hashlib.sha256(
+        json.dumps(stage_config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class StageCacheWriter:
+    """Writes the output of a stage to a temporary file, until committed."""
+
+    def __init__(self, path, stage, compresslevel=6):
+        """Constructor.
+
+        :param path: path of the cache file, replaced once committed.
+        :param stage: name of the cached stage, for the logs.
+        :param compresslevel: gzip compression level.
+        """
+        self.path = path
+        self.stage = stage
+        self.compresslevel = compresslevel
+        self.entries = 0
+        self.skipped = 0
+        self._tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        self._file = None
+        self._pickler = None
+        self._failed = False
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self._tmp_path, "wb", compresslevel=self.compresslevel)
+        self._pickler = pickle.Pickler(self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def add(self, stream_entry):
+        """Store an entry, the entries with errors are skipped."""
+        if self._failed:
+            return
+        if stream_entry.errors:
+            self.skipped += 1
+            return
+        if self._file is None:
+            self._open()
+        try:
+            self._pickler.dump((stream_entry.cursor, stream_entry.entry))
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            current_app.logger.warning(
+                "Not caching the %s stage, its entries cannot be stored: %s",
+                self.stage,
+                err,
+            )
+            self._failed = True
+            self.discard()
+            return
+        self.entries += 1
+        if self.entries % SEGMENT_ENTRIES == 0:
+            # the memo keeps the pickled objects, to refer to them again
+            self._pickler.dump(_END_OF_SEGMENT)
+            self._pickler.clear_memo()
+
+    def add_many(self, stream_entries):
+        """Store several entries."""
+        for stream_entry in stream_entries:
+            self.add(stream_entry)
+
+    def commit(self):
+        """Replace the cache file with the stored entries."""
+        if self._failed:
+            return
+        if self._file is None:
+            self._open()  # an empty output is cached too
+        self._file.close()
+        self._file = None
+        self._pickler = None
+        os.replace(self._tmp_path, self.path)
+        current_app.logger.info(
+            "Cached %s entries of the %s stage in %s (%s entries with errors "
+            "were not cached).",
+            self.entries,
+            self.stage,
+            self.path,
+            self.skipped,
+        )
+
+    def discard(self):
+        """Remove the stored entries, e.g. when the run is interrupted."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._pickler = None
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class StageCache:
+    """Cache of the output of a data stream stage."""
+
+    def __init__(self, key, stage=READ_STAGE, directory=None, max_age=None):
+        """Constructor.
+
+        :param key: identifies the output, see :func:`cache_key`.
+        :param stage: the cached stage, ``read`` or ``transform``.
+        :param directory: directory of the cache files. Defaults to the
+            ``VOCABULARIES_DATASTREAM_CACHE_DIR`` config, or to a
+            ``datastream-cache`` folder in the instance path.
+        :param max_age: seconds after which the cache is expired, e.g. to
+            download a remote origin again. Never expires when not set.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Cannot cache the {stage} stage, only {STAGES}.")
+        directory = directory or current_app.config.get(
+            "VOCABULARIES_DATASTREAM_CACHE_DIR"
+        )
+        if not directory:
+            directory = Path(current_app.instance_path) / "datastream-cache"
+        self.key = key
+        self.stage = stage
+        self.max_age = max_age
+        self.path = Path(directory) / f"{key}.{stage}.pickle.gz"
+
+    def exists(self):
+        """Whether the output is cached and not expired."""
+        try:
+            modified = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return self.max_age is None or time() - modified <= self.max_age
+
+    def load(self):
+        """Load the cached entries, as ``(cursor, entry)`` tuples."""
+        with gzip.open(self.path, "rb") as fp:
+            unpickler = pickle.Unpickler(fp)
+            while True:
+                try:
+                    entry = unpickler.load()
+                except EOFError:
+                    return
+                if entry is _END_OF_SEGMENT:
+                    unpickler = pickle.Unpickler(fp)
+                else:
+                    yield entry
+
+    def writer(self):
+        """Writer of the output of a run, see :class:`StageCacheWriter`."""
+        return StageCacheWriter(self.path, self.stage)
+
+    def clear(self):
+        """Remove the cached output."""
+        self.path.unlink(missing_ok=True)
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the cache of a data stream configuration.
+
+        ``config["cache"]`` is either ``True`` (i.e. the ``read`` stage), the
+        name of the cached stage, or a dictionary with the constructor
+        arguments, e.g. ``{"stage": "transform", "max_age": 86400}``. The key
+        defaults to the one derived from the configuration (see
+        :func:`cache_key`). The ``max_age`` of the remote origins defaults to
+        the ``VOCABULARIES_DATASTREAM_CACHE_REMOTE_MAX_AGE`` config.
+        """
+        options = config.get("cache")
+        if isinstance(options, str):
+            options = {"stage": options}
+        elif not isinstance(options, dict):
+            options = {}
+        options = dict(options)
+        stage = options.setdefault("stage", READ_STAGE)
+        if not options.get("key"):
+            options["key"] = cache_key(config, stage)
+        if "max_age" not in options and has_remote_origin(config):
+            options["max_age"] = current_app.config.get(
+                "VOCABULARIES_DATASTREAM_CACHE_REMOTE_MAX_AGE"
+            )
+        return cls(**options)
@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data stream checkpoints.
+
+A checkpoint stores the cursor of the last entry written by a data stream, so
+that an interrupted run can be resumed from that position. The cursor is the
+position of the entry in the reader chain, i.e. one index per reader (e.g. the
+archive member and the entry offset inside that member).
+"""
+
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from flask import current_app
+
+
+class BaseCheckpointStore(ABC):
+    """Base checkpoint store."""
+
+    @abstractmethod
+    def load(self, key):
+        """Load the cursor stored under the key, or ``None``."""
+        pass
+
+    @abstractmethod
+    def save(self, key, cursor):
+        """Store the cursor under the key."""
+        pass
+
+    @abstractmethod
+    def clear(self, key):
+        """Remove the cursor stored under the key."""
+        pass
+
+
+class FileCheckpointStore(BaseCheckpointStore):
+    """Stores the checkpoints as JSON files in a directory."""
+
+    def __init__(self, directory=None):
+        """Constructor.
+
+        :param directory: directory of the checkpoint files. Defaults to the
+            ``VOCABULARIES_DATASTREAM_CHECKPOINTS_DIR`` config, or to a
+            ``datastream-checkpoints`` folder in the instance path.
+        """
+        directory = directory or current_app.config.get(
+            "VOCABULARIES_DATASTREAM_CHECKPOINTS_DIR"
+        )
+        if not directory:
+            directory = Path(current_app.instance_path) / "datastream-checkpoints"
+        self._directory = Path(directory)
+
+    def _path(self, key):
+        return self._directory / f"{key}.json"
+
+    def load(self, key):
+        """Load the cursor stored under the key, or ``None``."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with open(path) as fp:
+            return tuple(json.load(fp)["cursor"])
+
+    def save(self, key, cursor):
+        """Store the cursor under the key.
+
+        The file is replaced atomically, so that a crash while saving keeps the
+        previous checkpoint.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump({"cursor": list(cursor)}, fp)
+        os.replace(tmp_path, path)
+
+    def clear(self, key):
+        """Remove the cursor stored under the key."""
+        self._path(key).unlink(missing_ok=True)
+
+
+class Checkpoint:
+    """Checkpoint of a data stream run."""
+
+    def __init__(self, key, store=None):
+        """Constructor.
+
+        :param key: identifies the run, the same key must be used to resume it.
+        :param store: a checkpoint store, defaults to a
+            :class:`FileCheckpointStore`.
+        """
+        self.key = key
+        self.store = store or FileCheckpointStore()
+        self.cursor = self.store.load(key)
+
+    def commit(self, cursor):
+        """Persist the cursor of the last written entry."""
+        self.store.save(self.key, cursor)
+        self.cursor = cursor
+
+    def clear(self):
+        """Remove the checkpoint, e.g. once the run is complete."""
+        self.store.clear(self.key)
+        self.cursor = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the checkpoint of a data stream configuration.
+
+        The key is read from ``config["checkpoint"]["key"]`` or, by default,
+        derived from the data stream configuration (see :func:`config_key`).
+        """
+        checkpoint_config = config.get("checkpoint")
+        if isinstance(checkpoint_config, dict) and checkpoint_config.get("key"):
+            return cls(checkpoint_config["key"])
+
+        return cls(config_key(config))
+
+
+def config_key(config):
+    """Key identifying a data stream configuration.
+
+    Derived from the readers, transformers, filters, writers and branches
+    configuration, and the shard of the data stream if any.
+    """
+    stream_config = {k: config.get(k) for k in ("readers", "transformers", "writers")}
+    for k in ("filters", "branches", "shard"):
+        if config.get(k):
+            stream_config[k] = config[k]
+    return hashlib.sha256(
+        json.dumps(stream_config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Coalescing of the writes of a data stream."""
+
+from .filters import field_path, field_value
+
+
+class Coalescer:
+    """Merges the entries with the same id over a window of batches.
+
+    Only the last entry of each id is written: the previous ones are
+    superseded. The entries are written once ``window`` batches are buffered,
+    in the order of their last occurrence.
+    """
+
+    def __init__(self, field="id", window=1):
+        """Constructor.
+
+        :param field: field of the entries id, see
+            :func:`invenio_vocabularies.datastreams.filters.field_path`.
+        :param window: number of batches to coalesce before writing them.
+        """
+        self.path = field_path(field)
+        self.window = window
+        self._entries = {}
+        self._batches = 0
+        self._cursor = None
+
+    @property
+    def ready(self):
+        """Whether the window is complete and the entries should be written."""
+        return self._batches >= self.window
+
+    @property
+    def pending(self):
+        """Whether there are buffered entries."""
+        return bool(self._entries)
+
+    def add(self, stream_entries, cursor=None):
+        """Buffer the entries of a batch.
+
+        :param cursor: cursor of the last entry of the batch.
+        :returns: the superseded entries.
+        """
+        superseded = []
+        for stream_entry in stream_entries:
+            key = field_value(stream_entry.entry, self.path)
+            if key is None:
+                key = object()  # cannot be coalesced
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                superseded.append(previous)
+            self._entries[key] = stream_entry
+        self._batches += 1
+        if cursor is not None:
+            self._cursor = cursor
+        return superseded
+
+    def flush(self):
+        """Get the buffered entries and the cursor of the last one."""
+        entries, cursor = list(self._entries.values()), self._cursor
+        self._entries = {}
+        self._batches = 0
+        self._cursor = None
+        return entries, cursor
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the coalescer of a data stream configuration.
+
+        ``config["coalesce"]`` is either ``True`` (within a batch, on the
+        ``id`` field) or a dictionary with the ``field`` and ``window``.
+        """
+        options = config.get("coalesce")
+        return cls(**options) if isinstance(options, dict) else cls()
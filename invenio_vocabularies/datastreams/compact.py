@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Compact entries of the data streams.
+
+The transformed entries of the large vocabularies (e.g. names, affiliations,
+awards) can be stored in slotted classes instead of dictionaries. Only the top
+level of an entry is compacted, its nested values are kept as they are: e.g. a
+ROR entry takes about 15% less memory. They are read-only mappings, so that the
+filters and coalescers see them as dictionaries, and they are converted to
+dictionaries by the writers (see :func:`as_dict`) and before the transformers
+which do not accept them (see ``BaseTransformer.accepts_compact``).
+
+When sent to the write tasks, the entries of a batch are packed as lists of
+values, so that their keys are not serialized once per entry.
+"""
+
+from collections.abc import Mapping
+
+from werkzeug.utils import import_string
+
+_MISSING = object()
+
+
+class CompactEntry(Mapping):
+    """Entry stored in slots, one per field.
+
+    Subclasses list their fields in ``__slots__``. The fields which are not
+    set are missing from the entry, like the keys of a dictionary.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        """Constructor."""
+        for name, value in fields.items():
+            if name not in self.__slots__:
+                raise TypeError(f"{type(self).__name__} has no field {name!r}.")
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, entry):
+        """Create a compact entry from a dictionary."""
+        return cls(**entry)
+
+    def __getitem__(self, key):
+        """Get the value of a field."""
+        if key in self.__slots__:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        """Iterate over the names of the set fields."""
+        for name in self.__slots__:
+            if getattr(self, name, _MISSING) is not _MISSING:
+                yield name
+
+    def __len__(self):
+        """Number of set fields."""
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        """Representation of the entry."""
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Convert the entry to a dictionary."""
+        entry = {}
+        for name in self.__slots__:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                entry[name] = value
+        return entry
+
+    def pack(self):
+        """Pack the entry in a list: the mask of the set fields and their values."""
+        mask, values = 0, []
+        for idx, name in enumerate(self.__slots__):
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                mask |= 1 << idx
+                values.append(value)
+        return [mask, *values]
+
+    @classmethod
+    def unpack(cls, packed):
+        """Create a compact entry from its packed list (see :meth:`pack`)."""
+        entry = cls.__new__(cls)
+        mask, values = packed[0], iter(packed[1:])
+        for idx, name in enumerate(cls.__slots__):
+            if mask & (1 << idx):
+                setattr(entry, name, next(values))
+        return entry
+
+
+def as_dict(entry):
+    """Convert a compact entry to a dictionary, other entries are unchanged."""
+    if isinstance(entry, CompactEntry):
+        return entry.to_dict()
+    return entry
+
+
+def pack_entries(entries):
+    """Pack the entries of a batch to send them to a write task.
+
+    :returns: the import path of the compact entries class and the packed
+        entries or, unless all of them are compact entries of the same class,
+        ``None`` and the entries as dictionaries.
+    """
+    entry_type = type(entries[0]) if entries else None
+    if entry_type is None or not issubclass(entry_type, CompactEntry):
+        return None, [as_dict(entry) for entry in entries]
+    if any(type(entry) is not entry_type for entry in entries):
+        return None, [as_dict(entry) for entry in entries]
+    path = f"{entry_type.__module__}:{entry_type.__qualname__}"
+    return path, [entry.pack() for entry in entries]
+
+
+def unpack_entries(entry_type, entries):
+    """Unpack the entries sent to a write task (see :func:`pack_entries`)."""
+    if entry_type is None:
+        return entries
+    cls = import_string(entry_type)
+    if not (isinstance(cls, type) and issubclass(cls, CompactEntry)):
+        raise TypeError(f"{entry_type} is not a compact entry class.")
+    return [cls.unpack(packed) for packed in entries]
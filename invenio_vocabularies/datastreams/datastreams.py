@@ -3,20 +3,93 @@
 
 """Base data stream."""
 
+import math
+from contextlib import nullcontext
+from copy import deepcopy
+from functools import wraps
+from time import perf_counter
+
+import billiard
 from flask import current_app
 from invenio_access.permissions import system_identity, system_user_id
 from invenio_access.utils import get_identity
 from invenio_accounts.proxies import current_datastore
+from invenio_db import db
 from invenio_jobs.logging.jobs import EMPTY_JOB_CTX, job_context
 from invenio_jobs.proxies import current_runs_service
 
+from .compact import CompactEntry
 from .errors import ReaderError, TransformerError, WriterError
+from .filters import READ_STAGE, TRANSFORM_STAGE
+from .metrics import DataStreamMetrics, item_size, stage_name
+from .pipeline import TICK, Pipeline
+
+# Per-process state of the transform workers, set by the pool initializer.
+_worker_datastream = None
+
+
+def _init_transform_worker(app, datastream):
+    """Initialize a transform worker process.
+
+    The pool uses the ``fork`` start method, so the application and the data
+    stream (with its already instantiated transformers) are inherited by the
+    worker instead of being pickled. The database connections of the parent
+    are inherited too: they are dropped from the worker's pool without being
+    closed, since they are still used by the parent.
+    """
+    global _worker_datastream
+    _worker_datastream = datastream
+    app.app_context().push()
+    db.engine.dispose(close=False)
+
+
+def _transform_chunk(stream_entries):
+    """Apply the data stream transformations to a chunk of entries.
+
+    Returns the transformed entries and, if enabled, the metrics of the chunk
+    so that they can be merged in the parent process.
+    """
+    if _worker_datastream.metrics is not None:
+        _worker_datastream.metrics = DataStreamMetrics()
+    entries = _worker_datastream.apply_transformers(stream_entries)
+    return entries, _worker_datastream.metrics
+
+
+class _RunTotal:
+    """Total of entries of the job run of a data stream.
+
+    The entries are added batch by batch, and the total is raised to the
+    estimated total of the data stream once known, so that the run shows how
+    far it got. ``add_total_entries`` only increments the total of a run.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start the total of a new run."""
+        self.counted = 0
+        self.reported = 0
+
+    def add(self, entries, estimate=None):
+        """Add the entries of a batch, returning the increment of the run."""
+        self.counted += entries
+        total = max(self.counted, estimate or 0)
+        increment = total - self.reported
+        if increment <= 0:
+            return 0
+        self.reported = total
+        return increment
 
 
 class StreamEntry:
     """Object to encapsulate streams processing."""
 
-    def __init__(self, entry, record=None, errors=None, op_type=None, exc=None):
+    __slots__ = ("entry", "record", "filtered", "errors", "op_type", "exc", "cursor")
+
+    def __init__(
+        self, entry, record=None, errors=None, op_type=None, exc=None, cursor=None
+    ):
         """Constructor for the StreamEntry class.
 
         :param entry (object): The entry object, usually a record dict.
@@ -24,6 +97,8 @@ class StreamEntry:
         :param errors (list, optional): List of errors. Defaults to None.
         :param op_type (str, optional): The operation type. Defaults to None.
         :param exc (str, optional): The raised unhandled exception. Defaults to None.
+        :param cursor (tuple, optional): Position of the entry in the reader chain,
+            one index per reader. Defaults to None.
         """
         self.entry = entry
         self.record = record
@@ -31,6 +106,7 @@ class StreamEntry:
         self.errors = errors or []
         self.op_type = op_type
         self.exc = exc
+        self.cursor = cursor
 
     def log_errors(self, logger=None):
         """Log the errors using the provided logger or the default logger.
@@ -62,6 +138,22 @@ class DataStream:
         batch_size=100,
         write_many=False,
         run_subtasks=True,
+        transform_workers=None,
+        pipelined=False,
+        queue_size=2,
+        metrics=None,
+        checkpoint=None,
+        fingerprints=None,
+        adaptive_batch_size=None,
+        max_batch_latency=None,
+        dead_letters=None,
+        filters=None,
+        shard=None,
+        coalescer=None,
+        rate_limit=None,
+        memory_budget=None,
+        progress=None,
+        cache=None,
         *args,
         **kwargs,
     ):
@@ -70,55 +162,432 @@ class DataStream:
         :param readers: an ordered list of readers.
         :param writers: an ordered list of writers.
         :param transformers: an ordered list of transformers to apply.
+        :param transform_workers: number of processes used to transform each
+            batch. When not set (or set to 1), entries are transformed serially
+            in the calling process. The worker processes are forked, so it
+            cannot be combined with the options running threads
+            (``pipelined`` and ``max_batch_latency``).
+        :param pipelined: if True, read, transform and write the entries in
+            concurrent stages (see :class:`Pipeline`).
+        :param queue_size: maximum number of batches waiting between two
+            stages when running pipelined.
+        :param metrics: a :class:`DataStreamMetrics` instance in which to
+            collect per-stage counters and timings. Disabled when not set.
+        :param checkpoint: a :class:`Checkpoint` in which the cursor of the
+            last written entry is committed after each batch. When it holds a
+            cursor, the entries up to that position are skipped.
+        :param fingerprints: a :class:`Fingerprints` instance. When set, the
+            entries which did not change since they were last written are
+            marked as filtered instead of being written. The asynchronous
+            writers store the fingerprints once their tasks wrote the entries.
+        :param adaptive_batch_size: an :class:`AdaptiveBatchSize` instance.
+            When set, the batch size is adapted after each written batch
+            (starting from ``batch_size``) to the measured write latency.
+            Ignored, with a warning, when a writer is asynchronous: only the
+            dispatch of its tasks would be measured.
+        :param max_batch_latency: maximum time, in seconds, an entry waits
+            for its batch to fill up. When set, the readers run in a separate
+            thread and a partial batch is processed once it gets this old, so
+            that slow readers do not delay the writes.
+        :param dead_letters: a :class:`DeadLetters` instance. When set, the
+            entries that fail are stored in it so that they can be replayed.
+        :param filters: list of filters. An entry is kept only if it passes
+            all of them. The ``read`` stage filters run before transforming
+            the entries, the ``transform`` stage ones after.
+        :param shard: dictionary with the ``index`` and ``count`` of shards,
+            and the ``level`` of the reader chain to partition. Only the items
+            of that level whose position belongs to the shard are processed.
+        :param coalescer: a :class:`Coalescer` instance. When set, only the
+            last entry of each id within its window of batches is written,
+            the previous ones are marked as filtered.
+        :param rate_limit: a :class:`TokenBucket` instance. When set, the
+            entries are written at most at its rate (entries per second).
+        :param memory_budget: a :class:`MemoryBudget` instance. When set, the
+            memory used by each stage is tracked, and the partial batches and
+            coalesced entries are written early once the budget is near its
+            limit.
+        :param progress: a :class:`Progress` instance, reporting the progress
+            of the run at regular intervals.
+        :param cache: a :class:`StageCache` instance. When it holds the
+            output of its stage, the run starts from it instead of reading
+            (and transforming) the entries. Otherwise, the output of a
+            complete run is stored in it.
         """
+        if transform_workers and transform_workers > 1:
+            if pipelined or max_batch_latency is not None:
+                raise ValueError(
+                    "The transform workers are forked, they cannot be combined "
+                    "with pipelined or max_batch_latency, which run threads."
+                )
         self._readers = readers
         self._transformers = transformers
         self._writers = writers
         self.batch_size = batch_size
         self.write_many = write_many
         self.run_subtasks = run_subtasks
+        self.transform_workers = transform_workers
+        self._transform_pool = None
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self.checkpoint = checkpoint
+        self.fingerprints = fingerprints
+        if fingerprints is not None:
+            async_writers = [w for w in writers if getattr(w, "is_async", False)]
+            for writer in async_writers:
+                writer.fingerprints = fingerprints.dump_config()
+            fingerprints.deferred = bool(async_writers)
+        if adaptive_batch_size is not None and any(
+            getattr(w, "is_async", False) for w in writers
+        ):
+            current_app.logger.warning(
+                "Ignoring the adaptive batch size, the asynchronous writers "
+                "do not write the batches in the data stream."
+            )
+            adaptive_batch_size = None
+        self.adaptive_batch_size = adaptive_batch_size
+        if adaptive_batch_size is not None:
+            adaptive_batch_size.size = adaptive_batch_size.clamp(batch_size)
+            self.batch_size = adaptive_batch_size.size
+        self.max_batch_latency = max_batch_latency
+        self.dead_letters = dead_letters
+        self.branch_name = None  # set by a branching data stream
+        filters = filters or []
+        self._read_filters = [f for f in filters if f.stage == READ_STAGE]
+        self._transform_filters = [f for f in filters if f.stage != READ_STAGE]
+        self.shard = shard
+        self.coalescer = coalescer
+        self.rate_limit = rate_limit
+        self.memory_budget = memory_budget
+        self.progress = progress
+        self._run_total = _RunTotal()
+        self.entries_processed = 0
+        self.cache = cache
+        self._from_cache = False
+        self._cache_writer = None
+        self.written_cursor = None
 
     def filter(self, stream_entry, *args, **kwargs):
         """Checks if an stream_entry should be filtered out (skipped)."""
-        current_app.logger.debug(f"Filtering entry: {stream_entry.entry}")
+        for filter_ in self._transform_filters:
+            if not filter_.keep(stream_entry.entry):
+                return True
         return False
 
-    def process_batch(self, batch):
-        """Process a batch of entries."""
-        current_app.logger.info(f"Processing batch of size: {len(batch)}")
+    def filter_read(self, stream_entry):
+        """Checks if a read stream_entry should be filtered out (skipped).
+
+        Runs before the transformations, so that the skipped entries are not
+        transformed.
+        """
+        return not all(f.keep(stream_entry.entry) for f in self._read_filters)
+
+    def _mark_filtered(self, stream_entry, stage="filter"):
+        """Mark an entry as filtered out."""
+        stream_entry.filtered = True
+        if self.metrics is not None:
+            self.metrics.stage(stage).filtered += 1
+
+    def _add_total_entries(self, total_entries):
+        """Add the number of entries of a batch to the job run, if any.
+
+        The total of the run is raised to the estimated total of entries, see
+        :meth:`run_total_estimate`.
+        """
         if job_context.get() is not EMPTY_JOB_CTX:
+            increment = self._run_total.add(total_entries, self.run_total_estimate())
+            if not increment:
+                return
             run_id = job_context.get()["run_id"]
             current_runs_service.add_total_entries(
                 system_identity,
                 run_id=run_id,
                 job_id=job_context.get()["job_id"],
-                total_entries=len(batch),
+                total_entries=increment,
             )
-        transformed_entries = []
+
+    def run_total_estimate(self):
+        """Estimated total of entries of the job run, see :meth:`total`."""
+        return self.total()
+
+    def _transform_batch(self, batch, transformed_entries):
+        """Transform and filter a batch of entries.
+
+        Yields the entries that will not be written (i.e. with errors or
+        filtered out) and appends the ones to write to ``transformed_entries``.
+        """
         transformed_entries_with_errors = []
-        for stream_entry in batch:
-            if stream_entry.errors:
+        if self._read_filters:
+            for stream_entry in batch:
+                if not stream_entry.errors and self.filter_read(stream_entry):
+                    self._mark_filtered(stream_entry)
+        # Classify the entries first, transforming them might add errors
+        read_errors = [bool(stream_entry.errors) for stream_entry in batch]
+        to_transform = [
+            stream_entry
+            for stream_entry, read_error in zip(batch, read_errors)
+            if not read_error and not stream_entry.filtered
+        ]
+        # Keep the read entries, transformers might replace them
+        read_entries = iter([stream_entry.entry for stream_entry in to_transform])
+        transformed_iter = self.transform_many(to_transform)
+        for stream_entry, read_error in zip(batch, read_errors):
+            if read_error:
+                if self.metrics is not None:
+                    self.metrics.stage("read").errors += 1
+                if self.dead_letters is not None:
+                    self.dead_letters.add(stream_entry, "read")
                 yield stream_entry  # reading errors
+            elif stream_entry.filtered:
+                yield stream_entry  # filtered out before transforming
             else:
-                transformed_entry = self.transform(stream_entry)
+                read_entry = next(read_entries)
+                transformed_entry = next(transformed_iter)
                 if transformed_entry.errors:
+                    if self.dead_letters is not None:
+                        self.dead_letters.add(
+                            transformed_entry,
+                            "transform",
+                            entry=read_entry,
+                            branch=self.branch_name,
+                        )
                     transformed_entries_with_errors.append(transformed_entry)
                     yield transformed_entry
                 elif self.filter(transformed_entry):
-                    transformed_entry.filtered = True
+                    self._mark_filtered(transformed_entry)
                     yield transformed_entry
                 else:
                     transformed_entries.append(transformed_entry)
+        if self._cache_writer is not None and self.cache.stage == TRANSFORM_STAGE:
+            self._cache_writer.add_many(transformed_entries)
+            self._cache_writer.add_many(transformed_entries_with_errors)
         if transformed_entries_with_errors:
             current_app.logger.warning(
                 "Skipping %s transformed entries with errors.",
                 len(transformed_entries_with_errors),
             )
+
+    def _write_batch(self, transformed_entries):
+        """Write the transformed entries of a batch."""
+        if transformed_entries and self.fingerprints is not None:
+            transformed_entries, unchanged_entries = self.fingerprints.split(
+                transformed_entries
+            )
+            for stream_entry in unchanged_entries:
+                self._mark_filtered(stream_entry, stage="fingerprints")
+                yield stream_entry
+
         if transformed_entries:
+            if self.rate_limit is not None:
+                self.rate_limit.acquire(len(transformed_entries))
             if self.write_many:
-                yield from self.batch_write(transformed_entries)
+                written_entries = self.batch_write(transformed_entries)
             else:
-                yield from (self.write(entry) for entry in transformed_entries)
+                # Logged once per batch, write is called for each entry
+                current_app.logger.debug(
+                    "Writing entries: %s", len(transformed_entries)
+                )
+                written_entries = (self.write(entry) for entry in transformed_entries)
+            if self.dead_letters is not None:
+                written_entries = self._add_dead_letters(written_entries, "write")
+
+            if self.fingerprints is None and self.adaptive_batch_size is None:
+                yield from written_entries
+            else:
+                start = perf_counter()
+                written_entries = list(written_entries)
+                if self.adaptive_batch_size is not None:
+                    self._adapt_batch_size(
+                        written_entries, latency=perf_counter() - start
+                    )
+                yield from written_entries
+                if self.fingerprints is not None:
+                    self.fingerprints.commit(written_entries)
+
+    def _add_dead_letters(self, stream_entries, stage):
+        """Store the entries with errors in the dead letters, yielding all."""
+        for stream_entry in stream_entries:
+            if stream_entry.errors:
+                self.dead_letters.add(stream_entry, stage, branch=self.branch_name)
+            yield stream_entry
+
+    def _adapt_batch_size(self, written_entries, latency):
+        """Adapt the batch size to the latency and errors of a written batch."""
+        errors = sum(1 for stream_entry in written_entries if stream_entry.errors)
+        batch_size = self.adaptive_batch_size.update(
+            len(written_entries), latency, errors=errors
+        )
+        if batch_size != self.batch_size:
+            current_app.logger.info(
+                "Adapting batch size from %s to %s (write latency: %.3fs, errors: %s)",
+                self.batch_size,
+                batch_size,
+                latency,
+                errors,
+            )
+            self.batch_size = batch_size
+
+    def _commit_checkpoint(self, cursor):
+        """Commit the cursor of the last entry of a written batch."""
+        if cursor is None:
+            return
+        self.written_cursor = cursor
+        if self.checkpoint is not None:
+            self.checkpoint.commit(cursor)
+
+    def _write_and_commit(self, transformed_entries, cursor):
+        """Write the transformed entries of a batch and commit its cursor.
+
+        With a coalescer, the entries are buffered until its window is
+        complete (or the memory budget is near its limit), and only the last
+        entry of each id is written.
+        """
+        if self.coalescer is not None:
+            for stream_entry in self.coalescer.add(transformed_entries, cursor):
+                self._mark_filtered(stream_entry, stage="coalesce")
+                yield stream_entry
+            if not self.coalescer.ready and not (
+                self.memory_budget is not None and self.memory_budget.near_limit()
+            ):
+                return
+            transformed_entries, cursor = self.coalescer.flush()
+        yield from self._write_batch(transformed_entries)
+        self._commit_checkpoint(cursor)
+
+    def _flush_coalesced(self):
+        """Write the entries left in the coalescer, if any."""
+        if self.coalescer is not None and self.coalescer.pending:
+            transformed_entries, cursor = self.coalescer.flush()
+            yield from self._write_batch(transformed_entries)
+            self._commit_checkpoint(cursor)
+
+    def _add_processed_entries(self, entries):
+        """Count the entries of a processed batch, and report the progress."""
+        self.entries_processed += entries
+        if self.progress is not None:
+            self.progress.update(self)
+
+    def _track_memory(self, stage):
+        """Track the memory used by a stage, if there is a memory budget."""
+        if self.memory_budget is None:
+            return nullcontext()
+        return self.memory_budget.track(stage)
+
+    def process_batch(self, batch):
+        """Process a batch of entries."""
+        current_app.logger.info("Processing batch of size: %s", len(batch))
+        self._add_total_entries(len(batch))
+        transformed_entries = []
+        with self._track_memory("transform"):
+            yield from self._transform_batch(batch, transformed_entries)
+        with self._track_memory("write"):
+            yield from self._write_and_commit(transformed_entries, batch[-1].cursor)
+
+    def _transform_stage(self, batch):
+        """Pipeline stage transforming a batch of entries."""
+        current_app.logger.info("Processing batch of size: %s", len(batch))
+        transformed_entries = []
+        with self._track_memory("transform"):
+            skipped_entries = list(self._transform_batch(batch, transformed_entries))
+        return len(batch), batch[-1].cursor, skipped_entries, transformed_entries
+
+    def _process_pipelined(self):
+        """Process the entries with concurrent read, transform and write stages.
+
+        Batches are read and transformed in background threads while the
+        previous batches are being written in the calling thread.
+        """
+        pipeline = Pipeline(
+            source=self.batches,
+            stages=[self._transform_stage],
+            queue_size=self.queue_size,
+        )
+        for batch_size, cursor, skipped_entries, transformed_entries in pipeline:
+            self._add_total_entries(batch_size)
+            yield from skipped_entries
+            with self._track_memory("write"):
+                yield from self._write_and_commit(transformed_entries, cursor)
+            self._add_processed_entries(batch_size)
+
+    def _process_cached(self):
+        """Write the transformed entries of the cache."""
+        for batch in self.batches():
+            current_app.logger.info("Processing cached batch of size: %s", len(batch))
+            self._add_total_entries(len(batch))
+            with self._track_memory("write"):
+                yield from self._write_and_commit(batch, batch[-1].cursor)
+            self._add_processed_entries(len(batch))
+
+    def _timed_read(self):
+        """Read the entries in a separate thread, yielding ``TICK`` when idle.
+
+        The ticks let :meth:`batches` flush a partial batch while the readers
+        are waiting for data.
+        """
+        return Pipeline(
+            source=self.read,
+            stages=[],
+            queue_size=self.batch_size,
+            tick=self.max_batch_latency / 10,
+        )
+
+    def batches(self):
+        """Group the read entries in batches.
+
+        A batch is complete when it has ``batch_size`` entries or, if
+        ``max_batch_latency`` is set, when its first entry was read that many
+        seconds ago. With a memory budget, a partial batch is also complete
+        once the budget is near its limit.
+        """
+        budget = self.memory_budget
+        if self.max_batch_latency is None:
+            entries = self.read()
+        else:
+            entries = self._timed_read()
+
+        batch = []
+        batch_start = None
+        for stream_entry in entries:
+            if stream_entry is not TICK:
+                if not batch:
+                    batch_start = perf_counter()
+                    if budget is not None:
+                        memory_mark = budget.begin()
+                batch.append(stream_entry)
+            if not batch:
+                continue
+
+            if len(batch) >= self.batch_size:
+                current_app.logger.debug("Processing batch of size: %s", len(batch))
+                if budget is not None:
+                    budget.end("read", memory_mark)
+                yield batch
+                batch = []
+            elif (
+                budget is not None
+                and len(batch) % budget.check_interval == 0
+                and budget.end("read", memory_mark)
+            ):
+                current_app.logger.warning(
+                    "Processing partial batch of size: %s, near the memory budget",
+                    len(batch),
+                )
+                yield batch
+                batch = []
+            elif (
+                self.max_batch_latency is not None
+                and perf_counter() - batch_start >= self.max_batch_latency
+            ):
+                current_app.logger.debug(
+                    "Processing partial batch of size: %s", len(batch)
+                )
+                yield batch
+                batch = []
+
+        # Process any remaining entries in the last batch
+        if batch:
+            current_app.logger.debug("Processing final batch of size: %s", len(batch))
+            yield batch
 
     def process(self, *args, **kwargs):
         """Iterates over the entries.
@@ -129,48 +598,234 @@ class DataStream:
         writing it.
         """
         current_app.logger.info("Starting data stream processing")
-        batch = []
-        for stream_entry in self.read():
-            batch.append(stream_entry)
-            if len(batch) >= self.batch_size:
-                current_app.logger.debug(f"Processing batch of size: {len(batch)}")
-                yield from self.process_batch(batch)
-                batch = []
+        if self.memory_budget is not None:
+            self.memory_budget.start()
+        self.entries_processed = 0
+        self._run_total.reset()
+        if self.progress is not None:
+            self.progress.start()
+        self._open_cache()
+        try:
+            if self._from_cache and self.cache.stage == TRANSFORM_STAGE:
+                yield from self._process_cached()
+            elif self.pipelined:
+                yield from self._process_pipelined()
+            else:
+                for batch in self.batches():
+                    yield from self.process_batch(batch)
+                    self._add_processed_entries(len(batch))
+            yield from self._flush_coalesced()
+            if self._cache_writer is not None:
+                self._cache_writer.commit()
+                self._cache_writer = None
+            if self.checkpoint is not None:
+                # The run is complete, the next one should start from scratch
+                self.checkpoint.clear()
+            if self.progress is not None:
+                self.progress.report(self, finished=True)
+        finally:
+            if self.memory_budget is not None:
+                self.memory_budget.stop()
+                self.memory_budget.emit()
+            if self._cache_writer is not None:
+                self._cache_writer.discard()
+                self._cache_writer = None
+            self._close()
 
-        # Process any remaining entries in the last batch
-        if batch:
-            current_app.logger.debug(f"Processing final batch of size: {len(batch)}")
-            yield from self.process_batch(batch)
+    def _open_cache(self):
+        """Start from the cache, or store the output of the run in it.
+
+        The output of a run resumed from a checkpoint is not stored, since the
+        entries before the checkpoint are missing.
+        """
+        self._from_cache = False
+        self._cache_writer = None
+        if self.cache is None:
+            return
+        if self.cache.exists():
+            current_app.logger.info(
+                "Starting data stream from the cached %s stage: %s",
+                self.cache.stage,
+                self.cache.path,
+            )
+            self._from_cache = True
+        elif self.checkpoint is None or not self.checkpoint.cursor:
+            self._cache_writer = self.cache.writer()
+
+    def _close(self):
+        """Release the resources used while processing the stream."""
+        self._shutdown_transform_pool()
+        for filter_ in self._read_filters + self._transform_filters:
+            filter_.close()
+        if self.dead_letters is not None:
+            self.dead_letters.close()
 
     def read(self):
-        """Recursively read the entries."""
+        """Read the entries through the chain of readers, or from the cache.
+
+        When the output of the ``read`` stage is being cached, the entries
+        are stored as they are read.
+        """
+        if self._from_cache:
+            return self._read_cache()
+        entries = self._read_readers()
+        if self._cache_writer is not None and self.cache.stage != TRANSFORM_STAGE:
+            return self._cache_entries(entries)
+        return entries
+
+    def _read_cache(self):
+        """Read the cached entries, skipping the ones before the checkpoint."""
+        resume_cursor = self.checkpoint.cursor if self.checkpoint else None
+        if resume_cursor:
+            current_app.logger.info("Resuming data stream from %s", resume_cursor)
+            resume_cursor = tuple(resume_cursor)
+        for cursor, entry in self.cache.load():
+            if resume_cursor and cursor <= resume_cursor:
+                continue
+            yield StreamEntry(entry, cursor=cursor)
+
+    def _cache_entries(self, entries):
+        """Store the read entries in the cache."""
+        for stream_entry in entries:
+            self._cache_writer.add(stream_entry)
+            yield stream_entry
+
+    def _read_readers(self):
+        """Read the entries through the chain of readers.
+
+        Each entry gets a cursor with its position in the reader chain. When
+        resuming from a checkpoint, the items up to the checkpoint cursor are
+        skipped, without reading the nested items of the skipped ones (e.g. the
+        entries of an already processed archive member).
+        """
         current_app.logger.debug("Reading entries from readers")
+        resume_cursor = self.checkpoint.cursor if self.checkpoint else None
+        if resume_cursor:
+            current_app.logger.info("Resuming data stream from %s", resume_cursor)
+        shard_level, shard_index, shard_count = None, 0, 1
+        if self.shard:
+            shard_level = self.shard.get("level", 0)
+            shard_index, shard_count = self.shard["index"], self.shard["count"]
+
+        if self.metrics is not None:
+            read_gens = [self._instrumented_read(r) for r in self._readers]
+        else:
+            read_gens = [r.read for r in self._readers]
+        last_level = len(read_gens) - 1
+
+        # The reader chain is walked with a stack instead of nested generators,
+        # so that each entry goes through a single generator. Each frame holds
+        # the items of a reader, the cursor and item they were read from, and
+        # whether the checkpoint position is within these items.
+        stack = [(enumerate(read_gens[0](None)), (), None, bool(resume_cursor))]
+        while stack:
+            items, cursor, piped_item, resuming = stack[-1]
+            level = len(stack) - 1
+            try:
+                if level == last_level and not resuming and level != shard_level:
+                    # Fast path for the entries of the last reader
+                    for idx, item in items:
+                        yield StreamEntry(item, cursor=cursor + (idx,))
+                    stack.pop()
+                    continue
+                idx, item = next(items)
+            except StopIteration:
+                stack.pop()
+                continue
+            except ReaderError as err:
+                if not level:
+                    raise
+                # the error is reported on the item the reader was reading
+                stack.pop()
+                yield StreamEntry(
+                    entry=piped_item,
+                    errors=[f"{read_gens[level - 1].__qualname__}: {str(err)}"],
+                    cursor=cursor,
+                )
+                continue
+
+            if level == shard_level and idx % shard_count != shard_index:
+                continue  # belongs to another shard
+            resuming_item = False
+            if resuming:
+                if idx < resume_cursor[level]:
+                    continue  # already processed
+                if idx == resume_cursor[level]:
+                    if level == len(resume_cursor) - 1:
+                        continue  # last processed position
+                    resuming_item = True
+            position = cursor + (idx,)
+            if level == last_level:
+                yield StreamEntry(item, cursor=position)
+                continue
+            try:
+                next_items = enumerate(read_gens[level + 1](item))
+            except ReaderError as err:
+                yield StreamEntry(
+                    entry=item,
+                    errors=[f"{read_gens[level].__qualname__}: {str(err)}"],
+                    cursor=position,
+                )
+                continue
+            stack.append((next_items, position, item, resuming_item))
+
+    def _instrumented_read(self, reader):
+        """Wrap the read method of a reader to collect its metrics."""
+        stage = self.metrics.stage(stage_name("reader", reader))
 
-        def pipe_gen(gen_funcs, piped_item=None):
-            _gen_funcs = list(gen_funcs)  # copy to avoid modifying ref list
-            # use and remove the current generator
-            current_gen_func = _gen_funcs.pop(0)
-            for item in current_gen_func(piped_item):
+        # Keep the reader's qualified name, it is used in the error messages.
+        @wraps(reader.read)
+        def read(item=None, *args, **kwargs):
+            if item is not None:
+                stage.entries_in += 1
+            items = reader.read(item, *args, **kwargs)
+            while True:
+                start = perf_counter()
                 try:
-                    # exhaust iterations of subsequent generators
-                    if _gen_funcs:
-                        yield from pipe_gen(_gen_funcs, piped_item=item)
-                    # there is no subsequent generator, return the current item
-                    else:
-                        yield StreamEntry(item)
-                except ReaderError as err:
-                    yield StreamEntry(
-                        entry=item,
-                        errors=[f"{current_gen_func.__qualname__}: {str(err)}"],
-                    )
+                    read_item = next(items)
+                except StopIteration:
+                    return
+                except ReaderError:
+                    stage.errors += 1
+                    raise
+                stage.latency.observe(perf_counter() - start)
+                stage.entries_out += 1
+                stage.bytes_read += item_size(read_item)
+                yield read_item
+
+        return read
+
+    def _observe(self, stage, start, stream_entry):
+        """Record the processing of an entry by a stage."""
+        stage.latency.observe(perf_counter() - start)
+        stage.entries_in += 1
+        if stream_entry.errors:
+            stage.errors += 1
+        else:
+            stage.entries_out += 1
 
-        read_gens = [r.read for r in self._readers]
-        yield from pipe_gen(read_gens)
+    @staticmethod
+    def _expand_compact(transformer, stream_entries):
+        """Convert the compact entries to dictionaries for a transformer.
+
+        Compact entries are read-only, they are only given as they are to the
+        transformers accepting them.
+        """
+        if transformer.accepts_compact:
+            return
+        for stream_entry in stream_entries:
+            if isinstance(stream_entry.entry, CompactEntry):
+                stream_entry.entry = stream_entry.entry.to_dict()
 
     def transform(self, stream_entry, *args, **kwargs):
         """Apply the transformations to an stream_entry."""
-        current_app.logger.debug(f"Transforming entry: {stream_entry.entry}")
+        current_app.logger.debug("Transforming entry: %s", stream_entry.entry)
         for transformer in self._transformers:
+            stage = self.metrics and self.metrics.stage(
+                stage_name("transformer", transformer)
+            )
+            self._expand_compact(transformer, [stream_entry])
+            start = perf_counter()
             try:
                 stream_entry = transformer.apply(stream_entry)
             except TransformerError as err:
@@ -178,9 +833,96 @@ class DataStream:
                     f"{transformer.__class__.__name__}: {str(err)}"
                 )
                 return stream_entry  # break loop
+            finally:
+                if stage:
+                    self._observe(stage, start, stream_entry)
 
         return stream_entry
 
+    def apply_transformers(self, stream_entries):
+        """Apply the transformations to a list of stream entries.
+
+        Each transformer is applied to the whole list at once (see
+        ``BaseTransformer.apply_many``), skipping the entries that failed on a
+        previous transformer.
+        """
+        stream_entries = list(stream_entries)
+        pending = list(range(len(stream_entries)))
+        for transformer in self._transformers:
+            if not pending:
+                break
+            stage = self.metrics and self.metrics.stage(
+                stage_name("transformer", transformer)
+            )
+            batch = [stream_entries[idx] for idx in pending]
+            self._expand_compact(transformer, batch)
+            start = perf_counter()
+            transformed_entries = transformer.apply_many(batch)
+            if stage:
+                self._observe_many(stage, start, transformed_entries)
+            for idx, transformed_entry in zip(pending, transformed_entries):
+                stream_entries[idx] = transformed_entry
+            pending = [idx for idx in pending if not stream_entries[idx].errors]
+        return stream_entries
+
+    def transform_many(self, stream_entries):
+        """Apply the transformations to a list of stream entries.
+
+        Returns an iterator over the transformed entries, in the same order as
+        the given ones. When ``transform_workers`` is set, the entries are
+        split in one chunk per worker and transformed in a process pool.
+        """
+        if not stream_entries:
+            return iter([])
+        if not self.transform_workers or self.transform_workers <= 1:
+            return iter(self.apply_transformers(stream_entries))
+
+        pool = self._get_transform_pool()
+        chunk_size = math.ceil(len(stream_entries) / self.transform_workers)
+        chunks = [
+            stream_entries[idx : idx + chunk_size]
+            for idx in range(0, len(stream_entries), chunk_size)
+        ]
+        return (
+            transformed_entry
+            for transformed_chunk in self._merge_chunk_metrics(
+                pool.imap(_transform_chunk, chunks)
+            )
+            for transformed_entry in transformed_chunk
+        )
+
+    def _merge_chunk_metrics(self, results):
+        """Merge the metrics of the transformed chunks, yielding the entries."""
+        for transformed_chunk, chunk_metrics in results:
+            if chunk_metrics is not None:
+                self.metrics.merge(chunk_metrics)
+            yield transformed_chunk
+
+    def _get_transform_pool(self):
+        """Get (or lazily create) the transform process pool.
+
+        The pool is a billiard pool, since the data streams run in Celery
+        workers, which are daemonic processes that the ``multiprocessing``
+        pools cannot start children from.
+        """
+        if self._transform_pool is None:
+            current_app.logger.info(
+                "Starting transform pool with %s workers", self.transform_workers
+            )
+            self._transform_pool = billiard.get_context("fork").Pool(
+                processes=self.transform_workers,
+                initializer=_init_transform_worker,
+                initargs=(current_app._get_current_object(), self),
+            )
+        return self._transform_pool
+
+    def _shutdown_transform_pool(self):
+        """Shutdown the transform process pool, if any."""
+        if self._transform_pool is not None:
+            self._transform_pool.close()
+            self._transform_pool.join()
+            self._transform_pool = None
+
     def _prepare_async_context(self):
         """Prepare the async context for writers."""
         job_ctx = job_context.get()
@@ -203,8 +945,9 @@ class DataStream:
 
     def write(self, stream_entry, *args, **kwargs):
         """Write a single stream entry."""
-        current_app.logger.debug(f"Writing entry: {stream_entry.entry}")
         for writer in self._writers:
+            stage = self.metrics and self.metrics.stage(stage_name("writer", writer))
+            start = perf_counter()
             try:
                 if (
                     self.run_subtasks
@@ -221,13 +964,18 @@ class DataStream:
                     "Writer error: %s", str(err), extra={"entry": stream_entry.entry}
                 )
                 stream_entry.errors.append(f"{writer.__class__.__name__}: {str(err)}")
+            finally:
+                if stage:
+                    self._observe(stage, start, stream_entry)
 
         return stream_entry
 
     def batch_write(self, stream_entries, *args, **kwargs):
         """Write a batch of stream entries."""
-        current_app.logger.debug(f"Batch writing entries: {len(stream_entries)}")
+        current_app.logger.debug("Batch writing entries: %s", len(stream_entries))
         for writer in self._writers:
+            stage = self.metrics and self.metrics.stage(stage_name("writer", writer))
+            start = perf_counter()
             try:
                 if (
                     self.run_subtasks
@@ -235,17 +983,177 @@ class DataStream:
                     and job_context.get() is not EMPTY_JOB_CTX
                 ):
                     subtask_run_id = self._prepare_async_context()
-                    yield from writer.write_many(
+                    written_entries = writer.write_many(
                         stream_entries, subtask_run_id=subtask_run_id
                     )
                 else:
-                    yield from writer.write_many(stream_entries)
+                    written_entries = writer.write_many(stream_entries)
+                if stage:
+                    self._observe_many(stage, start, written_entries)
+                yield from written_entries
             except WriterError as err:
                 # The actionable bugs are logged as errors to send to Sentry
                 current_app.logger.error("Writer error: %s", str(err))
                 for entry in stream_entries:
                     entry.errors.append(f"{writer.__class__.__name__}: {str(err)}")
+                if stage:
+                    self._observe_many(stage, start, stream_entries)
+
+    def _observe_many(self, stage, start, stream_entries):
+        """Record the processing of a batch of entries by a stage.
+
+        The latency is recorded per entry, like for the stages processing the
+        entries one by one, i.e. the batch latency divided by its size.
+        """
+        stream_entries = stream_entries or []
+        if stream_entries:
+            latency = perf_counter() - start
+            stage.latency.observe(latency / len(stream_entries), len(stream_entries))
+        for stream_entry in stream_entries:
+            stage.entries_in += 1
+            if stream_entry.errors:
+                stage.errors += 1
+            else:
+                stage.entries_out += 1
+
+    def estimate(self):
+        """Estimate of the size of the data read, by the readers.
+
+        The first reader able to estimate the data it reads is used (e.g. the
+        archive reader of a chain where the first reader downloads it). See
+        ``BaseReader.estimate``.
+        """
+        for reader in self._readers:
+            estimate = reader.estimate()
+            if estimate:
+                return estimate
+        return None
 
     def total(self, *args, **kwargs):
-        """The total of entries obtained from the origin."""
-        raise NotImplementedError()
+        """The estimated total of entries obtained from the origin.
+
+        When the readers estimate the size of the data in bytes, the total is
+        extrapolated from the entries processed for the bytes read so far.
+
+        :returns: the estimated total, or ``None`` if it is not known (yet).
+        """
+        estimate = self.estimate()
+        if not estimate:
+            return None
+        if estimate.get("entries") is not None:
+            return estimate["entries"]
+        if estimate.get("bytes_read") and self.entries_processed:
+            return round(
+                self.entries_processed * estimate["bytes"] / estimate["bytes_read"]
+            )
+        return None
+
+
+class BranchingDataStream(DataStream):
+    """Data stream feeding the read entries to several branches.
+
+    The entries are read once, and each batch is processed by every branch
+    (i.e. a data stream with its own transformers, filters and writers) on a
+    copy of the entries. The filters of the branching data stream itself run
+    before the entries are copied. Batches are processed serially.
+    """
+
+    def __init__(self, readers, branches, *args, **kwargs):
+        """Constructor.
+
+        :param branches: dictionary of branch name and data stream, without
+            readers.
+        """
+        kwargs["pipelined"] = False
+        cache = kwargs.get("cache")
+        if cache is not None and cache.stage == TRANSFORM_STAGE:
+            raise ValueError(
+                "Branches are transformed separately, cache the read stage."
+            )
+        super().__init__(readers, [], *args, **kwargs)
+        if self.max_batch_latency is not None and any(
+            branch.transform_workers and branch.transform_workers > 1
+            for branch in branches.values()
+        ):
+            raise ValueError(
+                "The transform workers are forked, they cannot be combined "
+                "with max_batch_latency, which runs the readers in a thread."
+            )
+        self.branches = branches
+        for name, branch in branches.items():
+            branch.branch_name = name
+            branch._run_total = self._run_total  # the entries of every branch
+
+    def process_batch(self, batch):
+        """Process a batch of entries in every branch."""
+        current_app.logger.info("Processing batch of size: %s", len(batch))
+        branch_batch = []
+        for stream_entry in batch:
+            if stream_entry.errors:
+                if self.metrics is not None:
+                    self.metrics.stage("read").errors += 1
+                if self.dead_letters is not None:
+                    self.dead_letters.add(stream_entry, "read")
+                yield stream_entry  # reading errors
+            elif self._read_filters and self.filter_read(stream_entry):
+                self._mark_filtered(stream_entry)
+                yield stream_entry
+            else:
+                branch_batch.append(stream_entry)
+        # The other entries are counted by the branches
+        self._add_total_entries(len(batch) - len(branch_batch))
+
+        if branch_batch:
+            if self.rate_limit is not None:
+                self.rate_limit.acquire(len(branch_batch))
+            branches = list(self.branches.items())
+            for idx, (name, branch) in enumerate(branches):
+                current_app.logger.debug("Processing batch in branch: %s", name)
+                if idx < len(branches) - 1:
+                    entries = [
+                        StreamEntry(deepcopy(e.entry), cursor=e.cursor)
+                        for e in branch_batch
+                    ]
+                else:
+                    entries = branch_batch  # the last branch can take them
+                yield from branch.process_batch(entries)
+        self._commit_checkpoint(self._branches_cursor(batch[-1].cursor))
+
+    def run_total_estimate(self):
+        """Estimated total of entries of the job run, written by every branch."""
+        total = self.total()
+        return total * len(self.branches) if total else None
+
+    def _branches_cursor(self, cursor):
+        """Cursor up to which every branch has written its entries.
+
+        A branch with a coalescer may buffer the entries of a batch without
+        writing them, its entries are written up to its last flush only.
+
+        :param cursor: cursor of the last entry of the processed batch.
+        :returns: the smallest written cursor, ``None`` if a branch has not
+            written any entry yet.
+        """
+        for branch in self.branches.values():
+            if branch.coalescer is not None and branch.coalescer.pending:
+                if branch.written_cursor is None:
+                    return None
+                cursor = min(cursor, branch.written_cursor)
+        return cursor
+
+    def process(self, *args, **kwargs):
+        """Iterates over the entries, processing them in every branch."""
+        for branch in self.branches.values():
+            branch.written_cursor = None
+        yield from super().process(*args, **kwargs)
+
+    def _flush_coalesced(self):
+        """Write the entries left in the coalescers of the branches."""
+        for branch in self.branches.values():
+            yield from branch._flush_coalesced()
+
+    def _close(self):
+        """Release the resources of the stream and its branches."""
+        super()._close()
+        for branch in self.branches.values():
+            branch._close()
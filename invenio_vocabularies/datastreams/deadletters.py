@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data stream dead letters.
+
+The dead letters of a data stream run are the entries that failed, stored as
+JSON lines with the stage they failed at (``read``, ``transform`` or
+``write``), their errors, their cursor and, in a branching data stream, the
+branch they failed in. The input of the failed stage is stored, i.e. the read
+entry for transform errors and the transformed entry for write errors, so that
+they can be replayed through the remaining stages without reading the whole
+origin again.
+"""
+
+import json
+import os
+import threading
+from copy import deepcopy
+from pathlib import Path
+
+from flask import current_app
+
+from .checkpoints import config_key
+from .compact import as_dict
+from .filters import READ_STAGE
+
+REPLAYED_STAGES = ("transform", "write")
+"""Stages whose dead letters can be replayed."""
+
+
+class DeadLetters:
+    """Dead letters of a data stream run, stored in a JSON lines file."""
+
+    def __init__(self, path, branch=None):
+        """Constructor.
+
+        :param path: path of the JSON lines file.
+        :param branch: branch of the failed entries, e.g. when replaying the
+            dead letters of a branch.
+        """
+        self.path = Path(path)
+        self.branch = branch
+        self._file = None
+        self._lock = threading.Lock()
+
+    def add(self, stream_entry, stage, entry=None, branch=None):
+        """Store a failed entry.
+
+        :param stream_entry: the failed stream entry.
+        :param stage: stage at which the entry failed.
+        :param entry: input of the failed stage, defaults to the entry of the
+            stream entry.
+        :param branch: name of the branch the entry failed in, if any.
+        """
+        letter = {
+            "stage": stage,
+            "entry": as_dict(stream_entry.entry if entry is None else entry),
+            "errors": stream_entry.errors,
+            "cursor": stream_entry.cursor,
+        }
+        branch = branch or self.branch
+        if branch is not None:
+            letter["branch"] = branch
+        # Entries that are not JSON serializable (e.g. files) are stored as
+        # strings, they are kept for inspection only.
+        line = json.dumps(letter, default=str)
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        """Close the dead letters file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @property
+    def replay_path(self):
+        """Path of the dead letters being replayed."""
+        return self.path.with_name(f"{self.path.name}.replay")
+
+    def replay_configs(self, config):
+        """Configurations of the data streams replaying the dead letters.
+
+        The dead letters are moved aside first, so that the entries failing
+        again are stored anew. Transform failures go through the transformers
+        and writers, write failures only through the writers, without the
+        filters of the read entries. Read failures cannot be replayed. The
+        dead letters of a branch are replayed in that branch only.
+        """
+        if not self.replay_path.exists():
+            if not self.path.exists():
+                return []
+            os.replace(self.path, self.replay_path)
+
+        replay_config = {
+            k: v
+            for k, v in deepcopy(config).items()
+            if k not in ("checkpoint", "branches")
+        }
+        replay_config["dead_letters"] = {"path": str(self.path)}
+        branches_config = config.get("branches")
+        if not branches_config:
+            return [
+                self._replay_config(replay_config, stage) for stage in REPLAYED_STAGES
+            ]
+
+        configs = []
+        for name, branch_config in branches_config.items():
+            branch_replay_config = deepcopy(replay_config)
+            branch_replay_config["dead_letters"]["branch"] = name
+            # the filters of the branching data stream ran before branching
+            branch_replay_config.update(
+                transformers=branch_config.get("transformers"),
+                filters=branch_config.get("filters"),
+                writers=branch_config["writers"],
+                coalesce=branch_config.get("coalesce"),
+            )
+            if "write_many" in branch_config:
+                branch_replay_config["write_many"] = branch_config["write_many"]
+            for stage in REPLAYED_STAGES:
+                configs.append(
+                    self._replay_config(branch_replay_config, stage, branch=name)
+                )
+        return configs
+
+    def _replay_config(self, replay_config, stage, branch=None):
+        """Configuration replaying the dead letters of a stage."""
+        stage_config = deepcopy(replay_config)
+        reader_args = {"origin": str(self.replay_path), "stage": stage}
+        if branch is not None:
+            reader_args["branch"] = branch
+        stage_config["readers"] = [{"type": "dead-letters", "args": reader_args}]
+        if stage == "write":
+            stage_config["transformers"] = None
+            stage_config["filters"] = [
+                filter_config
+                for filter_config in stage_config.get("filters") or []
+                if (filter_config.get("args") or {}).get("stage", READ_STAGE)
+                != READ_STAGE
+            ]
+        return stage_config
+
+    def clear_replayed(self):
+        """Remove the replayed dead letters."""
+        self.replay_path.unlink(missing_ok=True)
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the dead letters of a data stream configuration.
+
+        The path is read from ``config["dead_letters"]["path"]`` or, by
+        default, is a file named after the configuration in the
+        ``VOCABULARIES_DATASTREAM_DEAD_LETTERS_DIR`` directory.
+        """
+        dead_letters_config = config.get("dead_letters")
+        if isinstance(dead_letters_config, dict) and dead_letters_config.get("path"):
+            return cls(
+                dead_letters_config["path"], branch=dead_letters_config.get("branch")
+            )
+
+        directory = current_app.config.get("VOCABULARIES_DATASTREAM_DEAD_LETTERS_DIR")
+        if not directory:
+            directory = Path(current_app.instance_path) / "datastream-dead-letters"
+        return cls(Path(directory) / f"{config_key(config)}.jsonl")
@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Bounded-memory deduplication of data stream entries."""
+
+import hashlib
+import math
+import sqlite3
+import tempfile
+from pathlib import Path
+
+MAX_MEMORY_KEYS = 1_000_000
+"""Number of keys kept in memory before switching to disk."""
+
+
+class BloomFilter:
+    """Bloom filter of strings.
+
+    Answers whether a key was (probably) added: there are no false negatives
+    and false positives happen at most at the given rate, as long as the number
+    of keys stays below the capacity.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        """Constructor.
+
+        :param capacity: expected number of keys.
+        :param error_rate: false positive rate at full capacity.
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        """Add a key."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        """Checks if the key was probably added."""
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class SeenKeys:
+    """Set of seen keys with a bounded memory usage.
+
+    Keys are kept in an in-memory set until ``max_memory_keys`` is reached.
+    Then they are moved to a temporary SQLite database, used for exact checks,
+    in front of which a Bloom filter avoids a disk lookup for most new keys.
+    """
+
+    def __init__(self, max_memory_keys=MAX_MEMORY_KEYS, capacity=None, directory=None):
+        """Constructor.
+
+        :param max_memory_keys: number of keys kept in memory.
+        :param capacity: expected number of keys, to size the Bloom filter.
+            Defaults to ten times ``max_memory_keys``. More keys only make
+            disk lookups more frequent.
+        :param directory: directory of the temporary database.
+        """
+        self.max_memory_keys = max_memory_keys
+        self.capacity = capacity or 10 * max_memory_keys
+        self.directory = directory
+        self._keys = set()
+        self._bloom = None
+        self._db = None
+        self._tmpdir = None
+        self._count = 0
+
+    @property
+    def spilled(self):
+        """Whether the keys were moved to disk."""
+        return self._db is not None
+
+    def _spill(self):
+        """Move the in-memory keys to disk."""
+        self._tmpdir = tempfile.TemporaryDirectory(dir=self.directory)
+        self._db = sqlite3.connect(
+            Path(self._tmpdir.name) / "keys.db", check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("CREATE TABLE keys (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._bloom = BloomFilter(max(self.capacity, len(self._keys)))
+        for key in self._keys:
+            self._bloom.add(key)
+        self._db.executemany("INSERT INTO keys VALUES (?)", ((k,) for k in self._keys))
+        self._keys = set()
+
+    def __contains__(self, key):
+        """Checks if the key was seen."""
+        key = str(key)
+        if not self.spilled:
+            return key in self._keys
+        if key not in self._bloom:
+            return False
+        cursor = self._db.execute("SELECT 1 FROM keys WHERE key = ?", (key,))
+        return cursor.fetchone() is not None
+
+    def add(self, key):
+        """Add a key, returning whether it was not seen before."""
+        key = str(key)
+        if key in self:
+            return False
+        self._count += 1
+        if not self.spilled:
+            self._keys.add(key)
+            if len(self._keys) > self.max_memory_keys:
+                self._spill()
+        else:
+            self._bloom.add(key)
+            self._db.execute("INSERT INTO keys VALUES (?)", (key,))
+        return True
+
+    def __len__(self):
+        """Number of seen keys."""
+        return self._count
+
+    def close(self):
+        """Release the memory and temporary files."""
+        self._keys = set()
+        self._bloom = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            self._tmpdir.cleanup()
+            self._tmpdir = None
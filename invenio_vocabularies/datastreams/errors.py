@@ -22,3 +22,7 @@ class FactoryError(Exception):
     def __init__(self, name, key):
         """Initialise error."""
         super().__init__(f"{name} {key} not configured.")
+
+
+class RangeNotSupportedError(ReaderError):
+    """The server of a remote file does not support HTTP range requests."""
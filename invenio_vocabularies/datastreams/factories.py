@@ -5,8 +5,18 @@
 
 from flask import current_app
 
-from .datastreams import DataStream
+from .batching import AdaptiveBatchSize
+from .caching import StageCache
+from .checkpoints import Checkpoint
+from .coalescing import Coalescer
+from .datastreams import BranchingDataStream, DataStream
+from .deadletters import DeadLetters
 from .errors import FactoryError
+from .fingerprints import Fingerprints
+from .memory import MemoryBudget
+from .metrics import DataStreamMetrics
+from .progress import Progress
+from .throttling import TokenBucket
 
 
 class OptionsConfigMixin:
@@ -57,18 +67,130 @@ class TransformerFactory(Factory, OptionsConfigMixin):
     CONFIG_VAR = "VOCABULARIES_DATASTREAM_TRANSFORMERS"
 
 
+class FilterFactory(Factory, OptionsConfigMixin):
+    """Filter factory."""
+
+    FACTORY_NAME = "Filter"
+    CONFIG_VAR = "VOCABULARIES_DATASTREAM_FILTERS"
+
+
 class DataStreamFactory:
     """Data streams factory."""
 
+    BRANCH_OPTIONS = ("batch_size", "write_many", "run_subtasks", "transform_workers")
+    """Options of a branching data stream also used by its branches."""
+
+    BRANCH_SHARED = ("metrics", "dead_letters", "memory_budget")
+    """Objects of a branching data stream shared with its branches."""
+
+    @staticmethod
+    def config_options(config):
+        """Options of a data stream, from its configuration.
+
+        :returns: a dictionary of option names and functions creating their
+            value, so that only the options which are not given are created.
+        """
+
+        def optional(option_cls, key, default=False):
+            return lambda: (
+                option_cls.from_config(config) if config.get(key, default) else None
+            )
+
+        return {
+            "batch_size": lambda: config.get("batch_size", 1000),
+            "run_subtasks": lambda: config.get("run_subtasks", True),
+            "write_many": lambda: config.get("write_many", False),
+            "transform_workers": lambda: config.get("transform_workers"),
+            "pipelined": lambda: config.get("pipelined", False),
+            "queue_size": lambda: config.get("queue_size", 2),
+            "max_batch_latency": lambda: config.get("max_batch_latency"),
+            "shard": lambda: config.get("shard"),
+            "metrics": lambda: DataStreamMetrics() if config.get("metrics") else None,
+            "checkpoint": optional(Checkpoint, "checkpoint"),
+            "fingerprints": optional(Fingerprints, "fingerprints"),
+            "adaptive_batch_size": optional(AdaptiveBatchSize, "adaptive_batch_size"),
+            "dead_letters": optional(DeadLetters, "dead_letters"),
+            "coalescer": optional(Coalescer, "coalesce"),
+            "rate_limit": optional(TokenBucket, "rate_limit"),
+            "memory_budget": optional(MemoryBudget, "memory_budget"),
+            "cache": optional(StageCache, "cache"),
+            "progress": optional(Progress, "progress", default=True),
+        }
+
     @classmethod
-    def create(cls, readers_config, writers_config, transformers_config=None, **kwargs):
-        """Creates a data stream based on the config."""
+    def from_config(cls, config, **overrides):
+        """Creates a data stream from its configuration, e.g. of a job.
+
+        :param config: the data stream configuration, with its ``readers``,
+            ``writers``, ``transformers``, ``filters`` and ``branches``, and
+            its options (see :meth:`config_options`).
+        :param overrides: options taking precedence over the configured ones,
+            e.g. the progress of a run with a callback.
+        """
+        options = {
+            name: create()
+            for name, create in cls.config_options(config).items()
+            if name not in overrides
+        }
+        options.update(overrides)
+        return cls.create(
+            readers_config=config["readers"],
+            writers_config=config.get("writers"),
+            transformers_config=config.get("transformers"),
+            filters_config=config.get("filters"),
+            branches_config=config.get("branches"),
+            **options,
+        )
+
+    @classmethod
+    def create_branches(cls, branches_config, **kwargs):
+        """Creates the branches of a data stream based on the config.
+
+        Each branch config has its ``transformers``, ``filters`` and
+        ``writers`` and, optionally, its ``write_many`` and ``coalesce``
+        options.
+        """
+        branches = {}
+        for name, b_conf in branches_config.items():
+            options = {
+                k: kwargs[k]
+                for k in cls.BRANCH_OPTIONS + cls.BRANCH_SHARED
+                if k in kwargs
+            }
+            if "write_many" in b_conf:
+                options["write_many"] = b_conf["write_many"]
+            if b_conf.get("coalesce"):
+                options["coalescer"] = Coalescer.from_config(b_conf)
+            branches[name] = cls.create(
+                readers_config=[],
+                writers_config=b_conf["writers"],
+                transformers_config=b_conf.get("transformers"),
+                filters_config=b_conf.get("filters"),
+                **options,
+            )
+        return branches
+
+    @classmethod
+    def create(
+        cls,
+        readers_config,
+        writers_config,
+        transformers_config=None,
+        filters_config=None,
+        branches_config=None,
+        **kwargs,
+    ):
+        """Creates a data stream based on the config.
+
+        When ``branches_config`` is given, a :class:`BranchingDataStream` is
+        created, the writers and transformers being the ones of each branch.
+        """
         readers = []
         for r_conf in readers_config:
             readers.append(ReaderFactory.create(r_conf))
 
         writers = []
-        for w_conf in writers_config:
+        for w_conf in writers_config or []:
             writers.append(WriterFactory.create(w_conf))
 
         transformers = []
@@ -76,6 +198,23 @@ class DataStreamFactory:
             for t_conf in transformers_config:
                 transformers.append(TransformerFactory.create(t_conf))
 
+        filters = []
+        if filters_config:
+            for f_conf in filters_config:
+                filters.append(FilterFactory.create(f_conf))
+
+        if branches_config:
+            return BranchingDataStream(
+                readers=readers,
+                branches=cls.create_branches(branches_config, **kwargs),
+                filters=filters,
+                **kwargs,
+            )
+
         return DataStream(
-            readers=readers, writers=writers, transformers=transformers, **kwargs
+            readers=readers,
+            writers=writers,
+            transformers=transformers,
+            filters=filters,
+            **kwargs,
         )
@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Filters module.
+
+Filters are predicates deciding which entries a data stream keeps. By default
+they run on the raw output of the readers, before any transformation, so that
+the discarded entries are not transformed at all. Filters needing the
+transformed entries can be run after the transformers instead.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+
+from .dedup import MAX_MEMORY_KEYS, SeenKeys
+from .sharding import shard_of
+
+READ_STAGE = "read"
+"""Stage of the filters run on the read entries, before transforming them."""
+
+TRANSFORM_STAGE = "transform"
+"""Stage of the filters run on the transformed entries."""
+
+
+def field_path(field):
+    """Keys of a dot separated field path (e.g. ``metadata.status``).
+
+    A list of keys is returned as is, for keys containing dots (e.g. URIs).
+    """
+    return field.split(".") if isinstance(field, str) else list(field)
+
+
+def field_value(entry, path):
+    """Get the value of a field of an entry, or ``None`` if not found."""
+    for key in path:
+        if not isinstance(entry, Mapping):
+            return None
+        entry = entry.get(key)
+    return entry
+
+
+class BaseFilter(ABC):
+    """Base filter."""
+
+    def __init__(self, stage=READ_STAGE, negate=False, *args, **kwargs):
+        """Constructor.
+
+        :param stage: ``read`` to filter the read entries (default) or
+            ``transform`` to filter the transformed ones.
+        :param negate: keep the entries that do not match instead.
+        """
+        self.stage = stage
+        self.negate = negate
+
+    @abstractmethod
+    def match(self, entry):
+        """Checks if the entry matches the filter."""
+        pass
+
+    def keep(self, entry):
+        """Checks if the entry should be kept."""
+        return self.match(entry) != self.negate
+
+    def close(self):
+        """Release the resources of the filter, once the stream is processed."""
+        pass
+
+
+class FieldFilter(BaseFilter):
+    """Base filter on the value of a field of the entries."""
+
+    def __init__(self, field="id", *args, **kwargs):
+        """Constructor.
+
+        :param field: dot separated path of the field (e.g. ``metadata.status``)
+            or list of keys, for keys containing dots (e.g. URIs).
+        """
+        self.path = field_path(field)
+        super().__init__(*args, **kwargs)
+
+    def value(self, entry):
+        """Get the value of the field, or ``None`` if not found."""
+        return field_value(entry, self.path)
+
+
+class RegexFilter(FieldFilter):
+    """Keeps the entries with a field matching a regular expression."""
+
+    def __init__(self, pattern, *args, **kwargs):
+        """Constructor.
+
+        :param pattern: regular expression searched in the field value.
+        """
+        self.pattern = re.compile(pattern)
+        super().__init__(*args, **kwargs)
+
+    def match(self, entry):
+        """Checks if the field value matches the pattern."""
+        value = self.value(entry)
+        return value is not None and self.pattern.search(str(value)) is not None
+
+
+class EqualsFilter(FieldFilter):
+    """Keeps the entries with a field equal to a value."""
+
+    def __init__(self, value, *args, **kwargs):
+        """Constructor.
+
+        :param value: expected value of the field.
+        """
+        self.expected = value
+        super().__init__(*args, **kwargs)
+
+    def match(self, entry):
+        """Checks if the field value is the expected one."""
+        return self.value(entry) == self.expected
+
+
+class AllowListFilter(FieldFilter):
+    """Keeps the entries with a field value in a list."""
+
+    def __init__(self, values, *args, **kwargs):
+        """Constructor.
+
+        :param values: allowed values of the field.
+        """
+        self.values = frozenset(values)
+        super().__init__(*args, **kwargs)
+
+    def match(self, entry):
+        """Checks if the field value is allowed."""
+        try:
+            return self.value(entry) in self.values
+        except TypeError:  # unhashable value
+            return False
+
+
+class DenyListFilter(AllowListFilter):
+    """Discards the entries with a field value in a list."""
+
+    def match(self, entry):
+        """Checks if the field value is not denied."""
+        return not super().match(entry)
+
+
+class ShardFilter(FieldFilter):
+    """Keeps the entries of a shard, by hash of a field value."""
+
+    def __init__(self, index, count, *args, **kwargs):
+        """Constructor.
+
+        :param index: index of the shard.
+        :param count: number of shards.
+        """
+        self.index = index
+        self.count = count
+        super().__init__(*args, **kwargs)
+
+    def match(self, entry):
+        """Checks if the field value belongs to the shard."""
+        return shard_of(self.value(entry), self.count) == self.index
+
+
+class UniqueFilter(FieldFilter):
+    """Keeps the first entry of each field value, dropping the duplicates.
+
+    The seen values are kept in memory up to ``max_memory_keys``, and then on
+    disk, see :class:`invenio_vocabularies.datastreams.dedup.SeenKeys`.
+    """
+
+    def __init__(self, max_memory_keys=MAX_MEMORY_KEYS, *args, **kwargs):
+        """Constructor.
+
+        :param max_memory_keys: number of values kept in memory.
+        """
+        self.seen = SeenKeys(max_memory_keys=max_memory_keys)
+        super().__init__(*args, **kwargs)
+
+    def match(self, entry):
+        """Checks if the field value is seen for the first time."""
+        value = self.value(entry)
+        return value is None or self.seen.add(value)
+
+    def close(self):
+        """Release the seen values."""
+        self.seen.close()
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data stream fingerprints.
+
+The fingerprint of an entry is a hash of its transformed content. Storing the
+fingerprint of every written entry allows the following imports to skip the
+entries which did not change, before any service call.
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+
+from invenio_db import db
+
+from ..records.models import VocabularyFingerprint
+from .compact import as_dict
+
+
+def fingerprint(entry):
+    """Compute the fingerprint of an entry."""
+    dump = json.dumps(
+        as_dict(entry), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(dump.encode("utf-8")).hexdigest()
+
+
+class BaseFingerprintStore(ABC):
+    """Base fingerprint store."""
+
+    @abstractmethod
+    def get_many(self, vocabulary, ids):
+        """Get the stored fingerprints of the given ids, as an id to hash dict."""
+        pass
+
+    @abstractmethod
+    def set_many(self, vocabulary, fingerprints):
+        """Store the fingerprints of an id to hash dict."""
+        pass
+
+
+class DatabaseFingerprintStore(BaseFingerprintStore):
+    """Stores the fingerprints in the ``vocabularies_fingerprints`` table."""
+
+    def get_many(self, vocabulary, ids):
+        """Get the stored fingerprints of the given ids, as an id to hash dict."""
+        query = db.session.query(
+            VocabularyFingerprint.id, VocabularyFingerprint.fingerprint
+        ).filter(
+            VocabularyFingerprint.vocabulary == vocabulary,
+            VocabularyFingerprint.id.in_(list(ids)),
+        )
+        return dict(query.all())
+
+    def set_many(self, vocabulary, fingerprints):
+        """Store the fingerprints of an id to hash dict."""
+        for id_, hash_ in fingerprints.items():
+            db.session.merge(
+                VocabularyFingerprint(vocabulary=vocabulary, id=id_, fingerprint=hash_)
+            )
+        db.session.commit()
+
+
+class Fingerprints:
+    """Detects the unchanged entries of a vocabulary import.
+
+    With asynchronous writers the fingerprints are stored by the write tasks,
+    once the entries are written (see :meth:`store_written`), so that an entry whose
+    task fails is written again by the next import.
+    """
+
+    def __init__(self, vocabulary, store=None, id_field="id"):
+        """Constructor.
+
+        :param vocabulary: name of the vocabulary, e.g. ``affiliations``.
+        :param store: a fingerprint store, defaults to a
+            :class:`DatabaseFingerprintStore`.
+        :param id_field: field of the transformed entries holding their id.
+        """
+        self.vocabulary = vocabulary
+        self.store = store or DatabaseFingerprintStore()
+        self.id_field = id_field
+        self.deferred = False
+        """Whether the fingerprints are stored by the asynchronous writers."""
+        self._pending = {}
+
+    def _entry_id(self, entry):
+        """Get the id of an entry, or ``None`` if it has no id."""
+        if isinstance(entry, Mapping) and entry.get(self.id_field) is not None:
+            return str(entry[self.id_field])
+        return None
+
+    def split(self, stream_entries):
+        """Split the stream entries in changed and unchanged ones."""
+        hashes = {}
+        for stream_entry in stream_entries:
+            id_ = self._entry_id(stream_entry.entry)
+            if id_ is not None:
+                hashes[id_] = fingerprint(stream_entry.entry)
+        stored = self.store.get_many(self.vocabulary, hashes.keys()) if hashes else {}
+
+        changed, unchanged = [], []
+        for stream_entry in stream_entries:
+            id_ = self._entry_id(stream_entry.entry)
+            if id_ is not None and stored.get(id_) == hashes[id_]:
+                unchanged.append(stream_entry)
+            else:
+                if id_ is not None and not self.deferred:
+                    self._pending[id_] = hashes[id_]
+                changed.append(stream_entry)
+        return changed, unchanged
+
+    def commit(self, written_entries):
+        """Store the fingerprints of the entries written without errors."""
+        fingerprints = {}
+        for stream_entry in written_entries:
+            id_ = self._entry_id(stream_entry.entry)
+            hash_ = self._pending.pop(id_, None)
+            if hash_ is not None and not stream_entry.errors:
+                fingerprints[id_] = hash_
+        if fingerprints:
+            self.store.set_many(self.vocabulary, fingerprints)
+
+    def store_written(self, written_entries):
+        """Store the fingerprints of entries written without errors.
+
+        Used by the write tasks of the asynchronous writers, the fingerprints
+        are computed from the written entries.
+        """
+        fingerprints = {}
+        for stream_entry in written_entries:
+            id_ = self._entry_id(stream_entry.entry)
+            if id_ is not None and not stream_entry.errors:
+                fingerprints[id_] = fingerprint(stream_entry.entry)
+        if fingerprints:
+            self.store.set_many(self.vocabulary, fingerprints)
+
+    def dump_config(self):
+        """Configuration of the fingerprints, as read by :meth:`from_config`."""
+        return {"vocabulary": self.vocabulary, "id_field": self.id_field}
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the fingerprints of a data stream configuration.
+
+        Reads ``config["fingerprints"]``, e.g. ``{"vocabulary": "funders"}``.
+        """
+        fingerprints_config = config["fingerprints"]
+        return cls(
+            fingerprints_config["vocabulary"],
+            id_field=fingerprints_config.get("id_field", "id"),
+        )
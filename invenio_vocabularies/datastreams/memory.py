@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Memory budget of the data streams.
+
+The memory used by a data stream run is tracked per stage (reading,
+transforming, writing). When the resident memory of the process gets close to
+the budget, the data stream writes its buffered entries early instead of
+waiting for full batches, and the stage which used the most memory is
+reported.
+"""
+
+import json
+import mmap
+import resource
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+from flask import current_app
+
+MB = 1024 * 1024
+
+
+def rss():
+    """Resident memory of the process, in bytes.
+
+    Falls back to the peak resident memory where ``/proc`` is not available.
+    """
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * mmap.PAGESIZE
+    except (OSError, IndexError, ValueError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # in bytes on macOS, kilobytes elsewhere
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StageMemory:
+    """Memory used by a data stream stage."""
+
+    def __init__(self):
+        """Constructor."""
+        self.rss_growth = 0
+        self.traced_peak = 0
+
+    def to_dict(self):
+        """Dump the memory used by the stage, in megabytes."""
+        return {
+            "max_rss_growth_mb": round(self.rss_growth / MB, 1),
+            "max_traced_peak_mb": round(self.traced_peak / MB, 1),
+        }
+
+
+class MemoryBudget:
+    """Memory budget of a data stream run.
+
+    The budget is ``near_limit`` once the resident memory of the process
+    reaches ``threshold`` of the ``limit``. For each stage, the largest growth
+    of the resident memory and, when ``trace`` is enabled, the largest peak of
+    the memory allocated by Python (see :mod:`tracemalloc`) are recorded.
+
+    Since the resident memory is per process, the stages running concurrently
+    (e.g. in a pipelined data stream) are not told apart by their growth.
+    Tracing allocations is more precise but slows down the run.
+    """
+
+    def __init__(self, limit_mb, threshold=0.9, trace=False, check_interval=1000):
+        """Constructor.
+
+        :param limit_mb: memory budget of the process, in megabytes.
+        :param threshold: ratio of the limit above which the budget is near
+            its limit.
+        :param trace: whether to trace the peak of the Python allocations of
+            each stage.
+        :param check_interval: number of read entries between two checks of
+            the memory while filling up a batch.
+        """
+        self.limit = limit_mb * MB
+        self.threshold = threshold
+        self.trace = trace
+        self.check_interval = check_interval
+        self.stages = {}
+        self.max_rss = 0
+        self.exceeded = 0
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracking the memory."""
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop tracking the memory."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def stage(self, name):
+        """Get (or create) the memory used by a stage."""
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageMemory()
+        return stage
+
+    def begin(self):
+        """Mark the start of a stage, to be passed to :meth:`end`."""
+        traced = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced = tracemalloc.get_traced_memory()[0]
+        return rss(), traced
+
+    def end(self, name, mark):
+        """Record the memory used by a stage since its mark, and check it.
+
+        :returns: whether the budget is near its limit.
+        """
+        stage = self.stage(name)
+        start, traced_start = mark
+        current = rss()
+        stage.rss_growth = max(stage.rss_growth, current - start)
+        if traced_start is not None and tracemalloc.is_tracing():
+            traced_peak = tracemalloc.get_traced_memory()[1] - traced_start
+            stage.traced_peak = max(stage.traced_peak, traced_peak)
+        self.max_rss = max(self.max_rss, current)
+
+        if not self.near_limit(current):
+            return False
+        self.exceeded += 1
+        if self.exceeded == 1:
+            current_app.logger.warning(
+                "Data stream memory budget nearly exhausted after the %s stage: "
+                "%.1f MB used of %.1f MB, the %s stage used the most memory.",
+                name,
+                current / MB,
+                self.limit / MB,
+                self.top_stage(),
+            )
+        return True
+
+    @contextmanager
+    def track(self, name):
+        """Track the memory used by a stage."""
+        mark = self.begin()
+        try:
+            yield
+        finally:
+            self.end(name, mark)
+
+    def near_limit(self, current=None):
+        """Whether the resident memory of the process is close to the limit."""
+        current = rss() if current is None else current
+        return current >= self.threshold * self.limit
+
+    def top_stage(self):
+        """Name of the stage which used the most memory, if any."""
+        if not self.stages:
+            return None
+        return max(
+            self.stages,
+            key=lambda n: (self.stages[n].traced_peak, self.stages[n].rss_growth),
+        )
+
+    def report(self):
+        """Summary of the memory used by the run."""
+        return {
+            "limit_mb": round(self.limit / MB, 1),
+            "max_rss_mb": round(self.max_rss / MB, 1),
+            "near_limit": self.exceeded,
+            "top_stage": self.top_stage(),
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+        }
+
+    def emit(self):
+        """Log the report, as a warning if the budget got near its limit."""
+        level = "warning" if self.exceeded else "info"
+        getattr(current_app.logger, level)(
+            "Data stream memory: %s", json.dumps(self.report(), sort_keys=True)
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the memory budget of a data stream configuration.
+
+        ``config["memory_budget"]`` is either the limit, in megabytes, or a
+        dictionary with the constructor arguments, e.g.
+        ``{"limit_mb": 2048, "trace": True}``.
+        """
+        options = config.get("memory_budget")
+        if isinstance(options, dict):
+            return cls(**options)
+        return cls(limit_mb=options)
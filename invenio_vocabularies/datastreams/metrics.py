@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data stream metrics."""
+
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+from flask import current_app
+
+LATENCY_BUCKETS = (0.001, 0.01, 0.1, 1, 10, 60)
+"""Upper bounds (in seconds) of the latency histogram buckets."""
+
+
+class LatencyHistogram:
+    """Histogram of latencies, in seconds."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Constructor."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value, count=1):
+        """Record a latency.
+
+        :param count: number of entries which took this latency each, e.g. the
+            entries of a batch processed at once.
+        """
+        self.counts[bisect_left(self.buckets, value)] += count
+        self.count += count
+        self.total += value * count
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add the observations of another histogram."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        """Dump the histogram."""
+        labels = [f"le_{bucket}" for bucket in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class StageMetrics:
+    """Counters and timings of a data stream stage (reader, transformer...)."""
+
+    def __init__(self):
+        """Constructor."""
+        self.entries_in = 0
+        self.entries_out = 0
+        self.errors = 0
+        self.filtered = 0
+        self.bytes_read = 0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other):
+        """Add the counters of another stage."""
+        self.entries_in += other.entries_in
+        self.entries_out += other.entries_out
+        self.errors += other.errors
+        self.filtered += other.filtered
+        self.bytes_read += other.bytes_read
+        self.latency.merge(other.latency)
+
+    def to_dict(self):
+        """Dump the metrics of the stage."""
+        return {
+            "entries_in": self.entries_in,
+            "entries_out": self.entries_out,
+            "errors": self.errors,
+            "filtered": self.filtered,
+            "bytes_read": self.bytes_read,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class DataStreamMetrics:
+    """Metrics of a data stream run, grouped by stage.
+
+    Stages are named after their kind and class, e.g. ``reader:ZipReader``,
+    ``transformer:RORTransformer`` or ``writer:AsyncWriter``.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.stages = {}
+
+    def stage(self, name):
+        """Get (or create) the metrics of a stage."""
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageMetrics()
+        return stage
+
+    def merge(self, other):
+        """Add the metrics of another run (e.g. from a worker process)."""
+        for name, stage in other.stages.items():
+            self.stage(name).merge(stage)
+
+    def summary(self):
+        """Dump the metrics of all the stages."""
+        return {name: stage.to_dict() for name, stage in self.stages.items()}
+
+
+def stage_name(kind, obj):
+    """Name of the stage of a reader, transformer or writer."""
+    return f"{kind}:{obj.__class__.__name__}"
+
+
+def item_size(item):
+    """Size in bytes of a read item, if it can be known cheaply."""
+    if isinstance(item, (bytes, bytearray)):
+        return len(item)
+    if isinstance(item, io.BytesIO):
+        return item.getbuffer().nbytes
+    if not isinstance(item, io.IOBase):
+        return 0  # e.g. the entries read, no need to look for a file
+    try:
+        return os.fstat(item.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return 0
+
+
+class BaseMetricsSink(ABC):
+    """Base metrics sink."""
+
+    @abstractmethod
+    def emit(self, summary, *args, **kwargs):
+        """Emit the summary of the metrics of a data stream run."""
+        pass
+
+
+class LoggerMetricsSink(BaseMetricsSink):
+    """Logs the metrics summary as JSON."""
+
+    def emit(self, summary, *args, **kwargs):
+        """Log the summary."""
+        current_app.logger.info(
+            "Data stream metrics: %s", json.dumps(summary, sort_keys=True)
+        )
+
+
+def emit_metrics(metrics):
+    """Emit the metrics summary to the configured sinks.
+
+    The sinks are read from ``VOCABULARIES_DATASTREAM_METRICS_SINKS``.
+    """
+    summary = metrics.summary()
+    for sink_cls in current_app.config.get("VOCABULARIES_DATASTREAM_METRICS_SINKS", []):
+        sink_cls().emit(summary)
+    return summary
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Concurrent execution of data stream stages."""
+
+import queue
+import threading
+from contextvars import copy_context
+from time import monotonic
+
+from flask import current_app
+
+_DONE = object()
+"""Marker put on a queue when the upstream stage is exhausted."""
+
+TICK = object()
+"""Marker yielded by a pipeline when no item was produced within its tick."""
+
+
+class Pipeline:
+    """Runs data stream stages concurrently, connected by bounded queues.
+
+    The source and every stage run in their own thread, each one with its own
+    application context. Iterating over the pipeline yields the output of the
+    last stage in the calling thread.
+
+    Each queue holds at most ``queue_size`` items: a stage blocks when its
+    downstream stage falls behind (backpressure), so the memory used by the
+    pipeline is bounded by the queue sizes. If a stage fails, all the stages
+    are stopped and the exception is re-raised in the calling thread.
+
+    When a ``tick`` is given, :data:`TICK` is yielded every time no item was
+    produced for that many seconds, so that the caller can act on time (e.g.
+    flush a partial batch) while the stages are waiting.
+    """
+
+    def __init__(self, source, stages, queue_size=2, poll_interval=0.1, tick=None):
+        """Constructor.
+
+        :param source: callable returning an iterable of items.
+        :param stages: ordered list of callables, each one taking the item
+            produced by the previous stage and returning a new item.
+        :param queue_size: maximum number of items waiting between two stages.
+        :param poll_interval: seconds between checks for a stopped pipeline
+            while waiting on a queue.
+        :param tick: seconds without output after which :data:`TICK` is
+            yielded.
+        """
+        self._source = source
+        self._stages = stages
+        self._queue_size = queue_size
+        self._poll_interval = poll_interval
+        self._tick = tick
+        self._stop = threading.Event()
+        self._errors = []
+
+    def _put(self, queue_, item):
+        """Put an item in the queue, unless the pipeline is stopped."""
+        while not self._stop.is_set():
+            try:
+                queue_.put(item, timeout=self._poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, queue_, timeout=None):
+        """Get an item from the queue.
+
+        Returns ``_DONE`` if the pipeline is stopped, or :data:`TICK` if no item
+        was available within the timeout.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            wait = self._poll_interval
+            if deadline is not None:
+                wait = max(0, min(wait, deadline - monotonic()))
+            try:
+                return queue_.get(timeout=wait)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _DONE
+                if deadline is not None and monotonic() >= deadline:
+                    return TICK
+
+    def _run_source(self, app, out_queue):
+        """Run the source, putting its items in the output queue."""
+        with app.app_context():
+            for item in self._source():
+                if not self._put(out_queue, item):
+                    break
+
+    def _run_stage(self, app, stage, in_queue, out_queue):
+        """Run a stage over the items of the input queue."""
+        with app.app_context():
+            while (item := self._get(in_queue)) is not _DONE:
+                if not self._put(out_queue, stage(item)):
+                    break
+
+    def _run(self, func, *args):
+        """Run a source or stage, stopping the pipeline on errors."""
+        out_queue = args[-1]
+        try:
+            func(*args)
+        except Exception as exc:
+            self._errors.append(exc)
+            self._stop.set()
+        finally:
+            self._put(out_queue, _DONE)
+
+    def __iter__(self):
+        """Start the stages and yield the output of the last one."""
+        app = current_app._get_current_object()
+        queues = [
+            queue.Queue(maxsize=self._queue_size) for _ in range(len(self._stages) + 1)
+        ]
+        runs = [(self._run_source, app, queues[0])]
+        for idx, stage in enumerate(self._stages):
+            runs.append((self._run_stage, app, stage, queues[idx], queues[idx + 1]))
+
+        threads = []
+        for run in runs:
+            # Copy the context so that context variables (e.g. the job context)
+            # are propagated to the stage threads.
+            thread = threading.Thread(
+                target=copy_context().run, args=(self._run, *run), daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        try:
+            while (item := self._get(queues[-1], timeout=self._tick)) is not _DONE:
+                yield item
+            if self._errors:
+                raise self._errors[0]
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
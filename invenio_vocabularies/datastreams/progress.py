@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Progress of the data streams.
+
+The progress of a run is estimated from its readers (see
+``BaseReader.estimate``), either in entries (e.g. the number of results of a
+query) or in bytes (e.g. the size of a file and the position in it). In a job
+run, the total of entries of the run is raised to the estimated total once
+known (see ``DataStream.run_total_estimate``).
+"""
+
+from datetime import timedelta
+from time import monotonic
+
+from flask import current_app
+
+MB = 1024 * 1024
+
+
+def format_progress(progress):
+    """Format a progress summary (see :meth:`Progress.summary`) for humans."""
+    parts = [f"{progress['entries']} entries"]
+    if progress["total_entries"] is not None:
+        parts[0] = f"{progress['entries']} of ~{progress['total_entries']} entries"
+    if progress["percent"] is not None:
+        parts[0] += f" ({progress['percent']:.1f}%)"
+    if progress["total_bytes"]:
+        parts.append(
+            f"{progress['bytes_read'] / MB:.1f} of "
+            f"{progress['total_bytes'] / MB:.1f} MB"
+        )
+    parts.append(f"{timedelta(seconds=round(progress['elapsed']))} elapsed")
+    if progress["eta"] is not None:
+        parts.append(f"ETA {timedelta(seconds=round(progress['eta']))}")
+    return ", ".join(parts)
+
+
+class Progress:
+    """Progress of a data stream run, reported at regular intervals.
+
+    The progress is logged, so that it shows in the logs of the job runs, or
+    passed to a callback (e.g. to print it in the command line).
+    """
+
+    def __init__(self, interval=60, callback=None):
+        """Constructor.
+
+        :param interval: seconds between two reports.
+        :param callback: callable receiving the progress summary. Defaults to
+            logging it.
+        """
+        self.interval = interval
+        self.callback = callback
+        self._start = None
+        self._last_report = None
+
+    def start(self):
+        """Start tracking the progress."""
+        self._start = self._last_report = monotonic()
+
+    def update(self, datastream):
+        """Report the progress of a data stream if it is time."""
+        if monotonic() - self._last_report >= self.interval:
+            self.report(datastream)
+
+    def summary(self, datastream, finished=False):
+        """Summary of the progress of a data stream.
+
+        Includes the processed entries, the estimated total of entries, the
+        bytes read and to read (if estimated in bytes), the percentage done,
+        and the elapsed and remaining (ETA) times, in seconds.
+        """
+        entries = datastream.entries_processed
+        estimate = datastream.estimate() or {}
+        total_entries = datastream.total()
+        total_bytes = estimate.get("bytes")
+        bytes_read = estimate.get("bytes_read", 0)
+
+        done = None
+        if estimate.get("entries"):
+            done = entries / estimate["entries"]
+        elif total_bytes:
+            done = bytes_read / total_bytes
+        if finished:
+            done, total_entries = 1.0, entries
+        elif done is not None:
+            done = min(done, 1.0)
+
+        elapsed = monotonic() - self._start
+        eta = None
+        if done:
+            eta = elapsed * (1 - done) / done
+        return {
+            "entries": entries,
+            "total_entries": total_entries,
+            "bytes_read": bytes_read,
+            "total_bytes": total_bytes,
+            "percent": None if done is None else done * 100,
+            "elapsed": elapsed,
+            "eta": eta,
+        }
+
+    def report(self, datastream, finished=False):
+        """Report the progress of a data stream."""
+        self._last_report = monotonic()
+        summary = self.summary(datastream, finished=finished)
+        if self.callback is not None:
+            self.callback(summary)
+        else:
+            current_app.logger.info(
+                "Data stream progress: %s", format_progress(summary)
+            )
+
+    @classmethod
+    def from_config(cls, config, callback=None):
+        """Create the progress of a data stream configuration.
+
+        ``config["progress"]`` is either ``True`` or a dictionary with the
+        constructor arguments, e.g. ``{"interval": 30}``.
+        """
+        options = config.get("progress")
+        options = options if isinstance(options, dict) else {}
+        return cls(callback=callback, **options)
@@ -4,10 +4,12 @@
 
 """Readers module."""
 
+import codecs
 import csv
 import gzip
 import io
 import json
+import os
 import re
 import tarfile
 import zipfile
@@ -21,6 +23,7 @@ from lxml.html import fromstring
 from lxml.html import parse as html_parse
 
 from .errors import ReaderError
+from .remote import READ_AHEAD, open_remote
 from .xml import etree_to_dict
 
 # Extras dependencies
@@ -43,9 +46,23 @@ except ImportError:
     sparql = None
 
 
+def _file_estimate(fp):
+    """Estimate of the size of an open file, and of the position in it."""
+    if fp is None or fp.closed:
+        return None
+    raw = getattr(fp, "buffer", fp)  # text files cannot tell while iterated
+    try:
+        return {"bytes": os.fstat(raw.fileno()).st_size, "bytes_read": raw.tell()}
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
 class BaseReader(ABC):
     """Base reader."""
 
+    _origin_fp = None
+    """File of the origin, while it is being read."""
+
     def __init__(self, origin=None, mode="r", *args, **kwargs):
         """Constructor.
 
@@ -66,8 +83,18 @@ class BaseReader(ABC):
             yield from self._iter(fp=item, *args, **kwargs)
         else:
             with open(self._origin, self._mode) as file:
+                self._origin_fp = file
                 yield from self._iter(fp=file, *args, **kwargs)
 
+    def estimate(self):
+        """Estimate of the size of the data being read, to report progress.
+
+        :returns: ``None`` if unknown, else a dictionary with either the
+            estimated number of ``entries`` yielded by the reader, or the size
+            in ``bytes`` of the data being read and the ``bytes_read`` so far.
+        """
+        return _file_estimate(self._origin_fp)
+
 
 class YamlReader(BaseReader):
     """Yaml reader."""
@@ -104,17 +131,35 @@ class TarReader(BaseReader):
                 with tarfile.open(mode=self._mode, fileobj=item) as archive:
                     yield from self._iter(fp=archive, *args, **kwargs)
         else:
-            with tarfile.open(self._origin, self._mode) as archive:
-                yield from self._iter(fp=archive, *args, **kwargs)
+            # Opened separately, the position in the file gives the progress
+            with open(self._origin, "rb") as file:
+                self._origin_fp = file
+                with tarfile.open(mode=self._mode, fileobj=file) as archive:
+                    yield from self._iter(fp=archive, *args, **kwargs)
 
 
 class SimpleHTTPReader(BaseReader):
     """Simple HTTP Reader."""
 
-    def __init__(self, origin, id=None, ids=None, content_type=None, *args, **kwargs):
-        """Constructor."""
+    def __init__(
+        self,
+        origin,
+        id=None,
+        ids=None,
+        content_type=None,
+        stream=False,
+        *args,
+        **kwargs,
+    ):
+        """Constructor.
+
+        :param stream: if True, the raw body of the responses is yielded, a
+            non-seekable stream read while it is being downloaded, instead of
+            their content.
+        """
         self._ids = ids if ids else ([id] if id else None)
         self.content_type = content_type
+        self._stream = stream
         super().__init__(origin, *args, **kwargs)
 
     def _iter(self, url, *args, **kwargs):
@@ -124,20 +169,35 @@ class SimpleHTTPReader(BaseReader):
 
         # If there are no IDs, query the base URL
         if not self._ids:
-            resp = requests.get(url, headers=headers)
+            resp = self._get(url, headers=headers)
             if resp.status_code == 200:
-                yield resp.content
+                yield from self._body(resp)
             else:
                 print(f"Failed to fetch URL {url}: {resp.status_code}")
         else:
             for id_ in self._ids:
                 url = base_url.format(id=id_)
-                resp = requests.get(url, headers=headers)
+                resp = self._get(url, headers=headers)
                 if resp.status_code != 200:
                     # todo add logging/fail
                     pass
 
-                yield resp.content
+                yield from self._body(resp)
+
+    def _get(self, url, headers):
+        """Requests an URL, without reading the body when streaming."""
+        if self._stream:
+            return requests.get(url, headers=headers, stream=True)
+        return requests.get(url, headers=headers)
+
+    def _body(self, resp):
+        """Yields the content of a response, or its raw body when streaming."""
+        if not self._stream:
+            yield resp.content
+            return
+        with resp:  # the connection is released once the body is read
+            resp.raw.decode_content = True
+            yield resp.raw
 
     def read(self, item=None, *args, **kwargs):
         """Chooses between item and origin as url."""
@@ -146,20 +206,49 @@ class SimpleHTTPReader(BaseReader):
 
 
 class ZipReader(BaseReader):
-    """ZIP reader."""
+    """ZIP reader.
 
-    def __init__(self, *args, options=None, regex=None, **kwargs):
-        """Constructor."""
+    An ``http(s)`` origin is read with range requests (see
+    :func:`~invenio_vocabularies.datastreams.remote.open_remote`), so that
+    only the central directory and the matching members are downloaded.
+    """
+
+    def __init__(
+        self, *args, options=None, regex=None, read_ahead=READ_AHEAD, **kwargs
+    ):
+        """Constructor.
+
+        :param read_ahead: bytes requested at once from a remote origin.
+        """
         self._options = options or {}
         self._regex = re.compile(regex) if regex else None
+        self._read_ahead = read_ahead
+        self._estimate = None
         super().__init__(*args, **kwargs)
 
     def _iter(self, fp, *args, **kwargs):
         """Iterates through the files in the archive."""
-        for member in fp.infolist():
-            match = not self._regex or self._regex.search(member.filename)
-            if not member.is_dir() and match:
-                yield fp.open(member)
+        members = [
+            member
+            for member in fp.infolist()
+            if not member.is_dir()
+            and (not self._regex or self._regex.search(member.filename))
+        ]
+        self._estimate = {
+            "bytes": sum(member.file_size for member in members),
+            "bytes_read": 0,
+        }
+        for member in members:
+            yield fp.open(member)
+            # the member is read by the next readers before resuming
+            self._estimate["bytes_read"] += member.file_size
+
+    def estimate(self):
+        """Estimate of the (uncompressed) size of the files being read.
+
+        The estimate is the one of the archive being read, if any.
+        """
+        return dict(self._estimate) if self._estimate else None
 
     def read(self, item=None, *args, **kwargs):
         """Opens a Zip archive or uses the given file pointer."""
@@ -171,6 +260,10 @@ class ZipReader(BaseReader):
                 # If the item is not already a ZipFile (e.g. if it is a BytesIO), try to create a ZipFile from the item.
                 with zipfile.ZipFile(item, **self._options) as archive:
                     yield from self._iter(fp=archive, *args, **kwargs)
+        elif str(self._origin).startswith(("http://", "https://")):
+            with open_remote(self._origin, read_ahead=self._read_ahead) as fp:
+                with zipfile.ZipFile(fp, **self._options) as archive:
+                    yield from self._iter(fp=archive, *args, **kwargs)
         else:
             with zipfile.ZipFile(self._origin, **self._options) as archive:
                 yield from self._iter(fp=archive, *args, **kwargs)
@@ -192,6 +285,120 @@ class JsonReader(BaseReader):
             raise ReaderError(f"Cannot decode JSON file {fp.name}: {str(err)}")
 
 
+class JsonStreamReader(BaseReader):
+    """Streaming JSON array reader.
+
+    Yields the elements of a top-level JSON array as they are decoded, reading
+    the file in chunks, so that only the current element is kept in memory
+    instead of the whole array. Other JSON values are loaded at once, like
+    with :class:`JsonReader`.
+    """
+
+    def __init__(self, *args, chunk_size=1024 * 1024, **kwargs):
+        """Constructor.
+
+        :param chunk_size: number of bytes (or characters, for text files)
+            read at once.
+        """
+        self._chunk_size = chunk_size
+        super().__init__(*args, **kwargs)
+
+    def _chunks(self, fp):
+        """Read the file in text chunks, decoding binary files as UTF-8."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        while True:
+            chunk = fp.read(self._chunk_size)
+            if isinstance(chunk, str):
+                text = chunk
+            else:
+                text = decoder.decode(chunk, final=not chunk)
+            if text:
+                yield text
+            if not chunk:
+                return
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yields the elements of the JSON array."""
+        name = getattr(fp, "name", fp)
+        decoder = json.JSONDecoder()
+        chunks = self._chunks(fp)
+        buffer, pos, eof = "", 0, False
+
+        def fill():
+            """Read the next chunk, dropping the decoded part of the buffer."""
+            nonlocal buffer, pos, eof
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buffer, pos = buffer[pos:] + chunk, 0
+
+        def skip_whitespace():
+            """Move to the next non-whitespace character, if any."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                fill()
+
+        def end_of_array():
+            """Check that only whitespace follows the closing bracket."""
+            nonlocal pos
+            pos += 1
+            skip_whitespace()
+            if not eof:
+                raise ReaderError(
+                    f"Cannot decode JSON file {name}: extra data after the array"
+                )
+
+        skip_whitespace()
+        if eof:
+            return  # empty file
+        if buffer[pos] != "[":
+            # Not an array, load the whole value
+            while not eof:
+                fill()
+            try:
+                yield json.loads(buffer[pos:])
+            except JSONDecodeError as err:
+                raise ReaderError(f"Cannot decode JSON file {name}: {str(err)}")
+            return
+
+        pos += 1
+        skip_whitespace()
+        if not eof and buffer[pos] == "]":
+            end_of_array()
+            return  # empty array
+        while True:
+            try:
+                entry, end = decoder.raw_decode(buffer, pos)
+            except JSONDecodeError as err:
+                if eof:
+                    raise ReaderError(f"Cannot decode JSON file {name}: {str(err)}")
+                fill()  # the element continues in the next chunk
+                continue
+            if not eof and (end == len(buffer) or buffer[end] in ".eE+-0123456789"):
+                fill()  # a number might continue in the next chunk
+                continue
+            pos = end
+            skip_whitespace()
+            if eof:
+                raise ReaderError(f"Cannot decode JSON file {name}: unterminated array")
+            yield entry
+            separator = buffer[pos]
+            if separator == "]":
+                end_of_array()
+                return
+            pos += 1
+            if separator != ",":
+                raise ReaderError(
+                    f"Cannot decode JSON file {name}: expecting ',' delimiter"
+                )
+            skip_whitespace()
+
+
 class JsonLinesReader(BaseReader):
     """JSON Lines reader."""
 
@@ -210,6 +417,38 @@ class JsonLinesReader(BaseReader):
                 )
 
 
+class DeadLettersReader(BaseReader):
+    """Dead letters reader.
+
+    Reads the entries of a data stream dead letters file, see
+    :class:`invenio_vocabularies.datastreams.deadletters.DeadLetters`.
+    """
+
+    def __init__(self, origin=None, stage=None, branch=None, *args, **kwargs):
+        """Constructor.
+
+        :param stage: only read the entries that failed at this stage.
+        :param branch: only read the entries that failed in this branch, by
+            default the ones that failed outside of any branch.
+        """
+        self._stage = stage
+        self._branch = branch
+        super().__init__(origin=origin, *args, **kwargs)
+
+    def _iter(self, fp, *args, **kwargs):
+        for idx, line in enumerate(fp):
+            try:
+                letter = json.loads(line)
+            except JSONDecodeError as err:
+                raise ReaderError(
+                    f"Cannot decode dead letter {fp.name}:{idx}: {str(err)}"
+                )
+            if letter.get("branch") != self._branch:
+                continue
+            if self._stage is None or letter["stage"] == self._stage:
+                yield letter["entry"]
+
+
 class GzipReader(BaseReader):
     """Gzip reader."""
 
@@ -385,7 +624,7 @@ class RDFReader(BaseReader):
 
     def read(self, item=None, *args, **kwargs):
         """Fetch and process the RDF data, yielding it one subject at a time."""
-        if isinstance(item, gzip.GzipFile):
+        if isinstance(item, gzip.GzipFile) or hasattr(item, "read"):
             rdf_content = item.read().decode("utf-8")
 
         elif isinstance(item, bytes):
@@ -413,6 +652,7 @@ class SPARQLReader(BaseReader):
         self._origin = origin
         self._query = query
         self._client_params = client_params or {}
+        self._total = None
 
         super().__init__(origin=origin, mode=mode, *args, **kwargs)
 
@@ -440,4 +680,10 @@ class SPARQLReader(BaseReader):
         sparql_client.setReturnFormat(sparql.JSON)
 
         results = sparql_client.query().convert()
-        yield from results["results"]["bindings"]
+        bindings = results["results"]["bindings"]
+        self._total = len(bindings)
+        yield from bindings
+
+    def estimate(self):
+        """Number of results of the query, once it is executed."""
+        return None if self._total is None else {"entries": self._total}
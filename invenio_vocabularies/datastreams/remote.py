@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Remote files of the data streams.
+
+A remote file is read with HTTP range requests, so that only the parts being
+read are downloaded, e.g. the central directory and the needed members of a
+ZIP archive instead of the whole archive. The requests are spread over the
+whole read, so the server errors are retried.
+"""
+
+import io
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .errors import RangeNotSupportedError, ReaderError
+
+READ_AHEAD = 1024 * 1024
+"""Default number of bytes requested at once from a remote file."""
+
+RETRIES = 3
+"""Number of times a failed range request is retried, with a backoff."""
+
+_EXPIRED_STATUS = (403, 404, 410)
+
+_CONTENT_RANGE = re.compile(r"bytes \d+-\d+/(\d+)")
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """Seekable file reading a remote file with HTTP range requests.
+
+    Every read is a range request, use :func:`open_remote` to buffer the reads
+    and read ahead.
+    """
+
+    def __init__(self, url, session=None, headers=None, retries=RETRIES):
+        """Constructor.
+
+        Requests the first byte of the file to get its size and check that the
+        server supports range requests.
+
+        :param url: URL of the file, redirections are followed once, and again
+            if the redirection expires (e.g. a signed storage URL).
+        :param session: a :class:`requests.Session`, closed with the file if
+            not given. The server errors are retried in it.
+        :param headers: headers of the requests.
+        :param retries: number of times the server errors are retried.
+        """
+        super().__init__()
+        self.name = url
+        self._session = session or requests.Session()
+        self._owns_session = session is None
+        if isinstance(self._session, requests.sessions.Session):
+            adapter = HTTPAdapter(
+                max_retries=Retry(
+                    total=retries,
+                    backoff_factor=0.5,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=("GET",),
+                    raise_on_status=False,
+                )
+            )
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        self._headers = dict(headers or {})
+        self._pos = 0
+        self.size = None
+        self.requests = 0
+        self.bytes_fetched = 0
+        try:
+            self._resolve()
+        except requests.RequestException as err:
+            self.close()
+            raise ReaderError(f"Cannot read {url}: {err}") from err
+        except BaseException:
+            self.close()
+            raise
+
+    def _resolve(self):
+        """Request the first byte of the file, to get its URL and size."""
+        with self._get(self.name, 0, 0, stream=True) as resp:
+            match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+            if resp.status_code != 206 or not match:
+                raise RangeNotSupportedError(
+                    f"The server of {self.name} does not support range requests."
+                )
+            size = int(match.group(1))
+            if self.size is not None and size != self.size:
+                raise ReaderError(f"The remote file {self.name} changed while read.")
+            self.url = resp.url  # e.g. the redirection to a storage
+            self.size = size
+
+    def _get(self, url, start, end, **kwargs):
+        """Request a range of bytes, both included."""
+        headers = dict(self._headers, Range=f"bytes={start}-{end}")
+        resp = self._session.get(url, headers=headers, **kwargs)
+        resp.raise_for_status()
+        self.requests += 1
+        return resp
+
+    def _get_range(self, start, end):
+        """Request a range of the file, resolving its URL again if expired."""
+        try:
+            return self._get(self.url, start, end)
+        except requests.HTTPError as err:
+            status = err.response.status_code if err.response is not None else None
+            if self.url == self.name or status not in _EXPIRED_STATUS:
+                raise
+        self._resolve()
+        return self._get(self.url, start, end)
+
+    def readable(self):
+        """The file is readable."""
+        return True
+
+    def seekable(self):
+        """The file is seekable."""
+        return True
+
+    def tell(self):
+        """Current position in the file."""
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Move to a position in the file."""
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position: {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        """Read bytes at the current position into a buffer."""
+        if self._pos >= self.size or not len(buffer):
+            return 0
+        end = min(self._pos + len(buffer), self.size) - 1
+        try:
+            resp = self._get_range(self._pos, end)
+        except requests.RequestException as err:
+            raise ReaderError(f"Cannot read {self.name}: {err}") from err
+        if resp.status_code != 206:
+            raise RangeNotSupportedError(
+                f"The server of {self.name} ignored a range request."
+            )
+        data = resp.content
+        size = len(data)
+        buffer[:size] = data
+        self._pos += size
+        self.bytes_fetched += size
+        return size
+
+    def close(self):
+        """Close the file, and its session if owned."""
+        if not self.closed and self._owns_session:
+            self._session.close()
+        super().close()
+
+
+def open_remote(url, read_ahead=READ_AHEAD, **kwargs):
+    """Open a remote file, buffering the reads (see :class:`HTTPRangeFile`).
+
+    :param read_ahead: minimum number of bytes requested at once. The
+        requested bytes are kept in a buffer, which serves the following
+        reads and seeks within them.
+    """
+    return io.BufferedReader(HTTPRangeFile(url, **kwargs), buffer_size=read_ahead)
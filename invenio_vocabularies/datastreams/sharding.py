@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data stream sharding.
+
+A sharded data stream is split in several data streams, one per shard, each
+one processing a partition of the entries. The ``shards`` section of a data
+stream configuration defines the number of shards and how the entries are
+partitioned:
+
+- ``index``: by position of the items read at a level of the reader chain,
+  e.g. ``{"count": 8, "partition": "index", "level": 1}`` distributes the
+  members of an archive read by the second reader. The other items are
+  skipped without reading their nested items.
+- ``hash``: by hash of a field of the read entries, e.g.
+  ``{"count": 8, "partition": "hash", "field": "id"}``.
+- ``reader``: by the first reader itself, which receives a ``shard``
+  argument (e.g. the ORCiD data sync reader only fetches its share of the
+  records).
+"""
+
+import zlib
+from copy import deepcopy
+
+PARTITIONS = ("index", "hash", "reader")
+"""Supported partitions of the entries."""
+
+
+def shard_of(value, count):
+    """Shard of a value, stable across processes."""
+    return zlib.crc32(str(value).encode("utf-8")) % count
+
+
+def shard_configs(config):
+    """Split a data stream configuration in one configuration per shard.
+
+    ``config["shards"]`` is either the number of shards, partitioned by
+    ``index`` at the first level, or a dictionary with the ``count``,
+    ``partition`` and its options (``level`` or ``field``).
+    """
+    sharding = config["shards"]
+    if not isinstance(sharding, dict):
+        sharding = {"count": sharding}
+    count = sharding["count"]
+    partition = sharding.get("partition", "index")
+    if partition not in PARTITIONS:
+        raise ValueError(f"Unknown data stream partition: {partition}")
+
+    base_config = {k: v for k, v in config.items() if k != "shards"}
+    configs = []
+    for index in range(count):
+        shard_config = deepcopy(base_config)
+        if partition == "index":
+            shard_config["shard"] = {
+                "index": index,
+                "count": count,
+                "level": sharding.get("level", 0),
+            }
+        elif partition == "hash":
+            shard_config["filters"] = [
+                *(shard_config.get("filters") or []),
+                {
+                    "type": "shard",
+                    "args": {
+                        "index": index,
+                        "count": count,
+                        "field": sharding.get("field", "id"),
+                    },
+                },
+            ]
+        else:
+            reader_config = shard_config["readers"][0]
+            reader_config["args"] = {
+                **reader_config.get("args", {}),
+                "shard": {"index": index, "count": count},
+            }
+        configs.append(shard_config)
+    return configs
@@ -10,15 +10,19 @@ from invenio_jobs.logging.jobs import EMPTY_JOB_CTX, job_context
 from invenio_jobs.proxies import current_runs_service
 
 from ..datastreams import StreamEntry
+from ..datastreams.compact import unpack_entries
 from ..datastreams.factories import WriterFactory
+from ..datastreams.fingerprints import Fingerprints
 
 
 @shared_task(ignore_result=True)
-def write_entry(writer_config, entry, subtask_run_id=None):
+def write_entry(writer_config, entry, subtask_run_id=None, fingerprints=None):
     """Write an entry.
 
     :param writer: writer configuration as accepted by the WriterFactory.
     :param entry: dictionary, StreamEntry is not serializable.
+    :param fingerprints: fingerprints configuration, the fingerprint of the
+        entry is stored once written (see :class:`Fingerprints`).
     """
     job_ctx = job_context.get()
     job_id = job_ctx.get("job_id", None) if job_ctx is not EMPTY_JOB_CTX else None
@@ -33,6 +37,10 @@ def write_entry(writer_config, entry, subtask_run_id=None):
     writer = WriterFactory.create(config=writer_config)
     try:
         processed_stream_entry = writer.write(StreamEntry(entry))
+        if fingerprints:
+            Fingerprints.from_config({"fingerprints": fingerprints}).store_written(
+                [processed_stream_entry]
+            )
         errored_entries_count = 1 if processed_stream_entry.errors else 0
         inserted_count = 1 if processed_stream_entry.op_type == "create" else 0
         updated_count = 1 if processed_stream_entry.op_type == "update" else 0
@@ -62,11 +70,17 @@ def write_entry(writer_config, entry, subtask_run_id=None):
 
 
 @shared_task(ignore_result=True)
-def write_many_entry(writer_config, entries, subtask_run_id=None):
+def write_many_entry(
+    writer_config, entries, subtask_run_id=None, entry_type=None, fingerprints=None
+):
     """Write many entries.
 
     :param writer: writer configuration as accepted by the WriterFactory.
     :param entry: lisf ot dictionaries, StreamEntry is not serializable.
+    :param entry_type: import path of the compact entries class, when the
+        entries are packed (see :func:`pack_entries`).
+    :param fingerprints: fingerprints configuration, the fingerprints of the
+        entries are stored once written (see :class:`Fingerprints`).
     """
     job_ctx = job_context.get()
     job_id = job_ctx.get("job_id", None) if job_ctx is not EMPTY_JOB_CTX else None
@@ -78,9 +92,14 @@ def write_many_entry(writer_config, entries, subtask_run_id=None):
             system_identity, subtask_run.id, job_id=job_id
         )
     writer = WriterFactory.create(config=writer_config)
+    entries = unpack_entries(entry_type, entries)
     stream_entries = [StreamEntry(entry) for entry in entries]
     try:
         processed_stream_entries = writer.write_many(stream_entries)
+        if fingerprints:
+            Fingerprints.from_config({"fingerprints": fingerprints}).store_written(
+                processed_stream_entries
+            )
         errored_entries_count = sum(
             1 for entry in processed_stream_entries if entry.errors
         )
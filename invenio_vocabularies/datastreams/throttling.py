@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Throttling of the data streams.
+
+A rate limit caps the number of entries processed per second, so that large
+imports can run next to interactive traffic without saturating the database or
+the search cluster. Rate limits with a key can be changed while the data
+stream is running, see :func:`set_rate_limit`.
+"""
+
+import threading
+from time import monotonic, sleep
+
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_jobs.logging.jobs import EMPTY_JOB_CTX, job_context
+
+CACHE_KEY_PREFIX = "vocabularies:datastreams:rate-limit:"
+"""Prefix of the cache keys holding the rates set at runtime."""
+
+
+def set_rate_limit(key, rate):
+    """Change the rate of the running rate limits with the given key.
+
+    The new rate is picked up by the rate limits within their refresh interval.
+
+    :param key: key of the rate limit, by default the id of the job.
+    :param rate: entries per second, ``0`` to remove the limit, or ``None`` to
+        go back to the configured rate.
+    """
+    if rate is None:
+        current_cache.delete(CACHE_KEY_PREFIX + key)
+    else:
+        current_cache.set(CACHE_KEY_PREFIX + key, rate, timeout=0)
+
+
+class TokenBucket:
+    """Rate limit based on a token bucket.
+
+    The bucket is refilled at ``rate`` tokens per second, up to ``burst``
+    tokens. Taking more tokens than available waits until the missing ones are
+    refilled: over time, at most ``rate`` tokens are taken per second, with
+    bursts of up to ``burst`` tokens.
+
+    When the bucket has a ``key``, its rate is refreshed every
+    ``refresh_interval`` seconds. It is read from the cache (see
+    :func:`set_rate_limit`), then from ``VOCABULARIES_DATASTREAM_RATE_LIMITS``,
+    and defaults to the given rate.
+    """
+
+    def __init__(self, rate=None, burst=None, key=None, refresh_interval=10):
+        """Constructor.
+
+        :param rate: tokens (i.e. entries) per second. No limit when not set.
+        :param burst: maximum number of tokens in the bucket, defaults to one
+            second worth of tokens.
+        :param key: key to change the rate at runtime.
+        :param refresh_interval: seconds between two reads of the rate of the
+            key, also the longest a wait lasts before re-reading it.
+        """
+        self.default_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.key = key
+        self.refresh_interval = refresh_interval
+        self._tokens = self.capacity
+        self._last = monotonic()
+        self._refreshed = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        """Maximum number of tokens in the bucket."""
+        if self.burst is not None:
+            return self.burst
+        return max(self.rate or 0, 1)
+
+    def refresh(self):
+        """Read the current rate of the key."""
+        rate = current_cache.get(CACHE_KEY_PREFIX + self.key)
+        if rate is None:
+            rate_limits = current_app.config.get(
+                "VOCABULARIES_DATASTREAM_RATE_LIMITS", {}
+            )
+            rate = rate_limits.get(self.key, self.default_rate)
+        if rate != self.rate:
+            current_app.logger.info(
+                "Rate limit %s set to %s entries per second", self.key, rate
+            )
+            self.rate = rate
+
+    def _refill(self):
+        """Add the tokens refilled since the last call."""
+        now = monotonic()
+        if self.rate:
+            refilled = self._tokens + (now - self._last) * self.rate
+            self._tokens = min(self.capacity, refilled)
+        self._last = now
+        # The elapsed time is refilled at the previous rate
+        if self.key and (
+            self._refreshed is None or now - self._refreshed >= self.refresh_interval
+        ):
+            self.refresh()
+            self._refreshed = now
+        if not self.rate:
+            self._tokens = self.capacity
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, waiting for them if needed.
+
+        :returns: the time waited, in seconds.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            waited = 0.0
+            while self._tokens < 0 and self.rate:
+                # Wait at most a refresh interval, the rate might change
+                wait = min(-self._tokens / self.rate, self.refresh_interval)
+                sleep(wait)
+                waited += wait
+                self._refill()
+            return waited
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the rate limit of a data stream configuration.
+
+        ``config["rate_limit"]`` is either the rate, ``True`` (the rate is only
+        read from the key) or a dictionary with the constructor arguments, e.g.
+        ``{"rate": 100, "burst": 1000}``. When running in a job, the key
+        defaults to the id of the job.
+        """
+        options = config.get("rate_limit")
+        if isinstance(options, dict):
+            options = dict(options)
+        elif options is True:
+            options = {}
+        else:
+            options = {"rate": options}
+        if not options.get("key") and job_context.get() is not EMPTY_JOB_CTX:
+            options["key"] = str(job_context.get()["job_id"])
+        return cls(**options)
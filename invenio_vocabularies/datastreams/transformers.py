@@ -20,6 +20,37 @@ except ImportError:
 class BaseTransformer(ABC):
     """Base transformer."""
 
+    compact_entry = None
+    """Class of the compact transformed entries, see :class:`CompactEntry`."""
+
+    compact = False
+
+    accepts_compact = False
+    """Whether the transformer takes compact entries, which are read-only.
+
+    The compact entries of the previous transformers are converted to
+    dictionaries before being given to the other transformers.
+    """
+
+    def __init__(self, *args, compact=False, **kwargs):
+        """Constructor.
+
+        :param compact: if True, the transformed entries are stored as
+            ``compact_entry`` instances instead of dictionaries.
+        """
+        if compact and self.compact_entry is None:
+            raise ValueError(
+                f"{self.__class__.__name__} does not support compact entries."
+            )
+        self.compact = compact
+        super().__init__(*args, **kwargs)
+
+    def _compact(self, entry):
+        """Convert a transformed entry to a compact entry, if enabled."""
+        if self.compact:
+            return self.compact_entry.from_dict(entry)
+        return entry
+
     @abstractmethod
     def apply(self, stream_entry, *args, **kwargs):
         """Applies the transformation to the entry.
@@ -29,6 +60,24 @@ class BaseTransformer(ABC):
         """
         pass
 
+    def apply_many(self, stream_entries, *args, **kwargs):
+        """Applies the transformation to a batch of entries.
+
+        Transformers can override it to amortize work across the batch, e.g.
+        to do bulk lookups instead of one per entry.
+
+        :returns: A list of StreamEntry, in the same order as the given ones.
+                  The errors of an entry are added to its ``errors``.
+        """
+        transformed_entries = []
+        for stream_entry in stream_entries:
+            try:
+                stream_entry = self.apply(stream_entry, *args, **kwargs)
+            except TransformerError as err:
+                stream_entry.errors.append(f"{self.__class__.__name__}: {str(err)}")
+            transformed_entries.append(stream_entry)
+        return transformed_entries
+
 
 class XMLTransformer(BaseTransformer):
     """XML transformer."""
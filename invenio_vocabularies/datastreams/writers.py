@@ -15,9 +15,11 @@ from invenio_records_resources.proxies import current_service_registry
 from marshmallow import ValidationError
 from sqlalchemy.exc import NoResultFound
 
+from .compact import as_dict, pack_entries
 from .datastreams import StreamEntry
 from .errors import WriterError
 from .tasks import write_entry, write_many_entry
+from .throttling import TokenBucket
 
 
 class BaseWriter(ABC):
@@ -55,7 +57,14 @@ class ServiceWriter(BaseWriter):
     """Writes the entries to an RDM instance using a Service object."""
 
     def __init__(
-        self, service_or_name, *args, identity=None, insert=True, update=False, **kwargs
+        self,
+        service_or_name,
+        *args,
+        identity=None,
+        insert=True,
+        update=False,
+        coalesce=False,
+        **kwargs,
     ):
         """Constructor.
 
@@ -64,6 +73,8 @@ class ServiceWriter(BaseWriter):
         :param identity: access identity.
         :param insert: if True it will insert records which do not exist.
         :param update: if True it will update records if they exist.
+        :param coalesce: if True, only the last of the entries with the same
+                         id is written by ``write_many``.
         """
         if isinstance(service_or_name, str):
             service_or_name = current_service_registry.get(service_or_name)
@@ -72,6 +83,7 @@ class ServiceWriter(BaseWriter):
         self._identity = identity or system_identity
         self._insert = insert
         self._update = update
+        self._coalesce = coalesce
 
         super().__init__(*args, **kwargs)
 
@@ -84,18 +96,18 @@ class ServiceWriter(BaseWriter):
 
     def _do_update(self, entry):
         vocab_id = self._entry_id(entry)
-        current_app.logger.debug(f"Resolving entry with ID: {vocab_id}")
+        current_app.logger.debug("Resolving entry with ID: %s", vocab_id)
         current = self._resolve(vocab_id)
         updated = dict(current.to_dict(), **entry)
-        current_app.logger.debug(f"Updating entry with ID: {vocab_id}")
+        current_app.logger.debug("Updating entry with ID: %s", vocab_id)
         return StreamEntry(
             self._service.update(self._identity, vocab_id, updated), op_type="update"
         )
 
     def write(self, stream_entry, *args, **kwargs):
         """Writes the input entry using a given service."""
-        entry = stream_entry.entry
-        current_app.logger.debug(f"Writing entry: {entry}")
+        entry = as_dict(stream_entry.entry)
+        current_app.logger.debug("Writing entry: %s", entry)
 
         try:
             if self._insert:
@@ -127,8 +139,8 @@ class ServiceWriter(BaseWriter):
 
     def write_many(self, stream_entries, *args, **kwargs):
         """Writes the input entries using a given service."""
-        current_app.logger.info(f"Writing {len(stream_entries)} entries")
-        entries = [entry.entry for entry in stream_entries]
+        current_app.logger.info("Writing %s entries", len(stream_entries))
+        entries = [as_dict(entry.entry) for entry in stream_entries]
         entries_with_id = []
         entries_without_id = []
         for entry in entries:
@@ -143,11 +155,26 @@ class ServiceWriter(BaseWriter):
                 len(entries_without_id),
                 entries_without_id,
             )
+        stream_entries_processed = []
+        if self._coalesce:
+            last_entries = {}
+            for id_, entry in entries_with_id:
+                previous = last_entries.pop(id_, None)
+                if previous is not None:
+                    superseded_stream_entry = StreamEntry(entry=previous)
+                    superseded_stream_entry.filtered = True
+                    stream_entries_processed.append(superseded_stream_entry)
+                last_entries[id_] = entry
+            entries_with_id = list(last_entries.items())
+            current_app.logger.debug(
+                "Coalesced %s entries with the same ID", len(stream_entries_processed)
+            )
+
         result_list = self._service.create_or_update_many(
             self._identity, entries_with_id
         )
-        stream_entries_processed = []
-        for entry, result in zip(entries, result_list.results):
+        written_entries = [entry for _, entry in entries_with_id]
+        for entry, result in zip(written_entries, result_list.results):
             processed_stream_entry = StreamEntry(
                 entry=entry,
                 record=result.record,
@@ -158,7 +185,7 @@ class ServiceWriter(BaseWriter):
             processed_stream_entry.log_errors()
             stream_entries_processed.append(processed_stream_entry)
 
-        current_app.logger.debug(f"Finished writing {len(stream_entries)} entries")
+        current_app.logger.debug("Finished writing %s entries", len(stream_entries))
         return stream_entries_processed
 
 
@@ -179,7 +206,7 @@ class YamlWriter(BaseWriter):
         with open(self._filepath, "a") as file:
             # made into array for safer append
             # will always read array (good for reader)
-            yaml.safe_dump([stream_entry.entry], file, allow_unicode=True)
+            yaml.safe_dump([as_dict(stream_entry.entry)], file, allow_unicode=True)
 
         return stream_entry
 
@@ -187,43 +214,68 @@ class YamlWriter(BaseWriter):
         """Writes the yaml input entries."""
         with open(self._filepath, "a") as file:
             yaml.safe_dump(
-                [stream_entry.entry for stream_entry in stream_entries],
+                [as_dict(stream_entry.entry) for stream_entry in stream_entries],
                 file,
                 allow_unicode=True,
             )
 
+        return stream_entries
+
 
 class AsyncWriter(BaseWriter):
     """Writes the entries asynchronously (celery task)."""
 
     is_async = True
 
-    def __init__(self, writer, *args, **kwargs):
+    fingerprints = None
+    """Fingerprints configuration, stored by the tasks once written."""
+
+    def __init__(self, writer, rate_limit=None, *args, **kwargs):
         """Constructor.
 
         :param writer: writer to use.
+        :param rate_limit: maximum number of entries per second for which
+            tasks are launched, or a dictionary with the rate limit options
+            (see :meth:`TokenBucket.from_config`).
         """
         super().__init__(*args, **kwargs)
         self._writer = writer
+        self._rate_limit = None
+        if rate_limit:
+            self._rate_limit = TokenBucket.from_config({"rate_limit": rate_limit})
 
     def write(self, stream_entry, subtask_run_id=None, *args, **kwargs):
         """Launches a celery task to write an entry with a delay."""
+        if self._rate_limit is not None:
+            self._rate_limit.acquire()
         # Add some delay to avoid processing the tasks too fast
         write_entry.apply_async(
-            args=(self._writer, stream_entry.entry, subtask_run_id), countdown=1
+            args=(self._writer, as_dict(stream_entry.entry), subtask_run_id),
+            kwargs={"fingerprints": self.fingerprints} if self.fingerprints else None,
+            countdown=1,
         )
 
         return stream_entry
 
     def write_many(self, stream_entries, subtask_run_id=None, *args, **kwargs):
-        """Launches a celery task to write entries with a delay."""
+        """Launches a celery task to write entries with a delay.
+
+        Compact entries are sent packed (see :func:`pack_entries`).
+        """
+        if self._rate_limit is not None:
+            self._rate_limit.acquire(len(stream_entries))
+        entry_type, entries = pack_entries(
+            [stream_entry.entry for stream_entry in stream_entries]
+        )
+        kwargs = {}
+        if entry_type:
+            kwargs["entry_type"] = entry_type
+        if self.fingerprints:
+            kwargs["fingerprints"] = self.fingerprints
         # Add some delay to avoid processing the tasks too fast
         write_many_entry.apply_async(
-            args=(
-                self._writer,
-                [stream_entry.entry for stream_entry in stream_entries],
-                subtask_run_id,
-            ),
+            args=(self._writer, entries, subtask_run_id),
+            kwargs=kwargs or None,
             countdown=1,
         )
 
@@ -19,14 +19,7 @@ class VocabularyFixture:
 
     def _load_vocabulary(self, config, delay=True, **kwargs):
         """Given an entry from the vocabularies.yaml file, load its content."""
-        datastream = DataStreamFactory.create(
-            readers_config=config["readers"],
-            transformers_config=config.get("transformers"),
-            writers_config=config["writers"],
-            batch_size=config.get("batch_size", 1000),
-            run_subtasks=config.get("run_subtasks", True),
-            write_many=config.get("write_many", False),
-        )
+        datastream = DataStreamFactory.from_config(config)
 
         errors = []
         for result in datastream.process():
@@ -43,11 +43,11 @@ class ProcessRORAffiliationsJob(ProcessDataStreamJob):
             "config": {
                 "readers": [
                     {
-                        "args": {"since": since},
+                        "args": {"since": since, "range_requests": True},
                         "type": "ror-http",
                     },
                     {"args": {"regex": "-ror-data\\.json$"}, "type": "zip"},
-                    {"type": "json"},
+                    {"type": "json-stream"},
                 ],
                 "writers": [
                     {
@@ -81,11 +81,11 @@ class ProcessRORFundersJob(ProcessDataStreamJob):
             "config": {
                 "readers": [
                     {
-                        "args": {"since": since},
+                        "args": {"since": since, "range_requests": True},
                         "type": "ror-http",
                     },
                     {"args": {"regex": "-ror-data\\.json$"}, "type": "zip"},
-                    {"type": "json"},
+                    {"type": "json-stream"},
                 ],
                 "writers": [
                     {
@@ -103,6 +103,62 @@ class ProcessRORFundersJob(ProcessDataStreamJob):
         }
 
 
+class ProcessRORJob(ProcessDataStreamJob):
+    """Process ROR affiliations and funders datastream registered task."""
+
+    description = _("Process ROR affiliations and funders")
+    title = _("Load ROR affiliations and funders")
+    id = "process_ror"
+
+    @classmethod
+    def build_task_arguments(cls, job_obj, since=None, **kwargs):
+        """Process ROR affiliations and funders from a single download."""
+        # NOTE: Update is set to False for now given we don't have the logic to re-index dependent records yet.
+        # Since jobs support custom args, update true can be passed via that.
+        return {
+            "config": {
+                "readers": [
+                    {
+                        "args": {"since": since, "range_requests": True},
+                        "type": "ror-http",
+                    },
+                    {"args": {"regex": "-ror-data\\.json$"}, "type": "zip"},
+                    {"type": "json-stream"},
+                ],
+                "branches": {
+                    "affiliations": {
+                        "transformers": [{"type": "ror-affiliations"}],
+                        "writers": [
+                            {
+                                "args": {
+                                    "writer": {
+                                        "type": "affiliations-service",
+                                        "args": {"update": False},
+                                    }
+                                },
+                                "type": "async",
+                            }
+                        ],
+                    },
+                    "funders": {
+                        "transformers": [{"type": "ror-funders"}],
+                        "writers": [
+                            {
+                                "args": {
+                                    "writer": {
+                                        "type": "funders-service",
+                                        "args": {"update": False},
+                                    }
+                                },
+                                "type": "async",
+                            }
+                        ],
+                    },
+                },
+            }
+        }
+
+
 class ImportAwardsOpenAIREJob(ProcessDataStreamJob):
     """Import awards from OpenAIRE registered task."""
 
@@ -121,12 +177,13 @@ class ImportAwardsOpenAIREJob(ProcessDataStreamJob):
                         "args": {
                             "origin": "diff",
                             "tar_hrefs": ["/project.tar", "/projects.tar"],
+                            "stream": True,
                         },
                     },
                     {
                         "type": "tar",
                         "args": {
-                            "mode": "r",
+                            "mode": "r|",
                             "regex": "\\.json.gz$",
                         },
                     },
@@ -154,7 +211,10 @@ class UpdateAwardsCordisJob(ProcessDataStreamJob):
         return {
             "config": {
                 "readers": [
-                    {"args": {"origin": "HE"}, "type": "cordis-project-http"},
+                    {
+                        "args": {"origin": "HE", "spool": True},
+                        "type": "cordis-project-http",
+                    },
                     {"args": {"mode": "r", "regex": "\\.xml$"}, "type": "zip"},
                     {"args": {"root_element": "project"}, "type": "xml"},
                 ],
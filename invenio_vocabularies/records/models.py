@@ -83,3 +83,17 @@ class VocabularyScheme(db.Model):
             obj = cls(**data)
             db.session.add(obj)
         return obj
+
+
+class VocabularyFingerprint(db.Model):
+    """Fingerprint of the last imported version of a vocabulary entry.
+
+    Used by the data streams to skip the entries which did not change since
+    the last import.
+    """
+
+    __tablename__ = "vocabularies_fingerprints"
+
+    vocabulary = db.Column(db.String(255), primary_key=True)
+    id = db.Column(db.String(255), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
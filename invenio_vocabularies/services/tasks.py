@@ -3,35 +3,130 @@
 
 """Celery tasks."""
 
-from celery import shared_task
+from collections import Counter
+
+from celery import group, shared_task
 from flask import current_app
+from invenio_access.permissions import system_identity
 from invenio_jobs.errors import TaskExecutionPartialError
+from invenio_jobs.logging.jobs import EMPTY_JOB_CTX, job_context
+from invenio_jobs.proxies import current_runs_service
 
+from ..datastreams.deadletters import DeadLetters
 from ..datastreams.factories import DataStreamFactory
+from ..datastreams.metrics import emit_metrics
+from ..datastreams.sharding import shard_configs
 
 
-@shared_task(ignore_result=True)
-def process_datastream(config):
-    """Process a datastream from config."""
-    ds = DataStreamFactory.create(
-        readers_config=config["readers"],
-        transformers_config=config.get("transformers"),
-        writers_config=config["writers"],
-        batch_size=config.get("batch_size", 1000),
-        run_subtasks=config.get("run_subtasks", True),
-        write_many=config.get("write_many", False),
-    )
-    entries_with_errors = 0
-    for result in ds.process():
-        if result.errors:
-            current_app.logger.warning(
-                "Skipped entry with errors: %s",
-                result.errors,
-            )
-            entries_with_errors += 1
+def _process_datastream(config):
+    """Process a datastream from config.
+
+    :returns: a counter of the processed entries, by operation type
+        (``create``, ``update``) and ``errored``.
+    """
+    ds = DataStreamFactory.from_config(config)
+    counts = Counter()
+    try:
+        for result in ds.process():
+            if result.errors:
+                current_app.logger.warning(
+                    "Skipped entry with errors: %s",
+                    result.errors,
+                )
+                counts["errored"] += 1
+            elif result.op_type:
+                counts[result.op_type] += 1
+    finally:
+        if ds.metrics is not None:
+            emit_metrics(ds.metrics)
+    return counts
 
+
+def _raise_partial_error(entries_with_errors):
+    """Raise a partial error if there were entries with errors."""
     if entries_with_errors:
         raise TaskExecutionPartialError(
             message=f"Task execution partially succeeded with {entries_with_errors} entries with errors.",
             errored_entries_count=entries_with_errors,
         )
+
+
+def _dispatch_shards(config):
+    """Process the shards of a datastream in a group of tasks.
+
+    When running in a job, each shard reports its progress in a subtask run.
+    """
+    job_ctx = job_context.get()
+    tasks = []
+    for shard_config in shard_configs(config):
+        subtask_run_id = None
+        if job_ctx is not EMPTY_JOB_CTX:
+            subtask_run = current_runs_service.create_subtask_run(
+                system_identity,
+                parent_run_id=job_ctx["run_id"],
+                job_id=job_ctx["job_id"],
+            )
+            subtask_run_id = str(subtask_run.id)
+        tasks.append(process_datastream_shard.s(shard_config, subtask_run_id))
+    current_app.logger.info("Dispatching %s datastream shards", len(tasks))
+    return group(tasks).apply_async()
+
+
+@shared_task(ignore_result=True)
+def process_datastream(config):
+    """Process a datastream from config.
+
+    Sharded datastreams (i.e. with ``shards`` in the config) are split and
+    their shards processed in parallel tasks.
+    """
+    if config.get("shards"):
+        _dispatch_shards(config)
+        return
+    _raise_partial_error(_process_datastream(config)["errored"])
+
+
+@shared_task(ignore_result=True)
+def process_datastream_shard(config, subtask_run_id=None):
+    """Process a shard of a datastream from config."""
+    job_ctx = job_context.get()
+    job_id = job_ctx.get("job_id", None) if job_ctx is not EMPTY_JOB_CTX else None
+    report = bool(subtask_run_id and job_id)
+    if report:
+        current_runs_service.start_processing_subtask(
+            system_identity, subtask_run_id, job_id=job_id
+        )
+
+    try:
+        counts = _process_datastream(config)
+    except Exception:
+        if report:
+            current_runs_service.finalize_subtask(
+                system_identity, subtask_run_id, job_id, success=False
+            )
+        raise
+
+    if report:
+        current_runs_service.finalize_subtask(
+            system_identity,
+            subtask_run_id,
+            job_id,
+            success=not counts["errored"],
+            errored_entries_count=counts["errored"],
+            inserted_entries_count=counts["create"],
+            updated_entries_count=counts["update"],
+        )
+    _raise_partial_error(counts["errored"])
+
+
+@shared_task(ignore_result=True)
+def replay_datastream(config):
+    """Replay the dead letters of a datastream from config.
+
+    The entries failing again are stored as new dead letters.
+    """
+    dead_letters = DeadLetters.from_config(config)
+    entries_with_errors = 0
+    for replay_config in dead_letters.replay_configs(config):
+        entries_with_errors += _process_datastream(replay_config)["errored"]
+    dead_letters.clear_replayed()
+    _raise_partial_error(entries_with_errors)
@@ -3,13 +3,21 @@
 
 """OpenAIRE-related Datastreams Readers/Writers/Transformers tests."""
 
+import gzip
 import io
+import json
+import tarfile
 from unittest.mock import patch
 
 import pytest
 
 from invenio_vocabularies.contrib.common.openaire.datastreams import OpenAIREHTTPReader
 from invenio_vocabularies.datastreams.errors import ReaderError
+from invenio_vocabularies.datastreams.readers import (
+    GzipReader,
+    JsonLinesReader,
+    TarReader,
+)
 
 API_JSON_RESPONSE_CONTENT = {
     "linkset": [
@@ -82,6 +90,24 @@ class MockResponse:
         pass
 
 
+class MockRawBody(io.RawIOBase):
+    def __init__(self, content):
+        self._content = io.BytesIO(content)
+        self.decode_content = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._content.readinto(buffer)
+
+
+class MockStreamResponse(MockResponse):
+    def __init__(self, api_json_response_content, raw_content=None):
+        super().__init__(api_json_response_content)
+        self.raw = MockRawBody(raw_content or b"")
+
+
 @pytest.fixture(scope="function")
 def download_file_bytes_content():
     return DOWNLOAD_FILE_BYTES_CONTENT
@@ -136,3 +162,34 @@ def test_openaire_http_reader_iter_not_implemented():
     reader = OpenAIREHTTPReader()
     with pytest.raises(NotImplementedError):
         reader._iter("A fake file pointer")
+
+
+def test_openaire_http_reader_stream():
+    entries = [{"id": idx} for idx in range(3)]
+    member = gzip.compress(
+        "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+    )
+    tar_content = io.BytesIO()
+    with tarfile.open(fileobj=tar_content, mode="w") as archive:
+        info = tarfile.TarInfo("project/part-0.json.gz")
+        info.size = len(member)
+        archive.addfile(info, io.BytesIO(member))
+
+    def get(url, headers=None, stream=False, **kwargs):
+        assert stream or not url.endswith(".tar")
+        return MockStreamResponse(API_JSON_RESPONSE_CONTENT, tar_content.getvalue())
+
+    with patch("requests.Session.get", side_effect=get):
+        reader = OpenAIREHTTPReader(
+            origin="full", tar_hrefs=["/project.tar"], stream=True
+        )
+        tar_reader = TarReader(mode="r|", regex="\\.json.gz$")
+        results = [
+            entry
+            for body in reader.read()
+            for member_fp in tar_reader.read(body)
+            for gz_fp in GzipReader().read(member_fp)
+            for entry in JsonLinesReader().read(gz_fp)
+        ]
+
+    assert results == entries
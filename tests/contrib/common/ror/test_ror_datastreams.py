@@ -10,6 +10,7 @@ import pytest
 from flask import Flask
 
 from invenio_vocabularies.contrib.common.ror.datastreams import (
+    ROREntry,
     RORHTTPReader,
     RORTransformer,
 )
@@ -177,6 +178,22 @@ def test_ror_http_reader(_):
     assert results[0].read() == DOWNLOAD_FILE_BYTES_CONTENT
 
 
+@patch("requests.Session.close")
+@patch("requests.Session.get", side_effect=side_effect)
+def test_ror_http_reader_session(get, close):
+    reader = RORHTTPReader()
+    app = Flask("testapp")
+    with app.app_context():
+        entries = reader.read()
+        next(entries)
+        close.assert_not_called()
+        assert next(entries, None) is None
+
+    # the DOI, the linkset and the file requested in the session of the reader
+    assert get.call_count == 3
+    close.assert_called_once()
+
+
 @patch("requests.Session.get", side_effect=side_effect)
 def test_ror_http_reader_since_before_publish(_):
     reader = RORHTTPReader(since="2024-07-10T00:00:00.000+00:00")
@@ -240,3 +257,48 @@ def test_ror_http_reader_iter_not_implemented():
 def test_ror_transformer(app, dict_ror_entry, expected_from_ror_json):
     transformer = RORTransformer()
     assert expected_from_ror_json == transformer.apply(dict_ror_entry).entry
+
+
+def test_ror_transformer_compact(app, dict_ror_entry, expected_from_ror_json):
+    transformer = RORTransformer(compact=True)
+    entry = transformer.apply(dict_ror_entry).entry
+    assert isinstance(entry, ROREntry)
+    assert entry.to_dict() == expected_from_ror_json
+    assert ROREntry.unpack(entry.pack()) == expected_from_ror_json
+
+
+class MockStreamResponse(MockResponse):
+    def __init__(self, api_json_response_content, stream=False):
+        super().__init__(api_json_response_content)
+        self.stream = stream
+
+    def iter_content(self, chunk_size=1):
+        for idx in range(0, len(self.content), chunk_size):
+            yield self.content[idx : idx + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def stream_side_effect(url, headers=None, allow_redirects=False, stream=False):
+    response = side_effect(url, headers=headers, allow_redirects=allow_redirects)
+    return MockStreamResponse(response.api_json_response_content, stream=stream)
+
+
+@patch("requests.Session.get", side_effect=stream_side_effect)
+def test_ror_http_reader_spool(_, tmp_path):
+    app = Flask("testapp")
+    app.config["VOCABULARIES_DATASTREAM_SPOOL_DIR"] = str(tmp_path)
+    with app.app_context():
+        reader = RORHTTPReader(spool=True)
+        results = reader.read()
+        fp = next(results)
+        assert not isinstance(fp, io.BytesIO)
+        assert fp.read() == DOWNLOAD_FILE_BYTES_CONTENT
+        assert list(results) == []
+
+    assert fp.closed
+    assert list(tmp_path.iterdir()) == []
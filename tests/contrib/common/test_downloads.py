@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Download cache tests."""
+
+import hashlib
+
+import pytest
+
+from invenio_vocabularies.contrib.common.utils import (
+    DownloadCache,
+    DownloadChecksumError,
+)
+
+
+class MockResponse:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size=1):
+        for idx in range(0, len(self.content), chunk_size):
+            yield self.content[idx : idx + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class MockSession:
+    def __init__(self, content, etag='"v1"'):
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        self.requests.append(headers or {})
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return MockResponse(b"", status_code=304)
+        return MockResponse(
+            self.content,
+            headers={"ETag": self.etag, "Content-Length": str(len(self.content))},
+        )
+
+
+def test_download_cache_revalidation(app, tmp_path):
+    cache = DownloadCache(tmp_path, chunk_size=4)
+    session = MockSession(b"the content of the file")
+
+    path = cache.fetch("https://example.org/file", session=session)
+    assert path.read_bytes() == b"the content of the file"
+    assert path.name == hashlib.sha256(b"the content of the file").hexdigest()
+
+    # not modified, served from the cache
+    assert cache.fetch("https://example.org/file", session=session) == path
+    assert session.requests[-1] == {"If-None-Match": '"v1"'}
+
+    # modified, downloaded again and the previous file removed
+    session.content, session.etag = b"new content", '"v2"'
+    new_path = cache.fetch("https://example.org/file", session=session)
+    assert new_path.read_bytes() == b"new content"
+    assert not path.exists()
+
+
+def test_download_cache_checksum(app, tmp_path):
+    cache = DownloadCache(tmp_path)
+    session = MockSession(b"content")
+    checksum = "md5:" + hashlib.md5(b"content").hexdigest()
+
+    path = cache.fetch("https://example.org/file", session=session, checksum=checksum)
+    assert path.read_bytes() == b"content"
+    # a known checksum is not revalidated
+    assert cache.fetch("https://example.org/file", session, checksum) == path
+    assert len(session.requests) == 1
+
+    with pytest.raises(DownloadChecksumError):
+        cache.fetch("https://example.org/other", session, "md5:0123")
+    assert cache.lookup("https://example.org/other") is None
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+def test_download_cache_shared_file(app, tmp_path):
+    cache = DownloadCache(tmp_path)
+    session = MockSession(b"shared content")
+
+    path = cache.fetch("https://example.org/file", session=session)
+    assert cache.fetch("https://example.org/mirror", session=session) == path
+
+    # the file changed on one URL only, and is still used by the other one
+    session.content, session.etag = b"new content", '"v2"'
+    cache.fetch("https://example.org/file", session=session)
+    assert path.read_bytes() == b"shared content"
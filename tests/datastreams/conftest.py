@@ -37,6 +37,14 @@ class TestReader(BaseReader):
         yield from self._iter(fp=self._origin, *args, **kwargs)
 
 
+class TestNestedReader(BaseReader):
+    """Test reader yielding the values of the piped item."""
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yields the values in the item."""
+        yield from fp
+
+
 class TestTransformer(BaseTransformer):
     """Test transformer."""
 
@@ -85,6 +93,7 @@ def app_config(app_config):
     app_config["VOCABULARIES_DATASTREAM_READERS"] = {
         **VOCABULARIES_DATASTREAM_READERS,
         "test": TestReader,
+        "test-nested": TestNestedReader,
     }
     app_config["VOCABULARIES_DATASTREAM_TRANSFORMERS"] = {
         **VOCABULARIES_DATASTREAM_TRANSFORMERS,
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams batching tests."""
+
+import time
+
+from invenio_vocabularies.datastreams.batching import AdaptiveBatchSize
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.readers import BaseReader
+
+
+def test_adaptive_batch_size():
+    batch_size = AdaptiveBatchSize(min_size=10, max_size=1000, target_latency=1)
+    batch_size.size = 100
+
+    # fast writes grow the batch, at most doubling it
+    assert batch_size.update(100, latency=0.01) == 200
+    # slow writes shrink the batch, at most halving it
+    assert batch_size.update(200, latency=1.6) == 125
+    assert batch_size.update(125, latency=10) == 62
+    # too many errors halve the batch
+    assert batch_size.update(62, latency=0.01, errors=20) == 31
+    # the size stays within bounds
+    assert batch_size.update(31, latency=100) == 15
+    assert batch_size.update(15, latency=100) == 10
+    batch_size.size = 1000
+    assert batch_size.update(1000, latency=0.01) == 1000
+
+
+def test_adaptive_batch_size_from_config():
+    assert AdaptiveBatchSize.from_config({"adaptive_batch_size": True}).min_size == 10
+    batch_size = AdaptiveBatchSize.from_config(
+        {"adaptive_batch_size": {"min_size": 5, "target_latency": 2}}
+    )
+    assert batch_size.min_size == 5
+    assert batch_size.target_latency == 2
+
+
+def test_datastream_adaptive_batch_size(app):
+    entries = list(range(100))
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": entries}}],
+        writers_config=[{"type": "test"}],
+        batch_size=5,
+        adaptive_batch_size=AdaptiveBatchSize(min_size=2, max_size=40),
+    )
+
+    batch_sizes = []
+    original_process_batch = datastream.process_batch
+
+    def process_batch(batch):
+        batch_sizes.append(len(batch))
+        return original_process_batch(batch)
+
+    datastream.process_batch = process_batch
+    results = list(datastream.process())
+
+    assert [r.entry for r in results] == entries
+    # the test writer is fast, so the batches grow up to the maximum size
+    assert batch_sizes[:4] == [5, 10, 20, 40]
+    assert max(batch_sizes) == 40
+
+
+def test_datastream_adaptive_batch_size_async_writer(app, caplog):
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": [1]}}],
+        writers_config=[{"type": "async", "args": {"writer": {"type": "test"}}}],
+        batch_size=5,
+        adaptive_batch_size=AdaptiveBatchSize(min_size=2, max_size=40),
+    )
+
+    assert datastream.adaptive_batch_size is None
+    assert datastream.batch_size == 5
+    assert "Ignoring the adaptive batch size" in caplog.text
+
+
+class SlowReader(BaseReader):
+    """Reader pausing before the last entry."""
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yields the values in the origin, pausing before the last one."""
+        *entries, last = fp
+        yield from entries
+        time.sleep(0.5)
+        yield last
+
+    def read(self, item=None, *args, **kwargs):
+        """Reads from the origin."""
+        yield from self._iter(fp=self._origin, *args, **kwargs)
+
+
+def test_datastream_max_batch_latency(app):
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": []}}],
+        writers_config=[{"type": "test"}],
+        batch_size=10,
+        max_batch_latency=0.1,
+    )
+    datastream._readers = [SlowReader(origin=[1, 2, 3, 4])]
+
+    batch_sizes = []
+    original_process_batch = datastream.process_batch
+
+    def process_batch(batch):
+        batch_sizes.append(len(batch))
+        return original_process_batch(batch)
+
+    datastream.process_batch = process_batch
+    results = list(datastream.process())
+
+    assert [r.entry for r in results] == [1, 2, 3, 4]
+    # the first entries are flushed before the slow one is read
+    assert batch_sizes == [3, 1]
@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams stage cache tests."""
+
+import json
+
+import pytest
+
+from invenio_vocabularies.datastreams import StreamEntry, caching
+from invenio_vocabularies.datastreams.caching import StageCache, cache_key
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+
+
+@pytest.fixture()
+def jsonl_file(tmp_path):
+    """JSON lines file of 10 entries."""
+    filename = tmp_path / "entries.jsonl"
+    with open(filename, "w") as fp:
+        for idx in range(10):
+            fp.write(json.dumps({"id": idx}) + "\n")
+    return filename
+
+
+def _process(readers_config, cache, transformers_config=None):
+    datastream = DataStreamFactory.create(
+        readers_config=readers_config,
+        transformers_config=transformers_config,
+        writers_config=[{"type": "test"}],
+        batch_size=3,
+        cache=cache,
+    )
+    return list(datastream.process())
+
+
+def test_cache_key(jsonl_file):
+    config = {"readers": [{"type": "jsonl", "args": {"origin": str(jsonl_file)}}]}
+    key = cache_key(config)
+    assert key == cache_key(dict(config, writers=[{"type": "test"}]))
+    assert key != cache_key(dict(config, transformers=[{"type": "test"}]), "transform")
+
+    with open(jsonl_file, "a") as fp:
+        fp.write(json.dumps({"id": 10}) + "\n")
+    assert key != cache_key(config)
+
+
+def test_read_stage_cache(app, tmp_path, jsonl_file):
+    config = {"readers": [{"type": "jsonl", "args": {"origin": str(jsonl_file)}}]}
+    cache = StageCache(cache_key(config), directory=tmp_path / "cache")
+    assert not cache.exists()
+
+    results = _process(config["readers"], cache)
+    assert [r.entry["id"] for r in results] == list(range(10))
+    assert cache.exists()
+
+    # the next runs read the cache instead of the readers
+    results = _process([{"type": "test", "args": {"origin": []}}], cache)
+    assert [r.entry["id"] for r in results] == list(range(10))
+    assert [r.cursor for r in results] == [(idx,) for idx in range(10)]
+
+
+def test_transform_stage_cache(app, tmp_path):
+    cache = StageCache("test", stage="transform", directory=tmp_path)
+    readers_config = [{"type": "test", "args": {"origin": [1, -1, 2, 3]}}]
+    transformers_config = [{"type": "test"}]
+
+    results = _process(readers_config, cache, transformers_config)
+    assert [r.entry for r in results] == [-1, 2, 3, 4]  # errors come first
+    assert cache.exists()
+
+    # the entries with errors are not cached, the others are not transformed
+    results = _process(readers_config, cache, transformers_config)
+    assert [r.entry for r in results] == [2, 3, 4]
+    assert not any(r.errors for r in results)
+
+
+def test_interrupted_run_not_cached(app, tmp_path):
+    cache = StageCache("test", directory=tmp_path)
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": [1, 2, 3]}}],
+        writers_config=[{"type": "test"}],
+        batch_size=1,
+        cache=cache,
+    )
+    results = datastream.process()
+    next(results)
+    results.close()
+
+    assert not cache.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_shared_objects(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(caching, "SEGMENT_ENTRIES", 4)
+    graph = {"triples": list(range(10000))}  # e.g. the graph of the RDF readers
+    cache = StageCache("test", directory=tmp_path)
+    writer = cache.writer()
+    writer.add_many(
+        StreamEntry({"subject": idx, "graph": graph}, cursor=(idx,))
+        for idx in range(10)
+    )
+    writer.commit()
+
+    entries = [entry for _, entry in cache.load()]
+    assert [entry["subject"] for entry in entries] == list(range(10))
+    # the graph is loaded once per segment
+    assert entries[0]["graph"] == graph
+    assert entries[0]["graph"] is entries[3]["graph"]
+    assert entries[3]["graph"] is not entries[4]["graph"]
+    assert len({id(entry["graph"]) for entry in entries}) == 3
+
+
+def test_cache_remote_origin_max_age(app, jsonl_file):
+    local = {"readers": [{"type": "jsonl", "args": {"origin": str(jsonl_file)}}]}
+    remote = {"readers": [{"type": "ror-http"}], "cache": True}
+    assert StageCache.from_config(dict(local, cache=True)).max_age is None
+    assert StageCache.from_config(remote).max_age == 24 * 60 * 60
+    assert StageCache.from_config(dict(remote, cache={"max_age": None})).max_age is None
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams checkpoints tests."""
+
+from itertools import islice
+
+import pytest
+
+from invenio_vocabularies.datastreams.checkpoints import (
+    Checkpoint,
+    FileCheckpointStore,
+)
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+
+
+@pytest.fixture()
+def checkpoint_store(app, tmp_path):
+    """Checkpoint store in a temporary directory."""
+    return FileCheckpointStore(tmp_path)
+
+
+def _datastream(readers_config, checkpoint):
+    return DataStreamFactory.create(
+        readers_config=readers_config,
+        transformers_config=[{"type": "test"}],
+        writers_config=[{"type": "test"}],
+        batch_size=2,
+        checkpoint=checkpoint,
+    )
+
+
+def test_checkpoint_resume(app, checkpoint_store):
+    readers_config = [{"type": "test", "args": {"origin": [1, 2, 3, 4, 5]}}]
+
+    # process the first batch and stop (e.g. the worker is restarted)
+    checkpoint = Checkpoint("test", store=checkpoint_store)
+    stream = _datastream(readers_config, checkpoint).process()
+    assert [e.entry for e in islice(stream, 3)] == [2, 3, 4]
+    stream.close()
+    assert checkpoint_store.load("test") == (1,)
+
+    # the second batch was not committed, so it is processed again
+    checkpoint = Checkpoint("test", store=checkpoint_store)
+    entries = [e.entry for e in _datastream(readers_config, checkpoint).process()]
+    assert entries == [4, 5, 6]
+    # the run completed, so the checkpoint is cleared
+    assert checkpoint_store.load("test") is None
+
+
+def test_checkpoint_resume_nested_readers(app, checkpoint_store):
+    readers_config = [
+        {"type": "test", "args": {"origin": [[1, 2, 3], [4, 5], [6]]}},
+        {"type": "test-nested"},
+    ]
+    checkpoint_store.save("nested", (0, 2))
+
+    checkpoint = Checkpoint("nested", store=checkpoint_store)
+    entries = _datastream(readers_config, checkpoint).process()
+    assert [(e.entry, e.cursor) for e in entries] == [
+        (5, (1, 0)),
+        (6, (1, 1)),
+        (7, (2, 0)),
+    ]
+
+
+def test_checkpoint_key_from_config(app):
+    config = {"readers": [{"type": "test"}], "writers": [{"type": "test"}]}
+
+    assert Checkpoint.from_config(config).key == Checkpoint.from_config(config).key
+    assert Checkpoint.from_config({**config, "checkpoint": {"key": "k"}}).key == "k"
+
+
+def test_checkpoint_branches_coalescing(app, checkpoint_store):
+    def _branching_datastream(checkpoint):
+        return DataStreamFactory.create(
+            readers_config=[{"type": "test", "args": {"origin": [1, 2, 3, 4, 5]}}],
+            branches_config={
+                "plain": {"writers": [{"type": "test"}]},
+                "coalesced": {
+                    "writers": [{"type": "test"}],
+                    "coalesce": {"window": 2},
+                },
+            },
+            writers_config=None,
+            batch_size=2,
+            checkpoint=checkpoint,
+        )
+
+    # the first batch is only buffered by the coalescing branch
+    checkpoint = Checkpoint("branches", store=checkpoint_store)
+    stream = _branching_datastream(checkpoint).process()
+    assert [e.entry for e in islice(stream, 3)] == [1, 2, 3]
+    stream.close()
+    assert checkpoint_store.load("branches") is None
+
+    # the second batch flushes the coalescing branch
+    checkpoint = Checkpoint("branches", store=checkpoint_store)
+    stream = _branching_datastream(checkpoint).process()
+    assert len(list(islice(stream, 9))) == 9
+    stream.close()
+    assert checkpoint_store.load("branches") == (3,)
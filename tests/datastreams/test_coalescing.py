@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams coalescing tests."""
+
+from unittest.mock import MagicMock
+
+from invenio_vocabularies.datastreams import StreamEntry
+from invenio_vocabularies.datastreams.coalescing import Coalescer
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.writers import ServiceWriter
+
+
+def test_coalescer():
+    coalescer = Coalescer(window=2)
+    first = [StreamEntry({"id": "a", "v": 1}), StreamEntry({"id": "b", "v": 1})]
+    assert coalescer.add(first, cursor=(1,)) == []
+    assert not coalescer.ready
+
+    second = [StreamEntry({"id": "a", "v": 2}), StreamEntry({"v": 3})]
+    assert coalescer.add(second, cursor=(3,)) == [first[0]]
+    assert coalescer.ready
+
+    entries, cursor = coalescer.flush()
+    assert [e.entry for e in entries] == [
+        {"id": "b", "v": 1},
+        *[e.entry for e in second],
+    ]
+    assert cursor == (3,)
+    assert not coalescer.pending
+
+
+def test_datastream_coalesce(app):
+    entries = [{"id": str(i % 3), "v": i} for i in range(7)]
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": entries}}],
+        writers_config=[{"type": "test"}],
+        batch_size=2,
+        coalescer=Coalescer(window=2),
+    )
+
+    results = list(datastream.process())
+    assert len(results) == len(entries)
+    written = [r.entry for r in results if not r.filtered]
+    # the first window (4 entries) and the remaining ones are written
+    assert written == [
+        {"id": "1", "v": 1},
+        {"id": "2", "v": 2},
+        {"id": "0", "v": 3},
+        {"id": "1", "v": 4},
+        {"id": "2", "v": 5},
+        {"id": "0", "v": 6},
+    ]
+
+
+def test_service_writer_coalesce(app):
+    service = MagicMock()
+    service.create_or_update_many.return_value.results = [
+        MagicMock(errors=[], exc=None),
+        MagicMock(errors=[], exc=None),
+    ]
+    writer = ServiceWriter(service, coalesce=True)
+    entries = [
+        StreamEntry({"type": "t", "id": "a", "v": 1}),
+        StreamEntry({"type": "t", "id": "b", "v": 1}),
+        StreamEntry({"type": "t", "id": "a", "v": 2}),
+    ]
+
+    results = writer.write_many(entries)
+    (_, written), _ = service.create_or_update_many.call_args
+    assert written == [
+        (("t", "b"), {"type": "t", "id": "b", "v": 1}),
+        (("t", "a"), {"type": "t", "id": "a", "v": 2}),
+    ]
+    assert [(r.entry["id"], r.entry["v"], r.filtered) for r in results] == [
+        ("a", 1, True),
+        ("b", 1, False),
+        ("a", 2, False),
+    ]
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams compact entries tests."""
+
+import json
+import pickle
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+
+from invenio_vocabularies.datastreams import DataStream, StreamEntry
+from invenio_vocabularies.datastreams.compact import (
+    CompactEntry,
+    pack_entries,
+    unpack_entries,
+)
+from invenio_vocabularies.datastreams.filters import field_value
+from invenio_vocabularies.datastreams.fingerprints import fingerprint
+from invenio_vocabularies.datastreams.tasks import write_many_entry
+from invenio_vocabularies.datastreams.transformers import BaseTransformer
+from invenio_vocabularies.datastreams.writers import AsyncWriter
+
+
+class PersonEntry(CompactEntry):
+    """Compact test entry."""
+
+    __slots__ = ("id", "name", "affiliations")
+
+
+class PersonTransformer(BaseTransformer):
+    """Transformer of compact test entries."""
+
+    compact_entry = PersonEntry
+
+    def apply(self, stream_entry, *args, **kwargs):
+        """Compact the entry."""
+        stream_entry.entry = self._compact(stream_entry.entry)
+        return stream_entry
+
+
+class UpperNameTransformer(BaseTransformer):
+    """Transformer updating the entries in place."""
+
+    def apply(self, stream_entry, *args, **kwargs):
+        """Upper case the name."""
+        stream_entry.entry["name"] = stream_entry.entry["name"].upper()
+        return stream_entry
+
+
+def _deep_size(obj):
+    """Size of an object and of the values it holds.
+
+    The keys are not counted, they are the same strings for all the entries.
+    """
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_deep_size(v) for v in obj.values())
+    if isinstance(obj, list):
+        return sys.getsizeof(obj) + sum(_deep_size(v) for v in obj)
+    if isinstance(obj, CompactEntry):
+        return sys.getsizeof(obj) + sum(_deep_size(obj[k]) for k in obj)
+    return sys.getsizeof(obj)
+
+
+def test_compact_entry():
+    entry = PersonEntry.from_dict({"id": "1", "name": None})
+    assert entry == {"id": "1", "name": None}
+    assert entry.to_dict() == {"id": "1", "name": None}
+    assert "affiliations" not in entry and len(entry) == 2
+    assert entry.get("affiliations") is None
+    with pytest.raises(KeyError):
+        entry["to_dict"]
+    with pytest.raises(TypeError):
+        PersonEntry(title="unknown field")
+
+    assert pickle.loads(pickle.dumps(entry)) == entry
+    assert field_value(entry, ["id"]) == "1"
+    assert fingerprint(entry) == fingerprint({"name": None, "id": "1"})
+
+
+def test_pack_entries():
+    entries = [
+        PersonEntry(id="1", affiliations=[{"name": "CERN"}]),
+        PersonEntry(id="2", name="Doe"),
+    ]
+    entry_type, packed = pack_entries(entries)
+    assert entry_type == f"{__name__}:PersonEntry"
+    # sent as JSON to the write tasks
+    unpacked = unpack_entries(entry_type, json.loads(json.dumps(packed)))
+    assert unpacked == entries
+
+    entry_type, packed = pack_entries([entries[0], {"id": "3"}])
+    assert entry_type is None
+    assert packed == [entries[0].to_dict(), {"id": "3"}]
+
+    with pytest.raises(TypeError):
+        unpack_entries("json:dumps", packed)
+
+
+def test_async_writer_compact_entries():
+    entries = [PersonEntry(id="1"), PersonEntry(id="2", name="Doe")]
+    writer = AsyncWriter(writer=MagicMock())
+    with patch(
+        "invenio_vocabularies.datastreams.writers.write_many_entry.apply_async"
+    ) as mock_write_many_entry:
+        writer.write_many([StreamEntry(e) for e in entries])
+        _, kwargs = mock_write_many_entry.call_args
+        assert kwargs["args"][1] == [[1, "1"], [3, "2", "Doe"]]
+        assert kwargs["kwargs"] == {"entry_type": f"{__name__}:PersonEntry"}
+
+
+def test_write_many_compact_entries(app):
+    filepath = Path("writer_test.yaml")
+    yaml_writer_config = {"type": "yaml", "args": {"filepath": str(filepath)}}
+    entry_type, packed = pack_entries([PersonEntry(id="1"), PersonEntry(id="2")])
+    write_many_entry(yaml_writer_config, packed, entry_type=entry_type)
+
+    with open(filepath) as file:
+        assert yaml.safe_load(file) == [{"id": "1"}, {"id": "2"}]
+    filepath.unlink()
+
+
+def test_compact_entry_deep_size():
+    data = json.dumps({"id": "1", "name": "Doe", "affiliations": [{"name": "CERN"}]})
+    entry, compact = json.loads(data), PersonEntry.from_dict(json.loads(data))
+    # the nested values are not compacted, the saving is the one of the top
+    # level dictionary only
+    dict_size, compact_size = _deep_size(entry), _deep_size(compact)
+    assert compact_size < dict_size
+    assert dict_size - compact_size == sys.getsizeof(entry) - sys.getsizeof(compact)
+
+
+def test_compact_entries_chained_transformers(app):
+    datastream = DataStream(
+        readers=[],
+        writers=[],
+        transformers=[PersonTransformer(compact=True), UpperNameTransformer()],
+    )
+    entries = [StreamEntry({"id": "1", "name": "Doe"})]
+
+    assert datastream.apply_transformers(entries)[0].entry == {"id": "1", "name": "DOE"}
+    entry = datastream.transform(StreamEntry({"id": "2", "name": "Roe"})).entry
+    assert entry == {"id": "2", "name": "ROE"}
@@ -7,6 +7,7 @@ import json
 import zipfile
 from pathlib import Path
 
+import billiard
 import pytest
 
 from invenio_vocabularies.datastreams.factories import DataStreamFactory
@@ -140,3 +141,139 @@ def test_piping_readers(app, zip_file, json_element):
             assert entry.errors == expected_errors
 
     assert count == 5  # 2 good + 1 bad + 2 good
+
+
+def test_datastream_from_config(app, tmp_path):
+    config = {
+        "readers": [{"type": "test", "args": {"origin": [1, 2, 3]}}],
+        "writers": [{"type": "test"}],
+        "batch_size": 2,
+        "queue_size": 4,
+        "dead_letters": {"path": str(tmp_path / "dead-letters.jsonl")},
+        "progress": False,
+    }
+    datastream = DataStreamFactory.from_config(config, batch_size=10)
+
+    assert datastream.batch_size == 10
+    assert datastream.queue_size == 4
+    assert datastream.dead_letters is not None
+    assert datastream.progress is None and datastream.metrics is None
+    assert [e.entry for e in datastream.process()] == [1, 2, 3]
+
+
+def test_datastream_transform_workers(app, vocabulary_config):
+    readers_config = [{"type": "test", "args": {"origin": [1, -1, 3, -4, 5]}}]
+
+    def _process(**kwargs):
+        datastream = DataStreamFactory.create(
+            readers_config=readers_config,
+            transformers_config=vocabulary_config.get("transformers"),
+            writers_config=[{"type": "test"}],
+            batch_size=4,
+            **kwargs,
+        )
+        return [(entry.entry, entry.errors) for entry in datastream.process()]
+
+    serial = _process()
+    parallel = _process(transform_workers=2)
+
+    assert parallel == serial
+    assert parallel == [
+        (-1, ["TestTransformer: Value cannot be negative"]),
+        (-4, ["TestTransformer: Value cannot be negative"]),
+        (2, []),
+        (4, []),
+        (6, []),
+    ]
+
+
+def test_datastream_transform_workers_daemonic(app, vocabulary_config):
+    # e.g. a Celery prefork worker
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": [1, -1, 3]}}],
+        transformers_config=vocabulary_config.get("transformers"),
+        writers_config=[{"type": "test"}],
+        transform_workers=2,
+    )
+    ctx = billiard.get_context("fork")
+    results = ctx.Queue()
+
+    def _process():
+        with app.app_context():
+            results.put([entry.entry for entry in datastream.process()])
+
+    process = ctx.Process(target=_process, daemon=True)
+    process.start()
+    entries = results.get(timeout=30)
+    process.join(timeout=30)
+
+    assert process.exitcode == 0
+    assert entries == [-1, 2, 4]
+
+
+@pytest.mark.parametrize("option", [{"pipelined": True}, {"max_batch_latency": 1}])
+def test_datastream_transform_workers_with_threads(app, option):
+    with pytest.raises(ValueError):
+        DataStreamFactory.create(
+            readers_config=[{"type": "test", "args": {"origin": [1]}}],
+            writers_config=[{"type": "test"}],
+            transform_workers=2,
+            **option,
+        )
+
+
+def test_datastream_pipelined(app, vocabulary_config):
+    readers_config = [{"type": "test", "args": {"origin": [1, -1, 3, -4, 5]}}]
+
+    def _process(**kwargs):
+        datastream = DataStreamFactory.create(
+            readers_config=readers_config,
+            transformers_config=vocabulary_config.get("transformers"),
+            writers_config=[{"type": "test"}],
+            batch_size=2,
+            **kwargs,
+        )
+        return [(entry.entry, entry.errors) for entry in datastream.process()]
+
+    assert _process(pipelined=True, queue_size=1) == _process()
+
+
+def test_datastream_pipelined_reader_failure(app, vocabulary_config):
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": None}}],
+        transformers_config=vocabulary_config.get("transformers"),
+        writers_config=[{"type": "test"}],
+        pipelined=True,
+    )
+
+    with pytest.raises(TypeError):
+        list(datastream.process())
+
+
+def test_branching_datastream(app):
+    datastream = DataStreamFactory.create(
+        readers_config=[
+            {"type": "test", "args": {"origin": [{"v": 1}, {"v": -1}, {"v": 2}]}}
+        ],
+        writers_config=None,
+        filters_config=[{"type": "deny-list", "args": {"field": "v", "values": [2]}}],
+        branches_config={
+            "copy": {"writers": [{"type": "test"}]},
+            "negative": {
+                "filters": [{"type": "equals", "args": {"field": "v", "value": -1}}],
+                "writers": [{"type": "test"}],
+            },
+        },
+    )
+    assert list(datastream.branches) == ["copy", "negative"]
+
+    results = list(datastream.process())
+    assert [(r.entry, r.filtered) for r in results] == [
+        ({"v": 2}, True),  # filtered before branching
+        ({"v": 1}, False),  # copy branch
+        ({"v": -1}, False),
+        ({"v": 1}, True),  # negative branch
+        ({"v": -1}, False),
+    ]
+    # each branch gets its own copy of the entries
+    assert results[1].entry is not results[3].entry
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams dead letters tests."""
+
+import json
+
+import pytest
+from invenio_jobs.errors import TaskExecutionPartialError
+
+from invenio_vocabularies.datastreams.deadletters import DeadLetters
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.services.tasks import replay_datastream
+
+
+@pytest.fixture()
+def dead_letters_config(tmp_path):
+    """Data stream configuration storing its dead letters."""
+    return {
+        "readers": [{"type": "test", "args": {"origin": [1, -1, 5]}}],
+        "transformers": [{"type": "test"}],
+        "writers": [{"type": "fail", "args": {"fail_on": 6}}],
+        "dead_letters": {"path": str(tmp_path / "dead-letters.jsonl")},
+    }
+
+
+def _read_letters(path):
+    with open(path) as fp:
+        return [json.loads(line) for line in fp]
+
+
+def test_datastream_dead_letters(app, dead_letters_config):
+    dead_letters = DeadLetters.from_config(dead_letters_config)
+    datastream = DataStreamFactory.create(
+        readers_config=dead_letters_config["readers"],
+        transformers_config=dead_letters_config["transformers"],
+        writers_config=dead_letters_config["writers"],
+        dead_letters=dead_letters,
+    )
+    results = list(datastream.process())
+    assert [bool(r.errors) for r in results] == [True, False, True]
+
+    letters = _read_letters(dead_letters.path)
+    assert [(letter["stage"], letter["entry"]) for letter in letters] == [
+        ("transform", -1),
+        ("write", 6),
+    ]
+    assert letters[0]["errors"] == ["TestTransformer: Value cannot be negative"]
+    assert letters[0]["cursor"] == [1]
+
+
+def test_replay_datastream(app, dead_letters_config):
+    dead_letters = DeadLetters.from_config(dead_letters_config)
+    with open(dead_letters.path, "w") as fp:
+        for stage, entry in [("transform", -1), ("transform", 2), ("write", 6)]:
+            fp.write(json.dumps({"stage": stage, "entry": entry}) + "\n")
+
+    # the writer is fixed, the negative entry is still failing
+    dead_letters_config["writers"] = [{"type": "fail", "args": {"fail_on": 0}}]
+    with pytest.raises(TaskExecutionPartialError):
+        replay_datastream(dead_letters_config)
+
+    letters = _read_letters(dead_letters.path)
+    assert [(letter["stage"], letter["entry"]) for letter in letters] == [
+        ("transform", -1)
+    ]
+    assert not dead_letters.replay_path.exists()
+
+
+def test_replay_configs_filters(app, dead_letters_config):
+    dead_letters = DeadLetters.from_config(dead_letters_config)
+    with open(dead_letters.path, "w") as fp:
+        fp.write(json.dumps({"stage": "write", "entry": 6}) + "\n")
+    read_filter = {"type": "equals", "args": {"field": "kind", "value": "raw"}}
+    transform_filter = {
+        "type": "equals",
+        "args": {"field": "id", "value": 1, "stage": "transform"},
+    }
+    dead_letters_config["filters"] = [read_filter, transform_filter]
+
+    transform_config, write_config = dead_letters.replay_configs(dead_letters_config)
+    assert transform_config["filters"] == [read_filter, transform_filter]
+    # the read entries filters do not apply to the transformed entries
+    assert write_config["filters"] == [transform_filter]
+
+
+def test_replay_branches(app, dead_letters_config):
+    del dead_letters_config["transformers"], dead_letters_config["writers"]
+    dead_letters_config["branches"] = {
+        "a": {
+            "transformers": [{"type": "test"}],
+            "writers": [{"type": "fail", "args": {"fail_on": 0}}],
+        },
+        "b": {"writers": [{"type": "fail", "args": {"fail_on": 5}}]},
+    }
+    list(DataStreamFactory.from_config(dead_letters_config).process())
+    path = DeadLetters.from_config(dead_letters_config).path
+    letters = [(x["stage"], x["entry"], x["branch"]) for x in _read_letters(path)]
+    assert letters == [("transform", -1, "a"), ("write", 5, "b")]
+
+    with pytest.raises(TaskExecutionPartialError):
+        replay_datastream(dead_letters_config)
+
+    # each dead letter is replayed in its branch only, and stored again in it
+    replayed = [(x["stage"], x["entry"], x["branch"]) for x in _read_letters(path)]
+    assert replayed == letters
@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams deduplication tests."""
+
+from invenio_vocabularies.datastreams.dedup import BloomFilter, SeenKeys
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"key-{i}")
+
+    assert all(f"key-{i}" in bloom for i in range(1000))
+    false_positives = sum(1 for i in range(1000) if f"other-{i}" in bloom)
+    assert false_positives < 50
+
+
+def test_seen_keys(tmp_path):
+    seen = SeenKeys(max_memory_keys=10, directory=tmp_path)
+    assert [seen.add(i % 15) for i in range(30)] == [True] * 15 + [False] * 15
+    assert seen.spilled
+    assert len(seen) == 15
+    assert 14 in seen and 15 not in seen
+
+    seen.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_datastream_unique_filter(app):
+    entries = [{"id": str(i % 7)} for i in range(30)]
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": entries}}],
+        filters_config=[
+            {"type": "unique", "args": {"field": "id", "max_memory_keys": 3}}
+        ],
+        writers_config=[{"type": "test"}],
+    )
+
+    written = [r.entry["id"] for r in datastream.process() if not r.filtered]
+    assert written == [str(i) for i in range(7)]
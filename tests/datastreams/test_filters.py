@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams filters tests."""
+
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.filters import (
+    AllowListFilter,
+    DenyListFilter,
+    EqualsFilter,
+    RegexFilter,
+)
+
+
+def test_filters():
+    active = {"id": "https://ror.org/01", "status": "active", "meta": {"n": 1}}
+    inactive = {"id": "https://ror.org/02", "status": "inactive"}
+
+    assert RegexFilter(pattern="/01$").keep(active)
+    assert not RegexFilter(pattern="/01$").keep(inactive)
+    assert not RegexFilter(pattern=".*", field="missing").keep(active)
+
+    assert EqualsFilter(field="status", value="active").keep(active)
+    assert not EqualsFilter(field="status", value="active").keep(inactive)
+    assert EqualsFilter(field="meta.n", value=1).keep(active)
+    assert EqualsFilter(field=["meta", "n"], value=1).keep(active)
+    assert EqualsFilter(field="status", value="inactive", negate=True).keep(active)
+
+    assert AllowListFilter(values=["https://ror.org/01"]).keep(active)
+    assert not AllowListFilter(values=["https://ror.org/01"]).keep(inactive)
+    assert not DenyListFilter(values=["https://ror.org/01"]).keep(active)
+    assert DenyListFilter(values=["https://ror.org/01"]).keep(inactive)
+
+
+def test_datastream_filters(app):
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": [1, -1, 2, 3]}}],
+        transformers_config=[{"type": "test"}],
+        filters_config=[
+            # negative entries are dropped before failing to transform
+            {"type": "deny-list", "args": {"field": [], "values": [-1]}},
+            {
+                "type": "equals",
+                "args": {"field": [], "value": 3, "stage": "transform", "negate": True},
+            },
+        ],
+        writers_config=[{"type": "test"}],
+    )
+
+    # the filtered entries are yielded before the written ones
+    results = [(r.entry, r.filtered, r.errors) for r in datastream.process()]
+    assert results == [(-1, True, []), (3, True, []), (2, False, []), (4, False, [])]
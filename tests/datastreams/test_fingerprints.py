@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams fingerprints tests."""
+
+from unittest.mock import patch
+
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.fingerprints import (
+    DatabaseFingerprintStore,
+    Fingerprints,
+    fingerprint,
+)
+from invenio_vocabularies.datastreams.tasks import write_entry, write_many_entry
+
+
+def _process(entries, fingerprints):
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": entries}}],
+        writers_config=[{"type": "test"}],
+        fingerprints=fingerprints,
+    )
+    return list(datastream.process())
+
+
+def test_fingerprint():
+    assert fingerprint({"id": "a", "title": "A"}) == fingerprint(
+        {"title": "A", "id": "a"}
+    )
+    assert fingerprint({"id": "a"}) != fingerprint({"id": "b"})
+
+
+def test_datastream_skips_unchanged_entries(app, db):
+    entries = [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}]
+    fingerprints = Fingerprints("test", store=DatabaseFingerprintStore())
+
+    results = _process(entries, fingerprints)
+    assert [r.filtered for r in results] == [False, False]
+
+    # only the changed entry is written again
+    updated_entries = [{"id": "a", "title": "A"}, {"id": "b", "title": "B2"}]
+    results = _process(updated_entries, fingerprints)
+    assert [(r.entry["id"], r.filtered) for r in results] == [
+        ("a", True),
+        ("b", False),
+    ]
+    assert DatabaseFingerprintStore().get_many("test", ["a", "b"]) == {
+        "a": fingerprint(updated_entries[0]),
+        "b": fingerprint(updated_entries[1]),
+    }
+
+
+def test_async_writer_stores_fingerprints_once_written(app, db, tmp_path):
+    entries = [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}]
+    yaml_writer = {"type": "yaml", "args": {"filepath": str(tmp_path / "out.yaml")}}
+    store = DatabaseFingerprintStore()
+    with patch(
+        "invenio_vocabularies.datastreams.writers.write_many_entry.apply_async"
+    ) as apply_async:
+        datastream = DataStreamFactory.create(
+            readers_config=[{"type": "test", "args": {"origin": entries}}],
+            writers_config=[{"type": "async", "args": {"writer": yaml_writer}}],
+            write_many=True,
+            fingerprints=Fingerprints("async", store=store),
+        )
+        list(datastream.process())
+
+    # not stored when the task is sent, but once it wrote the entries
+    assert store.get_many("async", ["a", "b"]) == {}
+    task = apply_async.call_args.kwargs
+    assert task["kwargs"]["fingerprints"] == {"vocabulary": "async", "id_field": "id"}
+    write_many_entry(*task["args"], **task["kwargs"])
+    assert store.get_many("async", ["a", "b"]) == {
+        "a": fingerprint(entries[0]),
+        "b": fingerprint(entries[1]),
+    }
+
+    # an entry whose write fails is written again by the next import
+    failing_writer = {"type": "yaml", "args": {"filepath": str(tmp_path / "x/y")}}
+    write_entry(
+        failing_writer, {"id": "c"}, fingerprints=task["kwargs"]["fingerprints"]
+    )
+    assert store.get_many("async", ["c"]) == {}
@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams memory budget tests."""
+
+from invenio_vocabularies.datastreams.coalescing import Coalescer
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.memory import MemoryBudget, rss
+
+
+def test_rss():
+    assert rss() > 0
+
+
+def test_memory_budget_stages(app):
+    budget = MemoryBudget(limit_mb=1024 * 1024, trace=True)
+    budget.start()
+    try:
+        with budget.track("small"):
+            small = [0] * 1000
+        with budget.track("large"):
+            large = [0] * 1000000
+    finally:
+        budget.stop()
+
+    report = budget.report()
+    assert report["top_stage"] == "large"
+    assert report["stages"]["large"]["max_traced_peak_mb"] >= 7
+    assert not report["near_limit"]
+    assert len(small) < len(large)
+
+
+def test_datastream_memory_budget(app):
+    def _process(memory_budget):
+        read = []
+
+        def entries():
+            for idx in range(8):
+                read.append(idx)
+                yield {"id": idx}
+
+        datastream = DataStreamFactory.create(
+            readers_config=[{"type": "test", "args": {"origin": entries()}}],
+            writers_config=[{"type": "test"}],
+            batch_size=4,
+            coalescer=Coalescer(window=10),
+            memory_budget=memory_budget,
+        )
+        results = datastream.process()
+        next(results)
+        read_before_write = len(read)
+        assert len(list(results)) == 7
+        return read_before_write, memory_budget.report()
+
+    # the coalesced entries are written once all of them are read
+    read_before_write, report = _process(MemoryBudget(limit_mb=1024 * 1024))
+    assert read_before_write == 8
+    assert not report["near_limit"]
+    assert set(report["stages"]) == {"read", "transform", "write"}
+
+    # near the limit, the partial batches are written right away
+    read_before_write, report = _process(MemoryBudget(limit_mb=1, check_interval=2))
+    assert read_before_write == 2
+    assert report["near_limit"]
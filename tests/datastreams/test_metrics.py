@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams metrics tests."""
+
+import json
+
+import pytest
+
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.metrics import (
+    DataStreamMetrics,
+    LatencyHistogram,
+    emit_metrics,
+    item_size,
+)
+
+
+@pytest.fixture()
+def metrics_datastream():
+    """Factory of instrumented data streams."""
+
+    def _create(**kwargs):
+        return DataStreamFactory.create(
+            readers_config=[{"type": "test", "args": {"origin": [1, -1, 3]}}],
+            transformers_config=[{"type": "test"}],
+            writers_config=[{"type": "test"}],
+            metrics=DataStreamMetrics(),
+            **kwargs,
+        )
+
+    return _create
+
+
+@pytest.mark.parametrize("transform_workers", [None, 2])
+def test_datastream_metrics(app, metrics_datastream, transform_workers):
+    datastream = metrics_datastream(transform_workers=transform_workers)
+    list(datastream.process())
+
+    summary = datastream.metrics.summary()
+    assert summary["reader:TestReader"]["entries_out"] == 3
+    assert summary["transformer:TestTransformer"]["entries_in"] == 3
+    assert summary["transformer:TestTransformer"]["entries_out"] == 2
+    assert summary["transformer:TestTransformer"]["errors"] == 1
+    # transformed per batch, but recorded per entry like the other stages
+    assert summary["transformer:TestTransformer"]["latency"]["count"] == 3
+    assert summary["writer:TestWriter"]["entries_in"] == 2
+    assert summary["writer:TestWriter"]["latency"]["count"] == 2
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    dump = histogram.to_dict()
+    assert dump["count"] == 3
+    assert dump["max"] == 5
+    assert dump["buckets"] == {"le_0.1": 1, "le_1": 1, "le_inf": 1}
+
+    histogram.observe(0.01, count=3)
+    assert histogram.count == 6
+    assert histogram.counts[0] == 4
+
+
+def test_emit_metrics(app, metrics_datastream, caplog):
+    datastream = metrics_datastream()
+    list(datastream.process())
+
+    summary = emit_metrics(datastream.metrics)
+    assert summary["writer:TestWriter"]["entries_out"] == 2
+    assert json.dumps(summary, sort_keys=True) in caplog.text
+
+
+def test_item_size(tmp_path):
+    filename = tmp_path / "file.txt"
+    filename.write_bytes(b"content")
+    with open(filename, "rb") as fp:
+        assert item_size(fp) == 7
+    assert item_size(b"content") == 7
+    assert item_size({"id": "content"}) == 0
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams progress tests."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from invenio_jobs.logging.jobs import ContextAwareOSHandler, set_job_context
+
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.progress import Progress, format_progress
+from invenio_vocabularies.datastreams.readers import ZipReader
+
+
+@pytest.fixture()
+def jsonl_file(tmp_path):
+    """JSON lines file of 100 entries."""
+    filename = tmp_path / "entries.jsonl"
+    with open(filename, "w") as fp:
+        for idx in range(100):
+            fp.write(json.dumps({"id": idx, "padding": "x" * 100}) + "\n")
+    return filename
+
+
+def test_zip_reader_estimate(zip_file):
+    reader = ZipReader(origin=str(zip_file), regex="\\.json$")
+    assert reader.estimate() is None
+
+    files = reader.read()
+    next(files)
+    estimate = reader.estimate()
+    assert estimate["bytes_read"] == 0
+    next(files)
+    assert reader.estimate()["bytes_read"] == estimate["bytes"] / 2
+
+
+def test_datastream_progress(app, jsonl_file):
+    summaries = []
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "jsonl", "args": {"origin": str(jsonl_file)}}],
+        writers_config=[{"type": "test"}],
+        batch_size=10,
+        progress=Progress(interval=0, callback=summaries.append),
+    )
+    assert datastream.total() is None
+
+    for _ in datastream.process():
+        pass
+
+    assert len(summaries) == 11  # one per batch, and the final one
+    first = summaries[0]
+    assert first["entries"] == 10
+    assert first["bytes_read"] <= first["total_bytes"]
+    assert first["percent"] is not None and first["eta"] is not None
+    assert first["total_entries"] > 10
+    assert summaries[-1]["total_entries"] == 100
+    assert summaries[-1]["percent"] == 100
+    assert summaries[-1]["eta"] == 0
+
+    assert format_progress(summaries[-1]).startswith("100 of ~100 entries (100.0%)")
+
+
+def test_datastream_run_total(app, tmp_path):
+    filename = tmp_path / "entries.jsonl"
+    with open(filename, "w") as fp:
+        for idx in range(1000):
+            fp.write(json.dumps({"id": idx, "padding": "x" * 100}) + "\n")
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "jsonl", "args": {"origin": str(filename)}}],
+        writers_config=[{"type": "test"}],
+        batch_size=100,
+    )
+    runs_service = "invenio_vocabularies.datastreams.datastreams.current_runs_service"
+    with patch(runs_service) as runs_service:
+        with patch.object(ContextAwareOSHandler, "emit"):  # no job logs index
+            with set_job_context({"run_id": "run", "job_id": "job"}):
+                for _ in datastream.process():
+                    pass
+
+    increments = [
+        call.kwargs["total_entries"]
+        for call in runs_service.add_total_entries.call_args_list
+    ]
+    # the first batch, then the estimated total once known
+    assert increments[0] == 100
+    assert increments[1] > 100
+    assert sum(increments) >= 1000
@@ -16,6 +16,7 @@ import yaml
 from invenio_vocabularies.datastreams.errors import ReaderError
 from invenio_vocabularies.datastreams.readers import (
     JsonReader,
+    JsonStreamReader,
     OAIPMHReader,
     TarReader,
     YamlReader,
@@ -186,6 +187,31 @@ def test_json_element_reader(json_element_file, json_element):
     assert count == 1
 
 
+def test_json_stream_reader(json_list_file, json_element):
+    reader = JsonStreamReader(json_list_file)
+    assert list(reader.read()) == [json_element, json_element]
+    assert list(reader.read(io.BytesIO(b'{"a": 1}'))) == [{"a": 1}]
+
+    entries = [1, -2.5e3, "a, ]\u00e9", None, [1, {"b": []}], {"c": True}]
+    content = json.dumps(entries, ensure_ascii=False, indent=2).encode("utf-8")
+    # chunks splitting the numbers, strings and multi-byte characters
+    for chunk_size in (1, 2, 3, 7, len(content)):
+        reader = JsonStreamReader(chunk_size=chunk_size)
+        assert list(reader.read(io.BytesIO(content))) == entries
+        assert list(reader.read(io.StringIO(content.decode("utf-8")))) == entries
+
+    assert list(reader.read(io.BytesIO(b" [ ] "))) == []
+    with pytest.raises(ReaderError):
+        list(reader.read(io.BytesIO(b'[{"a": 1} {"b": 2}]')))
+    with pytest.raises(ReaderError):
+        list(JsonStreamReader(chunk_size=4).read(io.BytesIO(b'[{"a": 1}, {"b"')))
+    # a truncated or concatenated file is not a valid JSON array
+    assert list(JsonStreamReader(chunk_size=1).read(io.BytesIO(b"[1]\n\n"))) == [1]
+    for content in (b"[1]xx", b"[1] [2]", b"[]x"):
+        with pytest.raises(ReaderError):
+            list(JsonStreamReader(chunk_size=1).read(io.BytesIO(content)))
+
+
 @pytest.fixture(scope="module")
 def oai_response_match():
     response_data = """
@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams remote files tests."""
+
+import io
+import json
+import re
+import zipfile
+
+import pytest
+import requests
+
+from invenio_vocabularies.datastreams.errors import (
+    RangeNotSupportedError,
+    ReaderError,
+)
+from invenio_vocabularies.datastreams.readers import JsonReader, ZipReader
+from invenio_vocabularies.datastreams.remote import HTTPRangeFile, open_remote
+
+
+class MockRangeResponse:
+    """Response of a range request."""
+
+    def __init__(self, url, content, status_code=200, headers=None):
+        """Constructor."""
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        """Raise the client and server errors."""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context."""
+
+
+class MockRangeSession:
+    """Session serving the ranges of a file."""
+
+    def __init__(self, data, ranges=True):
+        """Constructor."""
+        self.data = data
+        self.ranges = ranges
+        self.fetched = 0
+
+    def get(self, url, headers=None, **kwargs):
+        """Serve the requested range, or the whole file."""
+        match = re.match(r"bytes=(\d+)-(\d+)", (headers or {}).get("Range", ""))
+        if not self.ranges or not match:
+            self.fetched += len(self.data)
+            return MockRangeResponse(url, self.data)
+        start, end = int(match.group(1)), int(match.group(2))
+        content = self.data[start : end + 1]
+        self.fetched += len(content)
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(self.data)}"}
+        return MockRangeResponse(url, content, 206, headers)
+
+    def close(self):
+        """Nothing to close."""
+
+
+class ExpiringRangeSession(MockRangeSession):
+    """Session redirecting to a storage URL valid for one range request."""
+
+    def __init__(self, data, status=403):
+        """Constructor."""
+        super().__init__(data)
+        self.status = status
+        self.redirections = 0
+        self._used = False
+
+    def get(self, url, headers=None, **kwargs):
+        """Redirect to a new storage URL, which fails once used."""
+        if url == "https://example.org/file":
+            self.redirections += 1
+            self._used = False
+            resp = super().get(url, headers, **kwargs)
+            resp.url = f"https://storage.example.org/file?token={self.redirections}"
+            return resp
+        if self._used:
+            return MockRangeResponse(url, b"", self.status)
+        self._used = True
+        return super().get(url, headers, **kwargs)
+
+
+@pytest.fixture()
+def remote_zip():
+    """ZIP archive of a small JSON member and a large binary one."""
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as archive:
+        archive.writestr("large.bin", bytes(range(256)) * 4096)
+        archive.writestr("entries.json", json.dumps([{"id": 1}, {"id": 2}]))
+    return data.getvalue()
+
+
+def test_http_range_file():
+    data = bytes(range(256)) * 10
+    session = MockRangeSession(data)
+    fp = HTTPRangeFile("https://example.org/file", session=session)
+    assert fp.size == len(data)
+
+    fp.seek(-10, io.SEEK_END)
+    assert fp.read(100) == data[-10:]
+    assert fp.read() == b""
+    fp.seek(100)
+    assert fp.read(5) == data[100:105]
+    assert fp.bytes_fetched == 15
+
+
+def test_http_range_file_not_supported():
+    session = MockRangeSession(b"data", ranges=False)
+    with pytest.raises(RangeNotSupportedError):
+        HTTPRangeFile("https://example.org/file", session=session)
+
+
+def test_http_range_file_expired_redirection():
+    data = bytes(range(256))
+    session = ExpiringRangeSession(data)
+    fp = HTTPRangeFile("https://example.org/file", session=session)
+    assert fp.read(5) == data[:5]
+    # the storage URL expired, the file URL is resolved again
+    assert fp.read(5) == data[5:10]
+    assert session.redirections == 2
+
+
+def test_http_range_file_error():
+    session = ExpiringRangeSession(bytes(range(256)), status=500)
+    fp = HTTPRangeFile("https://example.org/file", session=session)
+    fp.read(5)
+    with pytest.raises(ReaderError):
+        fp.read(5)
+
+
+def test_http_range_file_retries():
+    session = requests.Session()
+    session.get = MockRangeSession(b"data").get
+    HTTPRangeFile("https://example.org/file", session=session, retries=5)
+    retries = session.get_adapter("https://example.org/file").max_retries
+    assert retries.total == 5
+    assert 503 in retries.status_forcelist
+
+
+def test_zip_reader_remote_origin(monkeypatch, remote_zip):
+    session = MockRangeSession(remote_zip)
+    monkeypatch.setattr(requests, "Session", lambda: session)
+
+    reader = ZipReader(
+        origin="https://example.org/archive.zip", regex="\\.json$", read_ahead=1024
+    )
+    entries = [entry for fp in reader.read() for entry in JsonReader().read(fp)]
+
+    assert entries == [{"id": 1}, {"id": 2}]
+    # only the central directory and the JSON member were downloaded
+    assert session.fetched < len(remote_zip) / 10
+
+
+def test_open_remote_read_ahead(remote_zip):
+    session = MockRangeSession(remote_zip)
+    with open_remote("https://example.org/a.zip", read_ahead=4096, session=session):
+        pass  # only the first byte is requested when opening
+    assert session.fetched == 1
+
+    with open_remote(
+        "https://example.org/a.zip", read_ahead=4096, session=session
+    ) as fp:
+        fp.read(10)
+        fp.read(10)
+    assert session.fetched == 1 + 1 + 4096
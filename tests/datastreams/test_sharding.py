@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams sharding tests."""
+
+from unittest.mock import patch
+
+import pytest
+
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.sharding import shard_configs
+from invenio_vocabularies.services.tasks import process_datastream
+
+
+@pytest.fixture()
+def sharded_config():
+    """Sharded data stream configuration."""
+    return {
+        "readers": [
+            {"type": "test", "args": {"origin": [[1, 2], [3, 4], [5, 6]]}},
+            {"type": "test-nested"},
+        ],
+        "writers": [{"type": "test"}],
+        "shards": {"count": 2, "partition": "index", "level": 0},
+    }
+
+
+def _process(config):
+    datastream = DataStreamFactory.create(
+        readers_config=config["readers"],
+        writers_config=config["writers"],
+        filters_config=config.get("filters"),
+        shard=config.get("shard"),
+    )
+    return [r.entry for r in datastream.process() if not r.filtered]
+
+
+def test_shard_configs(sharded_config):
+    configs = shard_configs(sharded_config)
+    assert [c["shard"] for c in configs] == [
+        {"index": 0, "count": 2, "level": 0},
+        {"index": 1, "count": 2, "level": 0},
+    ]
+    assert all("shards" not in c for c in configs)
+
+    sharded_config["shards"] = {"count": 2, "partition": "reader"}
+    configs = shard_configs(sharded_config)
+    assert configs[1]["readers"][0]["args"]["shard"] == {"index": 1, "count": 2}
+
+    sharded_config["shards"] = {"count": 2, "partition": "unknown"}
+    with pytest.raises(ValueError):
+        shard_configs(sharded_config)
+
+
+def test_sharded_datastream_by_index(app, sharded_config):
+    assert [_process(c) for c in shard_configs(sharded_config)] == [
+        [1, 2, 5, 6],
+        [3, 4],
+    ]
+
+    sharded_config["shards"]["level"] = 1
+    assert [_process(c) for c in shard_configs(sharded_config)] == [
+        [1, 3, 5],
+        [2, 4, 6],
+    ]
+
+
+def test_sharded_datastream_by_hash(app, sharded_config):
+    sharded_config["readers"] = [
+        {"type": "test", "args": {"origin": [{"id": str(i)} for i in range(20)]}}
+    ]
+    sharded_config["shards"] = {"count": 3, "partition": "hash", "field": "id"}
+
+    shards = [_process(c) for c in shard_configs(sharded_config)]
+    assert all(shards)
+    assert sorted(int(e["id"]) for shard in shards for e in shard) == list(range(20))
+
+
+def test_process_sharded_datastream(app, sharded_config):
+    with patch("invenio_vocabularies.services.tasks.group") as mock_group:
+        process_datastream(sharded_config)
+
+    (tasks,), _ = mock_group.call_args
+    assert [task.args[0]["shard"]["index"] for task in tasks] == [0, 1]
+    mock_group.return_value.apply_async.assert_called_once()
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Data Streams throttling tests."""
+
+import pytest
+
+from invenio_vocabularies.datastreams import throttling
+from invenio_vocabularies.datastreams.factories import DataStreamFactory
+from invenio_vocabularies.datastreams.throttling import TokenBucket, set_rate_limit
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Fake clock, advanced by the sleeps of the rate limits."""
+
+    class Clock:
+        now = 0.0
+        sleeps = []
+
+        def sleep(self, seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+    clock = Clock()
+    monkeypatch.setattr(throttling, "monotonic", lambda: clock.now)
+    monkeypatch.setattr(throttling, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture()
+def cache(monkeypatch):
+    """In-memory cache of the rates set at runtime."""
+
+    class Cache(dict):
+        def set(self, key, value, timeout=None):
+            self[key] = value
+
+        def delete(self, key):
+            self.pop(key, None)
+
+    cache = Cache()
+    monkeypatch.setattr(throttling, "current_cache", cache)
+    return cache
+
+
+def test_token_bucket(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    assert bucket.acquire(5) == 0  # burst
+    assert bucket.acquire(2) == pytest.approx(0.2)
+    clock.now += 1
+    assert bucket.acquire(5) == 0  # refilled up to the burst
+    assert bucket.acquire(20) == pytest.approx(2)
+
+
+def test_token_bucket_no_limit(clock):
+    bucket = TokenBucket()
+    assert bucket.acquire(1000) == 0
+    assert clock.sleeps == []
+
+
+def test_token_bucket_runtime_rate(app, clock, cache):
+    bucket = TokenBucket(rate=10, key="test-job", refresh_interval=1)
+    bucket.acquire(10)
+    set_rate_limit("test-job", 1)
+    clock.now += 1
+    # refilled at the previous rate, and waits at the new one
+    assert bucket.acquire(15) == pytest.approx(5)
+    assert bucket.rate == 1
+
+    set_rate_limit("test-job", 0)
+    clock.now += 1
+    assert bucket.acquire(100) == 0
+
+    set_rate_limit("test-job", None)
+    assert not cache
+
+    app.config["VOCABULARIES_DATASTREAM_RATE_LIMITS"] = {"test-job": 2}
+    clock.now += 1
+    bucket.acquire(0)
+    assert bucket.rate == 2
+    del app.config["VOCABULARIES_DATASTREAM_RATE_LIMITS"]
+
+
+def test_token_bucket_from_config():
+    bucket = TokenBucket.from_config({"rate_limit": 5})
+    assert (bucket.rate, bucket.capacity, bucket.key) == (5, 5, None)
+
+    bucket = TokenBucket.from_config({"rate_limit": {"rate": 5, "burst": 50}})
+    assert (bucket.rate, bucket.capacity) == (5, 50)
+
+
+def test_datastream_rate_limit(app, clock):
+    datastream = DataStreamFactory.create(
+        readers_config=[{"type": "test", "args": {"origin": list(range(1, 7))}}],
+        writers_config=[{"type": "test"}],
+        batch_size=2,
+        rate_limit=TokenBucket(rate=2, burst=2),
+    )
+    results = list(datastream.process())
+
+    assert [r.entry for r in results] == list(range(1, 7))
+    assert sum(clock.sleeps) == pytest.approx(2)
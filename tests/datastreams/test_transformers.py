@@ -90,3 +90,18 @@ def test_bad_xml_transformer():
 
     with pytest.raises(TransformerError):
         transformer.apply(bytes_xml_entry)
+
+
+def test_transformer_apply_many():
+    entries = [
+        StreamEntry(b"<record><id>1</id></record>"),
+        StreamEntry(b"<other><id>2</id></other>"),
+    ]
+
+    transformer = XMLTransformer(root_element="record")
+    result = transformer.apply_many(entries)
+    assert result[0].entry == {"id": "1"}
+    assert not result[0].errors
+    assert result[1].errors == [
+        "XMLTransformer: Root element 'record' not found in XML entry."
+    ]
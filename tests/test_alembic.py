@@ -46,6 +46,7 @@ def test_alembic(app, database):
     assert "vocabularies_metadata" in tables
     assert "vocabularies_types" in tables
     assert "vocabularies_schemes" in tables
+    assert "vocabularies_fingerprints" in tables
 
     # Specific vocabularies models
     assert "subject_metadata" in tables